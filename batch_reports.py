@@ -0,0 +1,126 @@
+"""
+Generate the Excel and PowerPoint reports of every Region and vaccine
+without the dashboard, e.g. as a scheduled monthly job:
+
+    python batch_reports.py data/Administred.csv data/Distributed.csv --out reports
+
+The uploads go through the same ``ProcessingPipeline`` as the Data
+Processing page and are stored in (or reused from) its processed data
+cache. Each Region x vaccine pair then becomes a Woreda-level Excel file and
+a PowerPoint deck, built on a process pool whose workers memory-map the
+processed dataset once each. A timing summary is printed at the end.
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from utils.cache import ProcessedDataCache, content_hash
+from utils.cube import SummaryCube
+from utils.export import to_excel
+from utils.extremity import Extremities
+from utils.hierarchy import ALL, LOCATION_COLUMNS, LocationIndex
+from utils.processing import ProcessingPipeline
+from utils.report import create_ppt, woreda_table
+from utils.store import DASHBOARD_COLUMNS
+
+# Per worker process: the matched dataset, its filter index and summary cube.
+_dataset = {}
+
+TIMING_COLUMNS = ["Region", "Vaccine", "Seconds", "Files"]
+
+
+def _safe_name(value) -> str:
+    return re.sub(r"[^\w-]+", "_", str(value)).strip("_")
+
+
+def process(admin_file: str, dist_file: str, cache: ProcessedDataCache) -> Tuple[str, pd.DataFrame, bool]:
+    """
+    Content hash of the processed dataset, processing and storing it unless
+    cached, its stage timings and whether it came from the cache.
+    """
+    pipeline = ProcessingPipeline()
+    key = content_hash(admin_file, dist_file, settings=pipeline.settings())
+    if key in cache:
+        return key, cache.read(key, "processing_timings"), True
+    result = pipeline.run(admin_file, dist_file)
+    cache.put(key, result.frames())
+    return key, result.timings_frame(), False
+
+
+def _load_dataset(cache_root: str, key: str) -> None:
+    df = ProcessedDataCache(Path(cache_root)).read(key, "matched_df", DASHBOARD_COLUMNS)
+    _dataset.update(df=df, index=LocationIndex(df), cube=SummaryCube(df))
+
+
+def build_reports(region: str, vaccine: str, out_dir: str) -> Tuple[str, str, float, List[str]]:
+    """Write one Region x vaccine Excel file and deck; runs in a pool worker."""
+    start = time.perf_counter()
+    df, index, cube = _dataset["df"], _dataset["index"], _dataset["cube"]
+    selection = (region, ALL, ALL, ALL)
+    filtered_df = index.filter(df, *selection)
+    stem = Path(out_dir) / f"{_safe_name(region)}_{vaccine}"
+
+    paths = [f"{stem}.xlsx", f"{stem}.pptx"]
+    Path(paths[0]).write_bytes(to_excel(woreda_table(filtered_df, vaccine)))
+    Path(paths[1]).write_bytes(create_ppt(cube, filtered_df, Extremities(filtered_df), vaccine, selection))
+    return region, vaccine, time.perf_counter() - start, paths
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("admin_file", help="Administered doses file (CSV or Excel)")
+    parser.add_argument("dist_file", help="Distributed doses file (CSV or Excel)")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--regions", nargs="+", help="only these Regions (default: all)")
+    parser.add_argument("--vaccines", nargs="+", help="only these vaccines (default: all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="report worker processes")
+    args = parser.parse_args(argv)
+
+    wall = time.perf_counter()
+    cache = ProcessedDataCache()
+    key, stage_timings, cached = process(args.admin_file, args.dist_file, cache)
+    processing_seconds = time.perf_counter() - wall
+
+    known_regions = LocationIndex(cache.read(key, "matched_df", LOCATION_COLUMNS)).regions
+    known_vaccines = SummaryCube(cache.read(key, "matched_df", DASHBOARD_COLUMNS)).vaccines
+    options = (("--regions", args.regions, known_regions), ("--vaccines", args.vaccines, known_vaccines))
+    for option, values, known in options:
+        unknown = [value for value in values or [] if value not in known]
+        if unknown:
+            parser.error(f"{option}: unknown {', '.join(unknown)}; the dataset has {', '.join(map(str, known))}")
+    regions = args.regions or known_regions
+    vaccines = args.vaccines or known_vaccines
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    reports_start = time.perf_counter()
+    timings = []
+    with ProcessPoolExecutor(args.workers, initializer=_load_dataset, initargs=(str(cache.root), key)) as pool:
+        futures = [pool.submit(build_reports, r, v, str(out_dir)) for r in regions for v in vaccines]
+        for future in as_completed(futures):
+            region, vaccine, seconds, paths = future.result()
+            timings.append({"Region": region, "Vaccine": vaccine, "Seconds": seconds, "Files": len(paths)})
+    reports_seconds = time.perf_counter() - reports_start
+
+    timings = pd.DataFrame(timings, columns=TIMING_COLUMNS).sort_values(["Region", "Vaccine"], ignore_index=True)
+    print("Processing stages" + (" (reused from the cache)" if cached else ""))
+    print(stage_timings.to_string(index=False))
+    print()
+    if timings.empty:
+        print("No reports: the processed dataset has no matched records.")
+    else:
+        print(timings.to_string(index=False, float_format="{:.2f}".format))
+    print()
+    print(f"{len(timings)} Region x vaccine reports ({timings['Files'].sum()} files) in {out_dir}")
+    print(f"processing {processing_seconds:.2f}s, reports {reports_seconds:.2f}s on {args.workers} workers "
+          f"(sum of report times {timings['Seconds'].sum():.2f}s), total {time.perf_counter() - wall:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark vectorized utilization categorization against the row-wise
+``categorize_utilization`` apply that Dashboard1 used to run on every rerun.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_categorize --sizes 1000 100000 1000000
+
+Rates include missing values and values exactly on each threshold, and the
+labels of both implementations are checked to be identical.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.thresholds import VACCINE_THRESHOLDS, VACCINES
+from utils.metrics import categorize_rates, rate_column, utilization_category_codes
+
+
+def legacy_categorize_utilization(row, vaccine_name):
+    """The original Dashboard1 helper, kept as reference."""
+    rate = row[f"{vaccine_name}_Utilization_Rate"] / 100
+    thresholds = VACCINE_THRESHOLDS.get(vaccine_name)
+
+    if not thresholds:
+        return "Not Applicable"
+    if rate > thresholds["unacceptable"]:
+        return "Unacceptable"
+    elif thresholds["acceptable"] <= rate <= thresholds["unacceptable"]:
+        return "Acceptable"
+    else:
+        return "Low Utilization"
+
+
+def make_rates(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rates = {}
+    for vaccine in VACCINES:
+        values = rng.uniform(0, 200, rows).round(2)
+        edges = [VACCINE_THRESHOLDS[vaccine]["acceptable"] * 100, VACCINE_THRESHOLDS[vaccine]["unacceptable"] * 100]
+        special = rng.random(rows)
+        values[special < 0.02] = np.nan
+        values[(special >= 0.02) & (special < 0.04)] = edges[0]
+        values[(special >= 0.04) & (special < 0.06)] = edges[1]
+        rates[rate_column(vaccine)] = values
+    return pd.DataFrame(rates)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--vaccine", default="BCG", choices=VACCINES)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'apply s':>9} {'vector s':>9} {'speedup':>8} {'all 5 s':>8} {'identical':>9}")
+    for rows in args.sizes:
+        df = make_rates(rows)
+        legacy, legacy_s = _timed(df.apply, lambda row: legacy_categorize_utilization(row, args.vaccine), axis=1)
+        labels, vector_s = _timed(categorize_rates, df[rate_column(args.vaccine)].to_numpy(), args.vaccine)
+        _, all_s = _timed(utilization_category_codes, df[[rate_column(v) for v in VACCINES]].to_numpy(), VACCINES)
+        identical = bool((np.asarray(labels, dtype=object) == legacy.to_numpy(dtype=object)).all())
+        print(f"{rows:>9} {legacy_s:9.3f} {vector_s:9.4f} {legacy_s / vector_s:7.0f}x {all_s:8.4f} {str(identical):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark the blocked Woreda matcher against the exhaustive O(n*m) matcher.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fuzzy_matching --sizes 1000 10000 100000
+
+The exhaustive matcher is only run up to ``--legacy-max`` Woredas; beyond
+that it takes hours and is reported as skipped. The blocked matcher runs
+with both the greedy and the optimal assignment; the script exits with an
+error if the optimal one takes longer than ``--budget`` seconds at any size.
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+from benchmarks.synthetic import make_datasets
+from utils.matching import match_woredas
+
+
+def legacy_fuzzy_matching(
+    admin_df: pd.DataFrame,
+    dist_df: pd.DataFrame,
+    threshold: int = 85
+) -> Tuple[Dict, List, List]:
+    """The original exhaustive ``perform_fuzzy_matching``, kept as reference."""
+    admin_woredas = admin_df["Woreda"].dropna().unique()
+    dist_woredas = dist_df["Woreda"].dropna().unique()
+
+    match_map = {}
+    unmatched_admin = []
+    unmatched_dist = list(dist_woredas)
+
+    for admin_woreda in admin_woredas:
+        best_match = None
+        highest_score = 0
+
+        for dist_woreda in unmatched_dist:
+            score = fuzz.ratio(admin_woreda, dist_woreda)
+            if score > highest_score:
+                highest_score = score
+                best_match = dist_woreda
+
+        if highest_score >= threshold:
+            match_map[admin_woreda] = best_match
+            unmatched_dist.remove(best_match)
+        else:
+            unmatched_admin.append(admin_woreda)
+
+    return match_map, unmatched_admin, unmatched_dist
+
+
+def _accuracy(match_map: Dict, truth: Dict) -> float:
+    """Share of all synthetic Woredas matched to their true counterpart."""
+    return sum(1 for name, match in match_map.items() if truth.get(name) == match) / max(len(truth), 1)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    parser.add_argument("--threshold", type=int, default=85)
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--budget", type=float, default=60.0, help="seconds allowed for the optimal assignment")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'woredas':>8} {'legacy s':>10} {'blocked s':>10} {'speedup':>8} "
+          f"{'matched':>8} {'correct':>8} {'legacy ok':>9} {'optimal s':>10} {'opt ok':>8}")
+    for size in args.sizes:
+        admin_df, dist_df = make_datasets(size, noise=args.noise)
+        truth = dict(zip(admin_df["Woreda"], dist_df["Woreda"]))
+        (blocked_map, _, _), blocked_s = _timed(match_woredas, admin_df, dist_df, threshold=args.threshold)
+        correct = f"{_accuracy(blocked_map, truth):.1%}"
+        (optimal_map, _, _), optimal_s = _timed(
+            match_woredas, admin_df, dist_df, threshold=args.threshold, assignment="optimal",
+        )
+        optimal_ok = f"{_accuracy(optimal_map, truth):.1%}"
+        if optimal_s > args.budget:
+            over_budget.append(size)
+
+        if size <= args.legacy_max:
+            (legacy_map, _, _), legacy_s = _timed(legacy_fuzzy_matching, admin_df, dist_df, threshold=args.threshold)
+            legacy_ok = f"{_accuracy(legacy_map, truth):.1%}"
+            legacy_col, speedup = f"{legacy_s:10.2f}", f"{legacy_s / blocked_s:7.0f}x"
+        else:
+            legacy_col, speedup, legacy_ok = f"{'skipped':>10}", f"{'-':>8}", "-"
+
+        print(f"{size:>8} {legacy_col} {blocked_s:10.2f} {speedup} "
+              f"{len(blocked_map):>8} {correct:>8} {legacy_ok:>9} {optimal_s:10.2f} {optimal_ok:>8}")
+
+    if over_budget:
+        sys.exit(f"optimal assignment over the {args.budget:.0f}s budget at {over_budget} Woredas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark how fuzzy candidate scoring scales with the number of worker
+processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parallel_matching --woredas 100000 --workers 1 2 4 8
+
+For each worker count the whole ``match_woredas`` call is timed, with the
+parallel threshold lowered so that every count above one uses the process
+pool. Speedup and efficiency are relative to one worker, and the matches of
+every run are checked to be identical to the serial ones. Worker counts above
+the available CPUs are still run but marked, since they cannot scale.
+
+Each pool spawns its workers, which import pandas and the matching modules
+afresh: on a single-CPU machine, 20000 Woredas took 1.3 s serially, 4.2 s
+with 2 workers and 7.4 s with 4. Scaling on multi-core machines has not been
+measured; that is why the app scores in-process unless
+``VACCINE_DASHBOARD_MATCH_WORKERS`` is raised after running this benchmark.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import make_datasets
+from utils import matching
+from utils.matching import default_workers, match_woredas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--woredas", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--noise", type=float, default=0.5)
+    parser.add_argument("--assignment", choices=matching.ASSIGNMENT_MODES, default="greedy")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    matching.MATCH_PARALLEL_MIN_NAMES = 0
+    cpus = default_workers()
+    admin_df, dist_df = make_datasets(args.woredas, noise=args.noise)
+    print(f"{args.woredas} Woredas, noise {args.noise}, {args.assignment} assignment, {cpus} CPUs available")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'efficiency':>10} {'same':>5}")
+
+    reference, serial_s = None, None
+    for workers in args.workers:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = match_woredas(admin_df, dist_df, assignment=args.assignment, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference, serial_s = result, best
+        speedup = serial_s / best
+        note = "  (more workers than CPUs)" if workers > cpus else ""
+        print(f"{workers:>8} {best:9.2f} {speedup:7.2f}x {speedup / workers:10.0%} "
+              f"{str(result == reference):>5}{note}")
+
+
+if __name__ == "__main__":
+    main()
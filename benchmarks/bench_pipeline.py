@@ -0,0 +1,218 @@
+"""
+Time every stage of the upload-to-dashboard path on synthetic datasets and
+write the results as JSON, so releases can be compared for regressions.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline --sizes 10000 100000 1000000 --json bench_pipeline.json
+
+Each size is the number of rows per upload: ``--woredas`` facilities (with
+the name noise of ``benchmarks.synthetic``) over as many Periods as needed.
+Stages are timed ``--repeat`` times and the fastest run is reported:
+
+- read_file, find_and_rename_cols, normalization, merge, utilization: the
+  matching ``ProcessingPipeline`` stages, run on CSV files written to a
+  temporary directory
+- fuzzy_matching: ``match_woredas`` on the raw Woreda names
+- store: writing the matched frame to Parquet and memory-mapping back the
+  columns the dashboards read; the later stages use that frame
+- filtering: building the ``LocationIndex`` plus filtering every Region and
+  the first Zone of each
+- aggregation: building the ``SummaryCube`` and the extremity table
+- export: Excel, CSV and Parquet of the largest Region's Woreda table, and
+  the national PowerPoint deck
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_datasets
+from utils.cube import SummaryCube
+from utils.export import to_csv, to_excel, to_parquet
+from utils.extremity import Extremities
+from utils.hierarchy import ALL, REGION_COL, ZONE_COL, LocationIndex
+from utils.matching import match_woredas
+from utils.processing import ProcessingPipeline
+from utils.report import create_ppt, woreda_table
+from utils.store import DASHBOARD_COLUMNS, read_frame, write_frame
+
+# Benchmark stage -> the ProcessingPipeline stages it covers.
+PIPELINE_STAGES = {
+    "read_file": ["read"],
+    "find_and_rename_cols": ["clean", "detect", "rename"],
+    "normalization": ["normalize"],
+    "merge": ["merge", "unmatched"],
+    "utilization": ["metrics"],
+}
+
+VACCINE = "BCG"
+
+
+def _timed(func: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_processing(admin_path: Path, dist_path: Path) -> Dict:
+    result = ProcessingPipeline().run(admin_path, dist_path)
+    seconds = {t.stage: t.seconds for t in result.timings}
+    stages = {name: sum(seconds[s] for s in parts) for name, parts in PIPELINE_STAGES.items()}
+    return {"stages": stages, "matched_df": result.matched_df}
+
+
+def bench_store(matched_df: pd.DataFrame, workdir: Path) -> Dict:
+    path = workdir / "matched_df.parquet"
+    _, write_s = _timed(write_frame, matched_df, path)
+    stored, read_s = _timed(read_frame, path, DASHBOARD_COLUMNS)
+    return {
+        "stages": {"store": write_s + read_s},
+        "details": {"write_s": write_s, "read_s": read_s, "bytes": path.stat().st_size},
+        "frame": stored,
+    }
+
+
+def bench_filtering(matched_df: pd.DataFrame) -> Dict:
+    index, build_s = _timed(LocationIndex, matched_df)
+    selections = [(region, ALL) for region in index.regions]
+    selections += [(region, index.zones(region)[0]) for region in index.regions if index.zones(region)]
+    start = time.perf_counter()
+    for region, zone in selections:
+        index.filter(matched_df, region, zone, ALL, ALL)
+    filter_s = time.perf_counter() - start
+    return {
+        "stages": {"filtering": build_s + filter_s},
+        "details": {"index_build_s": build_s, "filters": len(selections), "filter_mean_s": filter_s / len(selections)},
+        "index": index,
+    }
+
+
+def bench_aggregation(matched_df: pd.DataFrame) -> Dict:
+    cube, cube_s = _timed(SummaryCube, matched_df)
+    start = time.perf_counter()
+    extremities = Extremities(matched_df)
+    extremities.by_group(matched_df, VACCINE, [REGION_COL, ZONE_COL])
+    extremity_s = time.perf_counter() - start
+    return {
+        "stages": {"aggregation": cube_s + extremity_s},
+        "details": {"cube_build_s": cube_s, "extremity_table_s": extremity_s},
+        "cube": cube,
+        "extremities": extremities,
+    }
+
+
+def bench_export(matched_df: pd.DataFrame, index: LocationIndex, cube: SummaryCube, extremities: Extremities) -> Dict:
+    region = matched_df[REGION_COL].value_counts().index[0]
+    table = woreda_table(index.filter(matched_df, region), VACCINE)
+    details = {"rows": len(table)}
+    for name, export in (("xlsx", to_excel), ("csv", to_csv), ("parquet", to_parquet)):
+        data, details[f"{name}_s"] = _timed(export, table)
+        details[f"{name}_bytes"] = len(data)
+    deck, details["pptx_s"] = _timed(create_ppt, cube, matched_df, extremities, VACCINE, (ALL, ALL, ALL, ALL))
+    details["pptx_bytes"] = len(deck)
+    total = sum(value for key, value in details.items() if key.endswith("_s"))
+    return {"stages": {"export": total}, "details": details}
+
+
+def bench_size(rows: int, woredas: int, noise: float, workdir: Path) -> Dict:
+    n_woredas = min(rows, woredas)
+    periods = list(range(2000, 2000 + math.ceil(rows / n_woredas)))
+    admin_df, dist_df = make_datasets(n_woredas, periods=periods, noise=noise)
+    admin_path, dist_path = workdir / f"admin_{rows}.csv", workdir / f"dist_{rows}.csv"
+    admin_df.to_csv(admin_path, index=False)
+    dist_df.to_csv(dist_path, index=False)
+
+    processing = bench_processing(admin_path, dist_path)
+    _, fuzzy_s = _timed(match_woredas, admin_df, dist_df)
+    store = bench_store(processing["matched_df"], workdir)
+    matched_df = store["frame"]
+    filtering = bench_filtering(matched_df)
+    aggregation = bench_aggregation(matched_df)
+    export = bench_export(matched_df, filtering["index"], aggregation["cube"], aggregation["extremities"])
+
+    stages = {**processing["stages"], "fuzzy_matching": fuzzy_s}
+    for part in (store, filtering, aggregation, export):
+        stages.update(part["stages"])
+    return {
+        "stages": stages,
+        "details": {
+            "store": store["details"],
+            "filtering": filtering["details"],
+            "aggregation": aggregation["details"],
+            "export": export["details"],
+        },
+        "shape": {
+            "admin_rows": len(admin_df),
+            "dist_rows": len(dist_df),
+            "matched_rows": len(matched_df),
+            "woredas": n_woredas,
+            "periods": len(periods),
+        },
+    }
+
+
+def _best(runs: List[Dict]) -> Dict:
+    """The first run with every stage replaced by its fastest time."""
+    best = dict(runs[0])
+    best["stages"] = {stage: min(run["stages"][stage] for run in runs) for stage in runs[0]["stages"]}
+    best["stages"]["total"] = sum(best["stages"].values())
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--woredas", type=int, default=10000, help="distinct facilities per upload")
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", type=Path, default=Path("bench_pipeline.json"), help="output file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            runs = [bench_size(rows, args.woredas, args.noise, Path(workdir)) for _ in range(args.repeat)]
+            result = {"rows": rows, **_best(runs)}
+            results.append(result)
+            stages = result["stages"]
+            print(f"{rows:>9} rows: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in stages.items()))
+
+    report = {
+        "benchmark": "pipeline",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": results,
+    }
+    args.json.write_text(json.dumps(report, indent=2))
+    print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
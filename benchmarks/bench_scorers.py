@@ -0,0 +1,96 @@
+"""
+Check that every scorer backend of ``utils.scorers`` gives the reference
+(``fuzzywuzzy``) scores and matches, and time them.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scorers --sizes 10000 100000
+
+On the sample files in ``data/``, the full admin x dist Woreda score matrix
+of each backend is compared with the reference one, and ``match_woredas``
+is run with each backend in every assignment mode, with and without exact
+pairing first. The ``--sizes`` synthetic datasets are then matched with each
+backend to compare timings and check the matches again. The script exits
+with an error on any difference.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import DATA_DIR, make_datasets
+from utils.matching import ASSIGNMENT_MODES, match_woredas
+from utils.scorers import SCORERS, get_scorer
+
+REFERENCE = "fuzzywuzzy"
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def check_sample() -> list:
+    """Differences from the reference on the sample data, printed as found."""
+    admin_df = pd.read_csv(DATA_DIR / "Administred.csv")
+    dist_df = pd.read_csv(DATA_DIR / "Distributed.csv")
+    admin_names, dist_names = admin_df["Woreda"].unique(), dist_df["Woreda"].unique()
+    failures = []
+
+    print(f"sample: {len(admin_names)} x {len(dist_names)} Woreda score matrix")
+    reference, reference_s = _timed(get_scorer(REFERENCE).scores, admin_names, dist_names)
+    for name in SCORERS:
+        matrix, seconds = _timed(get_scorer(name).scores, admin_names, dist_names)
+        differences = int(np.count_nonzero(matrix != reference))
+        print(f"  {name:>10}: {seconds:7.3f}s ({reference_s / seconds:6.1f}x), {differences} differing scores")
+        if differences:
+            failures.append(f"sample scores of {name}")
+
+    print("sample: match_woredas")
+    for assignment in ASSIGNMENT_MODES:
+        for exact_first in (True, False):
+            expected = match_woredas(admin_df, dist_df, exact_first=exact_first, assignment=assignment)
+            for name in SCORERS:
+                result = match_woredas(admin_df, dist_df, exact_first=exact_first, assignment=assignment, scorer=name)
+                same = result == expected
+                print(f"  {assignment:>8} exact_first={exact_first!s:<5} {name:>10}: "
+                      f"{len(result[0])} matches, same as reference: {same}")
+                if not same:
+                    failures.append(f"sample matches of {name} ({assignment}, exact_first={exact_first})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--noise", type=float, default=0.5)
+    parser.add_argument("--assignment", choices=ASSIGNMENT_MODES, default="greedy")
+    args = parser.parse_args()
+
+    failures = check_sample()
+
+    print(f"synthetic: match_woredas, {args.assignment} assignment, noise {args.noise}")
+    print(f"{'woredas':>8} " + " ".join(f"{name + ' s':>14}" for name in SCORERS) + f" {'speedup':>8} {'same':>5}")
+    for size in args.sizes:
+        admin_df, dist_df = make_datasets(size, noise=args.noise)
+        results, seconds = {}, {}
+        for name in SCORERS:
+            results[name], seconds[name] = _timed(
+                match_woredas, admin_df, dist_df, assignment=args.assignment, scorer=name,
+            )
+        same = all(result == results[REFERENCE] for result in results.values())
+        fastest = min(seconds.values())
+        print(f"{size:>8} " + " ".join(f"{seconds[name]:14.2f}" for name in SCORERS)
+              + f" {seconds[REFERENCE] / fastest:7.1f}x {str(same):>5}")
+        if not same:
+            failures.append(f"synthetic matches at {size} Woredas")
+
+    if failures:
+        sys.exit("backends differ from the reference: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
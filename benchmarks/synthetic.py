@@ -0,0 +1,80 @@
+"""
+Synthetic administered/distributed datasets scaled from the sample files in
+``data/``, with the kind of Woreda name noise seen between the two sources.
+"""
+import random
+from pathlib import Path
+from typing import Sequence, Tuple
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+VACCINES = ["BCG", "IPV", "Measles", "Penta", "Rota"]
+WOREDAS_PER_ZONE = 80
+FACILITY_SUFFIXES = ["", " Health Center", " Health center", " General Hospital", " Town"]
+ABBREVIATIONS = {" Health Center": " HC", " Health center": " HC", " General Hospital": " GH"}
+
+
+def _load_seeds() -> Tuple[list, list]:
+    sample = pd.read_csv(DATA_DIR / "Administred.csv")
+    zones = sample[["Region", "Zone"]].drop_duplicates().values.tolist()
+    stems = sample["Woreda"].str.replace(r"\s+(Health [Cc]enter|General Hospital)$", "", regex=True)
+    return zones, sorted(stems.unique())
+
+
+def _noisy(name: str, rng: random.Random, noise: float) -> str:
+    """Apply the spelling drift typically seen between admin and dist names."""
+    if rng.random() >= noise:
+        return name
+    kind = rng.random()
+    if kind < 0.4:
+        for full, short in ABBREVIATIONS.items():
+            if name.endswith(full):
+                return name[: -len(full)] + short
+    if kind < 0.7 and len(name) > 4:
+        pos = rng.randrange(1, len(name) - 1)
+        return name[:pos] + name[pos + 1:]
+    if kind < 0.85 and len(name) > 4:
+        pos = rng.randrange(1, len(name) - 2)
+        return name[:pos] + name[pos + 1] + name[pos] + name[pos + 2:]
+    return name.lower() if kind < 0.95 else name.upper()
+
+
+def make_datasets(
+    n_woredas: int,
+    periods: Sequence = (2015,),
+    noise: float = 0.3,
+    seed: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build ``(admin_df, dist_df)`` with ``n_woredas`` facilities per period.
+
+    Frames use the raw column layout of the sample CSVs (``Region``, ``Zone``,
+    ``Woreda``, ``Period``, ``BCG Administered`` ...). Distributed names are
+    the administered names with noise applied to a ``noise`` fraction of them.
+    """
+    rng = random.Random(seed)
+    zones, stems = _load_seeds()
+    n_zones = max(1, n_woredas // WOREDAS_PER_ZONE)
+
+    facilities = []
+    for i in range(n_woredas):
+        region, zone = zones[i % n_zones % len(zones)]
+        if n_zones > len(zones):
+            zone = f"{zone} {i % n_zones // len(zones) + 1}"
+        stem = stems[i % len(stems)]
+        name = f"{stem} {i // len(stems) + 1}{rng.choice(FACILITY_SUFFIXES)}"
+        facilities.append((region, zone, name, _noisy(name, rng, noise)))
+
+    admin_rows, dist_rows = [], []
+    for period in periods:
+        for region, zone, admin_name, dist_name in facilities:
+            dist_counts = [rng.randrange(50, 5000) for _ in VACCINES]
+            admin_counts = [int(count * rng.uniform(0.2, 1.5)) for count in dist_counts]
+            admin_rows.append([region, zone, admin_name, period] + admin_counts)
+            dist_rows.append([region, zone, dist_name, period] + dist_counts)
+
+    base_cols = ["Region", "Zone", "Woreda", "Period"]
+    admin_df = pd.DataFrame(admin_rows, columns=base_cols + [f"{v} Administered" for v in VACCINES])
+    dist_df = pd.DataFrame(dist_rows, columns=base_cols + [f"{v} Distributed" for v in VACCINES])
+    return admin_df, dist_df
@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Processed datasets are cached on disk, keyed by a hash of both uploads.
+CACHE_DIR = Path(os.environ.get("VACCINE_DASHBOARD_CACHE_DIR", BASE_DIR / ".cache"))
+PROCESSED_CACHE_MAX_BYTES = int(os.environ.get("VACCINE_DASHBOARD_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+PROCESSED_CACHE_MAX_ENTRIES = int(os.environ.get("VACCINE_DASHBOARD_CACHE_MAX_ENTRIES", 20))
+
+# Optional JSON or YAML file overriding values in config/thresholds.py, e.g.
+# {"extremity": {"BCG": {"high": 1.25}}}. Read once when the app starts.
+THRESHOLDS_FILE = os.environ.get("VACCINE_DASHBOARD_THRESHOLDS") or None
+
+# The per-Woreda utilization scatter renders with WebGL above
+# SCATTER_WEBGL_POINTS points, and above SCATTER_MAX_POINTS it shows a
+# per-Zone summary plus outliers until a Zone is selected.
+SCATTER_WEBGL_POINTS = int(os.environ.get("VACCINE_DASHBOARD_SCATTER_WEBGL_POINTS", 1000))
+SCATTER_MAX_POINTS = int(os.environ.get("VACCINE_DASHBOARD_SCATTER_MAX_POINTS", 5000))
+
+# Upper bound on the serialized Plotly figures kept in memory for repeat views.
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("VACCINE_DASHBOARD_FIGURE_CACHE_MAX_BYTES", 64 * 1024 ** 2))
+
+# Excel exports with at least this many rows are written in xlsxwriter's
+# constant_memory mode; generated export files are kept per filter state.
+EXCEL_CONSTANT_MEMORY_ROWS = int(os.environ.get("VACCINE_DASHBOARD_EXCEL_CONSTANT_MEMORY_ROWS", 50_000))
+EXPORT_CACHE_MAX_ENTRIES = int(os.environ.get("VACCINE_DASHBOARD_EXPORT_CACHE_MAX_ENTRIES", 64))
+
+# Rendered PowerPoint reports kept per dataset, vaccine and filter state.
+REPORT_CACHE_MAX_ENTRIES = int(os.environ.get("VACCINE_DASHBOARD_REPORT_CACHE_MAX_ENTRIES", 16))
+
+# Woreda aliases learned from confirmed fuzzy matches (admin name -> facility
+# <- dist name), plus an optional hand-maintained CSV of admin_woreda,
+# dist_woreda pairs that always wins over learned aliases.
+WOREDA_ALIASES_FILE = Path(os.environ.get("VACCINE_DASHBOARD_WOREDA_ALIASES", BASE_DIR / "data" / "woreda_aliases.csv"))
+WOREDA_ALIAS_OVERRIDES = os.environ.get("VACCINE_DASHBOARD_WOREDA_ALIAS_OVERRIDES") or None
+
+# How leftover Woredas are paired after exact matching: "greedy" takes each
+# admin Woreda's best remaining candidate in upload order, "optimal" solves a
+# one-to-one assignment over all scored candidates. Candidate groups with at
+# most MATCH_HUNGARIAN_MAX_CELLS admin x dist pairs are solved exactly, larger
+# ones greedily by score.
+MATCH_ASSIGNMENT = os.environ.get("VACCINE_DASHBOARD_MATCH_ASSIGNMENT", "optimal")
+MATCH_HUNGARIAN_MAX_CELLS = int(os.environ.get("VACCINE_DASHBOARD_MATCH_HUNGARIAN_MAX_CELLS", 250_000))
+
+# Fuzzy candidate scoring runs in the app process by default. With
+# MATCH_WORKERS above 1 (0: one per available CPU) it runs on a pool of
+# spawned processes once at least MATCH_PARALLEL_MIN_NAMES admin Woredas are
+# left after exact matching; each task covers at least MATCH_CHUNK_MIN_NAMES
+# of them. See benchmarks/bench_parallel_matching.py before enabling it.
+MATCH_WORKERS = int(os.environ.get("VACCINE_DASHBOARD_MATCH_WORKERS", 1))
+MATCH_PARALLEL_MIN_NAMES = int(os.environ.get("VACCINE_DASHBOARD_MATCH_PARALLEL_MIN_NAMES", 5_000))
+MATCH_CHUNK_MIN_NAMES = int(os.environ.get("VACCINE_DASHBOARD_MATCH_CHUNK_MIN_NAMES", 500))
+
+# Woreda similarity backend (see utils/scorers.py): "rapidfuzz" scores a
+# block of up to MATCH_DENSE_MAX_CELLS name pairs in one call, "fuzzywuzzy"
+# is the pair-by-pair reference.
+MATCH_SCORER = os.environ.get("VACCINE_DASHBOARD_MATCH_SCORER", "rapidfuzz")
+MATCH_DENSE_MAX_CELLS = int(os.environ.get("VACCINE_DASHBOARD_MATCH_DENSE_MAX_CELLS", 1_000_000))
+
+# Lowest fuzz.ratio score accepted for a fuzzy Region, Zone or Woreda match
+# in hierarchical processing.
+MATCH_THRESHOLD = int(os.environ.get("VACCINE_DASHBOARD_MATCH_THRESHOLD", 85))
@@ -4,4 +4,16 @@ VACCINE_THRESHOLDS = {
     "Measles": {"acceptable": 0.65, "unacceptable": 1.0, "discrepancy_threshold": 100},
     "Penta": {"acceptable": 0.95, "unacceptable": 1.0, "discrepancy_threshold": 100},
     "Rota": {"acceptable": 0.90, "unacceptable": 1.0, "discrepancy_threshold": 100},
-}
\ No newline at end of file
+}
+
+VACCINES = list(VACCINE_THRESHOLDS)
+
+# Utilization (administered / distributed) above "high" or below "low" is
+# flagged as an extremity.
+EXTREMITY_THRESHOLDS = {
+    "BCG": {"high": 1.20, "low": 0.30},
+    "IPV": {"high": 1.30, "low": 0.75},
+    "Measles": {"high": 1.25, "low": 0.50},
+    "Penta": {"high": 1.30, "low": 0.80},
+    "Rota": {"high": 1.30, "low": 0.75},
+}
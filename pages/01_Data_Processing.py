@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
-import re
-import time
+
+from utils.cache import ProcessedDataCache, content_hash, dataset_available, load_frame
+from utils.processing import AppendPipeline, MissingColumnsError, ProcessingPipeline, hierarchical_dataset
 
 st.set_page_config(
     page_title="Immunization Data Triangulation",
@@ -310,6 +310,27 @@ with u_col2:
                                 help="Upload file with vaccine distribution data", label_visibility="collapsed")
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Monthly uploads can be added to the dataset processed last instead of
+# re-uploading the full history.
+append_mode = False
+if dataset_available(st.session_state.get("dataset_key")):
+    hierarchical_base = hierarchical_dataset(ProcessedDataCache(), st.session_state["dataset_key"])
+    append_mode = st.checkbox("➕ Append these files as new period(s) of the current dataset",
+                              disabled=hierarchical_base,
+                              help="Only the uploaded periods are matched, using the stored Woreda match map. "
+                                   "Rows of periods already in the dataset are replaced.")
+    if hierarchical_base:
+        st.caption("The current dataset was matched by Region → Zone → Woreda, so files cannot be appended "
+                   "to it; process the full history again instead.")
+
+# Region -> Zone -> Woreda matching keeps identically named facilities in
+# different Zones apart and tolerates Region/Zone spelling differences.
+hierarchical_mode = st.checkbox("🧭 Match by Region → Zone → Woreda",
+                                disabled=append_mode,
+                                help="Regions are matched first, then Zones within each matched Region, then "
+                                     "Woredas within each matched Zone. The Distributed file needs Region and "
+                                     "Zone columns.")
+
 # ----------------- Buttons -----------------
 a_col, r_col = st.columns([2, 1])
 with a_col:
@@ -322,61 +343,7 @@ with r_col:
 status_ph = st.empty()
 
 # ----------------- Processing -----------------
-def read_file(uploaded_file):
-    if uploaded_file.name.lower().endswith(".csv"):
-        return pd.read_csv(uploaded_file)
-    else:
-        return pd.read_excel(uploaded_file)
-
-def clean_column_names(df):
-    df.columns = (
-        df.columns.str.strip()
-        .str.replace(' ', '_', regex=False)
-        .str.replace('.', '', regex=False)
-        .str.replace('-', '_', regex=False)
-        .str.lower()
-    )
-    return df
-
-def find_and_rename_cols(df, col_type):
-    patterns = {
-        'Woreda_Admin': ['woreda', 'woreda_administered', 'woreda_name', 'facility'],
-        'Region_Admin': ['region', 'region_administered', 'region_name'],
-        'Zone_Admin': ['zone', 'zone_administered', 'zone_name'],
-        'Period_Admin': ['period', 'month', 'date'],
-        'BCG_Administered': ['bcg', 'bcg_administered'],
-        'IPV_Administered': ['ipv', 'ipv_administered'],
-        'Measles_Administered': ['measles', 'measles_administered'],
-        'Penta_Administered': ['penta', 'penta_administered'],
-        'Rota_Administered': ['rota', 'rota_administered'],
-        'Woreda_Dist': ['woreda', 'woreda_distributed', 'woreda_name', 'facility'],
-        'Period_Dist': ['period', 'month', 'date'],
-        'BCG_Distributed': ['bcg', 'bcg_distributed', 'bcg_doses', 'bcg_dist'],
-        'IPV_Distributed': ['ipv', 'ipv_distributed', 'ipv_doses', 'ipv_dist'],
-        'Measles_Distributed': ['measles', 'measles_distributed', 'measles_doses', 'measles_dist'],
-        'Penta_Distributed': ['penta', 'penta_distributed', 'penta_doses', 'penta_dist'],
-        'Rota_Distributed': ['rota', 'rota_distributed', 'rota_doses', 'rota_dist']
-    }
-
-    rename_map = {}
-    found_cols = {}
-    if col_type == 'admin':
-        relevant_patterns = {k: v for k, v in patterns.items() if '_admin' in k.lower()}
-    else:
-        relevant_patterns = {k: v for k, v in patterns.items() if '_dist' in k.lower()}
-
-    for final_name, prefixes in relevant_patterns.items():
-        for raw_col in df.columns:
-            for prefix in prefixes:
-                if raw_col.startswith(prefix):
-                    if final_name not in found_cols:
-                        rename_map[raw_col] = final_name
-                        found_cols[final_name] = raw_col
-                        break
-            if final_name in found_cols:
-                break
-
-    return rename_map, found_cols
+DATASET_LABELS = {"admin": ("Admin", "Administered"), "dist": ("Distributed", "Distributed")}
 
 if process_btn:
     if admin_file is None or dist_file is None:
@@ -396,113 +363,59 @@ if process_btn:
         
         progress_bar = st.progress(0)
         status_text = st.empty()
+
+        def show_progress(fraction, label):
+            progress_bar.progress(int(fraction * 100))
+            status_text.markdown(f'<div class="processing-status">{label}...</div>', unsafe_allow_html=True)
         
         try:
-            # Step 1: read files
-            status_text.markdown('<div class="processing-status">Reading files...</div>', unsafe_allow_html=True)
-            admin_df = read_file(admin_file)
-            dist_df = read_file(dist_file)
-            progress_bar.progress(10)
-            time.sleep(0.5)
-
-            # Step 2: clean column names
-            status_text.markdown('<div class="processing-status">Cleaning column names...</div>', unsafe_allow_html=True)
-            admin_df = clean_column_names(admin_df)
-            dist_df = clean_column_names(dist_df)
-            progress_bar.progress(25)
-            time.sleep(0.5)
-
-            # Step 3: rename columns
-            status_text.markdown('<div class="processing-status">Identifying key columns...</div>', unsafe_allow_html=True)
-            admin_rename_map, admin_found = find_and_rename_cols(admin_df, "admin")
-            dist_rename_map, dist_found = find_and_rename_cols(dist_df, "dist")
-            progress_bar.progress(45)
-            time.sleep(0.5)
-
-            essential_admin = ['Woreda_Admin', 'Region_Admin', 'Zone_Admin', 'Period_Admin']
-            if not all(col in admin_rename_map.values() for col in essential_admin):
-                missing = [c for c in essential_admin if c not in admin_rename_map.values()]
-                status_ph.markdown(f"""
-                <div class="stError">
-                    <b>❌ Missing Essential Admin Columns</b><br>
-                    Could not find: {', '.join(missing)}<br>
-                    Please check your Administered file structure and try again.
+            cache = ProcessedDataCache()
+            if append_mode:
+                pipeline = AppendPipeline(st.session_state["dataset_key"], cache, on_progress=show_progress)
+            else:
+                pipeline = ProcessingPipeline(on_progress=show_progress, hierarchical=hierarchical_mode)
+            dataset_key = content_hash(admin_file, dist_file, settings=pipeline.settings())
+            from_cache = dataset_key in cache
+            if not from_cache:
+                cache.put(dataset_key, pipeline.run(admin_file, dist_file).frames())
+
+            # Save session: only the key, the frames stay in the on-disk store
+            st.session_state["dataset_key"] = dataset_key
+            
+            if from_cache:
+                status_ph.markdown("""
+                <div class="stSuccess">
+                    <b>✅ Loaded Previously Processed Data</b><br>
+                    These files were already processed. Cached results are loaded and ready for dashboard analysis.
                 </div>
                 """, unsafe_allow_html=True)
-                progress_bar.empty()
-                status_text.empty()
-                st.stop()
-
-            essential_dist = ['Woreda_Dist', 'Period_Dist']
-            if not all(col in dist_rename_map.values() for col in essential_dist):
-                missing = [c for c in essential_dist if c not in dist_rename_map.values()]
-                status_ph.markdown(f"""
-                <div class="stError">
-                    <b>❌ Missing Essential Distributed Columns</b><br>
-                    Could not find: {', '.join(missing)}<br>
-                    Please check your Distributed file structure and try again.
+            else:
+                status_ph.markdown("""
+                <div class="stSuccess">
+                    <b>✅ Processing Complete</b><br>
+                    Data successfully processed and matched. Files are ready for dashboard analysis.
                 </div>
                 """, unsafe_allow_html=True)
-                progress_bar.empty()
-                status_text.empty()
-                st.stop()
-
-            # Step 4: apply renaming
-            status_text.markdown('<div class="processing-status">Standardizing column names...</div>', unsafe_allow_html=True)
-            admin_df = admin_df.rename(columns=admin_rename_map)
-            dist_df = dist_df.rename(columns=dist_rename_map)
-            progress_bar.progress(60)
-            time.sleep(0.5)
-
-            # Step 5: normalize woreda names
-            status_text.markdown('<div class="processing-status">Normalizing location names...</div>', unsafe_allow_html=True)
-            def normalize_woreda_name(name):
-                return re.sub(r'[^a-zA-Z0-9]', '', str(name)).lower()
-            admin_df["woreda_normalized"] = admin_df["Woreda_Admin"].apply(normalize_woreda_name)
-            dist_df["woreda_normalized"] = dist_df["Woreda_Dist"].apply(normalize_woreda_name)
-            progress_bar.progress(75)
-            time.sleep(0.5)
-
-            # Step 6: match
-            status_text.markdown('<div class="processing-status">Matching records...</div>', unsafe_allow_html=True)
-            matched_df = pd.merge(
-                admin_df,
-                dist_df,
-                left_on=["woreda_normalized", "Period_Admin"],
-                right_on=["woreda_normalized", "Period_Dist"],
-                how="inner",
-            )
-            if "Period_Dist" in matched_df:
-                matched_df = matched_df.drop(columns="Period_Dist")
-            matched_df.rename(columns={"Period_Admin": "Period"}, inplace=True)
-            progress_bar.progress(90)
-            time.sleep(0.5)
-
-            # Save session
-            st.session_state["matched_df"] = matched_df
-            st.session_state["admin_df"] = admin_df
-            st.session_state["dist_df"] = dist_df
-            st.session_state["unmatched_admin_df"] = admin_df[~admin_df["woreda_normalized"].isin(matched_df["woreda_normalized"])]
-            st.session_state["unmatched_dist_df"] = dist_df[~dist_df["woreda_normalized"].isin(matched_df["woreda_normalized"])]
-
-            progress_bar.progress(100)
-            status_text.markdown('<div class="processing-status">Complete!</div>', unsafe_allow_html=True)
-            time.sleep(0.5)
-            
-            status_ph.markdown("""
-            <div class="stSuccess">
-                <b>✅ Processing Complete</b><br>
-                Data successfully processed and matched. Files are ready for dashboard analysis.
-            </div>
-            """, unsafe_allow_html=True)
 
             # Metrics
             st.markdown("### Processing Results")
             mcol1, mcol2, mcol3 = st.columns(3)
-            mcol1.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Matched Records</div><div class="custom-metric-value">{len(matched_df):,}</div></div>', unsafe_allow_html=True)
-            mcol2.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Unmatched Admin</div><div class="custom-metric-value">{len(st.session_state["unmatched_admin_df"]):,}</div></div>', unsafe_allow_html=True)
-            mcol3.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Unmatched Dist</div><div class="custom-metric-value">{len(st.session_state["unmatched_dist_df"]):,}</div></div>', unsafe_allow_html=True)
+            mcol1.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Matched Records</div><div class="custom-metric-value">{cache.rows(dataset_key, "matched_df"):,}</div></div>', unsafe_allow_html=True)
+            mcol2.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Unmatched Admin</div><div class="custom-metric-value">{cache.rows(dataset_key, "unmatched_admin_df"):,}</div></div>', unsafe_allow_html=True)
+            mcol3.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Unmatched Dist</div><div class="custom-metric-value">{cache.rows(dataset_key, "unmatched_dist_df"):,}</div></div>', unsafe_allow_html=True)
+
+            progress_bar.empty()
+            status_text.empty()
 
+        except MissingColumnsError as e:
+            short_label, file_label = DATASET_LABELS[e.dataset]
+            status_ph.markdown(f"""
+            <div class="stError">
+                <b>❌ Missing Essential {short_label} Columns</b><br>
+                Could not find: {', '.join(e.missing)}<br>
+                Please check your {file_label} file structure and try again.
+            </div>
+            """, unsafe_allow_html=True)
             progress_bar.empty()
             status_text.empty()
 
@@ -517,6 +430,26 @@ if process_btn:
             progress_bar.empty()
             status_text.empty()
 
+# The processed data cache may have evicted (or lost) this session's dataset.
+if "dataset_key" in st.session_state and not dataset_available(st.session_state["dataset_key"]):
+    del st.session_state["dataset_key"]
+    st.info("The processed dataset is no longer available. Please process the files again.")
+
+if "dataset_key" in st.session_state:
+    coerced = load_frame(st.session_state["dataset_key"], "coerced_cells")
+    if len(coerced):
+        st.warning(f"{coerced['Cells'].sum():,} dose count cell(s) were not numbers and were read as missing.")
+        with st.expander("⚠️ Non-numeric Count Cells"):
+            st.dataframe(coerced, use_container_width=True, hide_index=True)
+    with st.expander("🧭 Match Statistics per Level"):
+        st.dataframe(load_frame(st.session_state["dataset_key"], "match_stats"), use_container_width=True, hide_index=True)
+        st.caption("Candidate Pairs: fuzzy comparisons within matched parents. "
+                   "Unblocked Pairs: comparisons a search of the whole level would need.")
+    with st.expander("⏱️ Processing Stage Timings"):
+        timings = load_frame(st.session_state["dataset_key"], "processing_timings")
+        st.dataframe(timings, use_container_width=True, hide_index=True)
+        st.caption(f"Total processing time: {timings['Seconds'].sum():.2f} s")
+
 if reset_btn:
     for key in list(st.session_state.keys()):
         if key != "authenticated" and key != "username":
@@ -538,13 +471,15 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-if "unmatched_admin_df" in st.session_state and "unmatched_dist_df" in st.session_state:
+if "dataset_key" in st.session_state:
+    unmatched_admin_df = load_frame(st.session_state["dataset_key"], "unmatched_admin_df")
+    unmatched_dist_df = load_frame(st.session_state["dataset_key"], "unmatched_dist_df")
     c1, c2 = st.columns(2)
     with c1:
-        if not st.session_state["unmatched_admin_df"].empty:
+        if not unmatched_admin_df.empty:
             st.markdown("**Administered — Unmatched Records**")
-            st.dataframe(st.session_state["unmatched_admin_df"].head(10), use_container_width=True)
-            st.caption(f"Showing 10 of {len(st.session_state['unmatched_admin_df'])} unmatched administered records")
+            st.dataframe(unmatched_admin_df.head(10), use_container_width=True)
+            st.caption(f"Showing 10 of {len(unmatched_admin_df)} unmatched administered records")
         else:
             st.markdown("""
             <div class="stSuccess">
@@ -553,10 +488,10 @@ if "unmatched_admin_df" in st.session_state and "unmatched_dist_df" in st.sessio
             </div>
             """, unsafe_allow_html=True)
     with c2:
-        if not st.session_state["unmatched_dist_df"].empty:
+        if not unmatched_dist_df.empty:
             st.markdown("**Distributed — Unmatched Records**")
-            st.dataframe(st.session_state["unmatched_dist_df"].head(10), use_container_width=True)
-            st.caption(f"Showing 10 of {len(st.session_state['unmatched_dist_df'])} unmatched distributed records")
+            st.dataframe(unmatched_dist_df.head(10), use_container_width=True)
+            st.caption(f"Showing 10 of {len(unmatched_dist_df)} unmatched distributed records")
         else:
             st.markdown("""
             <div class="stSuccess">
@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from config.thresholds import VACCINE_THRESHOLDS
-from io import BytesIO
+from config.thresholds import VACCINES
+from utils.cache import dataset_available, load_frame, load_location_index, load_summary_cube
+from utils.charts import CATEGORY_COLORS
+from utils.cube import WOREDA_COUNT
+from utils.export import export_buttons
+from utils.figure_cache import figure_cache, figure_key
+from utils.report import woreda_table
+from utils.store import DASHBOARD_COLUMNS
 # =======================
 # Page Config
 # =======================
@@ -400,27 +405,109 @@ st.markdown("""
 # =======================
 # Helper Functions
 # =======================
-def to_excel(df):
-    """Convert DataFrame to Excel file for download"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Sheet1')
-    processed_data = output.getvalue()
-    return processed_data
 
-def categorize_utilization(row, vaccine_name):
-    """Categorize utilization rate based on thresholds"""
-    rate = row[f"{vaccine_name}_Utilization_Rate"] / 100
-    thresholds = VACCINE_THRESHOLDS.get(vaccine_name)
-   
-    if not thresholds:
-        return "Not Applicable"
-    if rate > thresholds["unacceptable"]:
-        return "Unacceptable"
-    elif thresholds["acceptable"] <= rate <= thresholds["unacceptable"]:
-        return "Acceptable"
-    else:
-        return "Low Utilization"
+def utilization_pie(category_counts, selected_vaccine):
+    """Pie chart of the utilization category counts"""
+    # Pie chart data preparation
+    category_counts_pie = category_counts.reset_index()
+    category_counts_pie.columns = ["Category", "Count"]
+    category_counts_pie["Percentage"] = (category_counts_pie["Count"] / category_counts_pie["Count"].sum() * 100).round(2)
+    
+    pie_fig = px.pie(category_counts_pie, values="Percentage", names="Category", hole=0.0, color="Category", color_discrete_map=CATEGORY_COLORS,
+                     title=f"Utilization Category Distribution for {selected_vaccine}")
+    
+    pie_fig.update_traces(
+        textinfo='percent+label',
+        textfont=dict(color="white", size=12, weight='bold'),
+        textposition='inside',
+        insidetextorientation='horizontal'
+    )
+    pie_fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#2c3e50', size=12),
+        height=450,
+        showlegend=True,
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.95)',
+            font=dict(color='#2c3e50', size=11),
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5
+        ),
+        title=dict(
+            font=dict(size=18, color='#2c3e50', weight='bold'),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    return pie_fig
+
+def utilization_stacked_bar(cube, groupby_col, selection, selected_vaccine):
+    """Stacked percentage bars of utilization categories per area"""
+    breakdown = cube.breakdown(groupby_col, *selection)
+    stacked_bar_data = cube.category_breakdown(breakdown, selected_vaccine).rename(columns={"Category": f"{selected_vaccine}_Utilization_Category"})
+    total_by_group = stacked_bar_data.groupby(groupby_col, observed=True)["Count"].sum().reset_index(name='Total')
+    stacked_bar_data = stacked_bar_data.merge(total_by_group, on=groupby_col)
+    stacked_bar_data["Percentage"] = (stacked_bar_data["Count"] / stacked_bar_data["Total"] * 100).round(2)
+    
+    bar_fig = go.Figure()
+    for category in ["Acceptable", "Low Utilization", "Unacceptable"]:
+        f_data = stacked_bar_data[stacked_bar_data[f"{selected_vaccine}_Utilization_Category"] == category]
+        bar_fig.add_trace(go.Bar(x=f_data[groupby_col], y=f_data["Percentage"], name=category, marker_color=CATEGORY_COLORS.get(category),
+                                 text=f_data["Percentage"].apply(lambda x: f"{x:.0f}%"),
+                                 textposition='inside',
+                                 textfont=dict(color='white', size=10, weight='bold'),
+                                 hovertemplate=f"<b>%{{x}}</b><br>{category}: %{{y:.2f}}%<br>Woreda Count: %{{customdata}}<extra></extra>",
+                                 customdata=f_data['Count']))
+    
+    bar_fig.update_layout(
+        barmode="stack",
+        yaxis=dict(
+            title="Percentage (%)",
+            range=[0, 100],
+            tickformat=".0f",
+            title_font=dict(size=14, color='#2c3e50', weight='bold'),
+            tickfont=dict(size=12, color='#2c3e50'),
+            showgrid=False,
+            zeroline=False
+        ),
+        xaxis=dict(
+            title=groupby_col.split('_')[0],
+            tickangle=-45,
+            title_font=dict(size=14, color='#2c3e50', weight='bold'),
+            tickfont=dict(size=11, color='#2c3e50'),
+            showgrid=False
+        ),
+        legend_title_text="Utilization Category",
+        bargap=0.2,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(size=12, color='#2c3e50'),
+            title_font=dict(size=12, color='#2c3e50', weight='bold')
+        ),
+        height=650,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#2c3e50', size=12),
+        title=dict(
+            text=f"Utilization by {groupby_col.split('_')[0]} - {selected_vaccine}",
+            font=dict(size=16, color='#2c3e50', weight='bold'),
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    
+    # Remove gridlines completely
+    bar_fig.update_xaxes(showgrid=False)
+    bar_fig.update_yaxes(showgrid=False)
+    return bar_fig
 # =======================
 # Main Dashboard Logic
 # =======================
@@ -438,11 +525,14 @@ def main():
         st.warning("Please log in on the main page to view this dashboard.")
         return
     
-    if st.session_state.get("matched_df") is None:
+    dataset_key = st.session_state.get("dataset_key")
+    if not dataset_available(dataset_key):
         st.info("Please upload and process data on the Data Upload page to view this dashboard.")
         return
     
-    df_all = st.session_state["matched_df"]
+    df_all = load_frame(dataset_key, "matched_df", DASHBOARD_COLUMNS)
+    location_index = load_location_index(dataset_key)
+    cube = load_summary_cube(dataset_key)
     
     # Check for required columns
     required_cols = ["Region_Admin", "Zone_Admin", "Woreda_Admin", "Period"]
@@ -450,80 +540,56 @@ def main():
         st.error("Essential columns (Region, Zone, Woreda, Period) are missing from the processed data.")
         return
     
-    # Prepare data for calculation
-    vaccines = ["BCG", "IPV", "Measles", "Penta", "Rota"]
-    for vaccine in vaccines:
-        admin_col = f"{vaccine}_Administered"
-        dist_col = f"{vaccine}_Distributed"
-        rate_col = f"{vaccine}_Utilization_Rate"
-        if admin_col in df_all.columns and dist_col in df_all.columns:
-            df_all[rate_col] = df_all[admin_col] / df_all[dist_col].replace(0, 1) * 100
-            df_all[rate_col] = df_all[rate_col].clip(0, 1000)
+    # Utilization rates and categories are precomputed when the data is processed
+    vaccines = VACCINES
     
     # Setup filters
     st.sidebar.header("🧪 Filter Data")
     
     # Region filter
-    regions = sorted(df_all["Region_Admin"].unique())
-    selected_region = st.sidebar.selectbox("Select Region", ["All"] + regions)
+    selected_region = st.sidebar.selectbox("Select Region", ["All"] + location_index.regions)
     
     # Zone filter (chained to Region)
-    filtered_zones = df_all[df_all["Region_Admin"] == selected_region]["Zone_Admin"].unique() if selected_region != "All" else df_all["Zone_Admin"].unique()
-    zones = sorted(filtered_zones)
-    selected_zone = st.sidebar.selectbox("Select Zone", ["All"] + zones)
+    selected_zone = st.sidebar.selectbox("Select Zone", ["All"] + location_index.zones(selected_region))
     
     # Woreda filter (chained to Zone)
-    if selected_zone != "All":
-        filtered_woredas = df_all[(df_all["Region_Admin"] == selected_region) & (df_all["Zone_Admin"] == selected_zone)]["Woreda_Admin"].unique()
-    elif selected_region != "All":
-        filtered_woredas = df_all[df_all["Region_Admin"] == selected_region]["Woreda_Admin"].unique()
-    else:
-        filtered_woredas = df_all["Woreda_Admin"].unique()
-    woredas = sorted(filtered_woredas)
-    selected_woreda = st.sidebar.selectbox("Select Woreda", ["All"] + woredas)
+    selected_woreda = st.sidebar.selectbox("Select Woreda", ["All"] + location_index.woredas(selected_region, selected_zone))
     
     # Period filter
-    periods = sorted(df_all["Period"].unique())
-    selected_period = st.sidebar.selectbox("Select Period", ["All"] + periods)
+    selected_period = st.sidebar.selectbox("Select Period", ["All"] + location_index.periods)
     
     # Vaccine filter
     selected_vaccine = st.sidebar.selectbox("Select Vaccine", ["All"] + vaccines)
     
     # Filtering Logic
-    filtered_df = df_all
-    if selected_region != "All":
-        filtered_df = filtered_df[filtered_df["Region_Admin"] == selected_region]
-    if selected_zone != "All":
-        filtered_df = filtered_df[filtered_df["Zone_Admin"] == selected_zone]
-    if selected_woreda != "All":
-        filtered_df = filtered_df[filtered_df["Woreda_Admin"] == selected_woreda]
-    if selected_period != "All":
-        filtered_df = filtered_df[filtered_df["Period"] == selected_period]
+    filtered_df = location_index.filter(df_all, selected_region, selected_zone, selected_woreda, selected_period)
     
     if filtered_df.empty:
         st.warning("⚠️ No data found for the selected filters.")
         return
     
-    # Summary metrics (outside tabs for overview)
+    # Summary metrics (outside tabs for overview), read from the pre-aggregated cube
+    selection = (selected_region, selected_zone, selected_woreda, selected_period)
+    summary = cube.cell(*selection)
     dist_cols = [f"{v}_Distributed" for v in vaccines]
     admin_cols = [f"{v}_Administered" for v in vaccines]
     if selected_vaccine != "All":
         dist_col = f"{selected_vaccine}_Distributed"
         admin_col = f"{selected_vaccine}_Administered"
-        if dist_col in filtered_df.columns and admin_col in filtered_df.columns:
-            total_distributed = filtered_df[dist_col].sum()
-            total_administered = filtered_df[admin_col].sum()
+        if dist_col in summary.index and admin_col in summary.index:
+            total_distributed = summary[dist_col]
+            total_administered = summary[admin_col]
         else:
             st.warning(f"Data for '{selected_vaccine}' is not available in the processed files.")
             return
     else:
-        existing_dist_cols = [col for col in dist_cols if col in filtered_df.columns]
-        existing_admin_cols = [col for col in admin_cols if col in filtered_df.columns]
-        total_distributed = filtered_df[existing_dist_cols].sum().sum()
-        total_administered = filtered_df[existing_admin_cols].sum().sum()
+        existing_dist_cols = [col for col in dist_cols if col in summary.index]
+        existing_admin_cols = [col for col in admin_cols if col in summary.index]
+        total_distributed = summary[existing_dist_cols].sum()
+        total_administered = summary[existing_admin_cols].sum()
     
     overall_utilization_rate = (total_administered / total_distributed * 100) if total_distributed > 0 else 0
-    total_woredas = filtered_df["Woreda_Admin"].nunique()
+    total_woredas = summary[WOREDA_COUNT]
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -552,8 +618,7 @@ def main():
             st.warning(f"Utilization data for {selected_vaccine} is not available in the processed files.")
             return
         
-        filtered_df[f"{selected_vaccine}_Utilization_Category"] = filtered_df.apply(lambda row: categorize_utilization(row, selected_vaccine), axis=1)
-        category_counts = filtered_df[f"{selected_vaccine}_Utilization_Category"].value_counts()
+        category_counts = cube.category_counts(summary, selected_vaccine)
         
         col_w1, col_w2, col_w3, col_w4 = st.columns(4)
         with col_w1:
@@ -571,41 +636,9 @@ def main():
             st.info("Select a specific vaccine to view the pie chart.")
             return
         
-        # Pie chart data preparation
-        category_counts_pie = category_counts.reset_index()
-        category_counts_pie.columns = ["Category", "Count"]
-        category_counts_pie["Percentage"] = (category_counts_pie["Count"] / category_counts_pie["Count"].sum() * 100).round(2)
-        
-        color_map = {"Acceptable": "#28a745", "Unacceptable": "#007bff", "Low Utilization": "#dc3545"}
-        pie_fig = px.pie(category_counts_pie, values="Percentage", names="Category", hole=0.0, color="Category", color_discrete_map=color_map,
-                         title=f"Utilization Category Distribution for {selected_vaccine}")
-        
-        pie_fig.update_traces(
-            textinfo='percent+label',
-            textfont=dict(color="white", size=12, weight='bold'),
-            textposition='inside',
-            insidetextorientation='horizontal'
-        )
-        pie_fig.update_layout(
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(color='#2c3e50', size=12),
-            height=450,
-            showlegend=True,
-            legend=dict(
-                bgcolor='rgba(255,255,255,0.95)',
-                font=dict(color='#2c3e50', size=11),
-                orientation="h",
-                yanchor="bottom",
-                y=-0.2,
-                xanchor="center",
-                x=0.5
-            ),
-            title=dict(
-                font=dict(size=18, color='#2c3e50', weight='bold'),
-                x=0.5,
-                xanchor='center'
-            )
+        pie_fig = figure_cache().get_or_build(
+            figure_key(dataset_key, selection, selected_vaccine, "pie"),
+            lambda: utilization_pie(category_counts, selected_vaccine)
         )
         
         st.plotly_chart(pie_fig, use_container_width=True)
@@ -623,85 +656,22 @@ def main():
         elif selected_region != "All":
             groupby_col = "Zone_Admin"
         
-        stacked_bar_data = filtered_df.groupby([groupby_col, f"{selected_vaccine}_Utilization_Category"]).size().reset_index(name='Count')
-        total_by_group = stacked_bar_data.groupby(groupby_col)["Count"].sum().reset_index(name='Total')
-        stacked_bar_data = stacked_bar_data.merge(total_by_group, on=groupby_col)
-        stacked_bar_data["Percentage"] = (stacked_bar_data["Count"] / stacked_bar_data["Total"] * 100).round(2)
-        
-        bar_fig = go.Figure()
-        for category in ["Acceptable", "Low Utilization", "Unacceptable"]:
-            f_data = stacked_bar_data[stacked_bar_data[f"{selected_vaccine}_Utilization_Category"] == category]
-            bar_fig.add_trace(go.Bar(x=f_data[groupby_col], y=f_data["Percentage"], name=category, marker_color=color_map.get(category),
-                                     text=f_data["Percentage"].apply(lambda x: f"{x:.0f}%"),
-                                     textposition='inside',
-                                     textfont=dict(color='white', size=10, weight='bold'),
-                                     hovertemplate=f"<b>%{{x}}</b><br>{category}: %{{y:.2f}}%<br>Woreda Count: %{{customdata}}<extra></extra>",
-                                     customdata=f_data['Count']))
-        
-        bar_fig.update_layout(
-            barmode="stack",
-            yaxis=dict(
-                title="Percentage (%)",
-                range=[0, 100],
-                tickformat=".0f",
-                title_font=dict(size=14, color='#2c3e50', weight='bold'),
-                tickfont=dict(size=12, color='#2c3e50'),
-                showgrid=False,
-                zeroline=False
-            ),
-            xaxis=dict(
-                title=groupby_col.split('_')[0],
-                tickangle=-45,
-                title_font=dict(size=14, color='#2c3e50', weight='bold'),
-                tickfont=dict(size=11, color='#2c3e50'),
-                showgrid=False
-            ),
-            legend_title_text="Utilization Category",
-            bargap=0.2,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(size=12, color='#2c3e50'),
-                title_font=dict(size=12, color='#2c3e50', weight='bold')
-            ),
-            height=650,
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(color='#2c3e50', size=12),
-            title=dict(
-                text=f"Utilization by {groupby_col.split('_')[0]} - {selected_vaccine}",
-                font=dict(size=16, color='#2c3e50', weight='bold'),
-                x=0.5,
-                xanchor='center'
-            )
+        bar_fig = figure_cache().get_or_build(
+            figure_key(dataset_key, selection, selected_vaccine, "stacked_bar"),
+            lambda: utilization_stacked_bar(cube, groupby_col, selection, selected_vaccine)
         )
         
-        # Remove gridlines completely
-        bar_fig.update_xaxes(showgrid=False)
-        bar_fig.update_yaxes(showgrid=False)
-        
         st.plotly_chart(bar_fig, use_container_width=True)
         
         with st.expander("📋 Show Woreda-Level Data"):
-            display_df = filtered_df[["Region_Admin", "Zone_Admin", "Woreda_Admin", "Period", f"{selected_vaccine}_Administered", f"{selected_vaccine}_Distributed", f"{selected_vaccine}_Utilization_Rate"]].copy()
-            display_df.rename(columns={
-                "Region_Admin": "Region",
-                "Zone_Admin": "Zone",
-                "Woreda_Admin": "Woreda",
-                f"{selected_vaccine}_Administered": "Administered",
-                f"{selected_vaccine}_Distributed": "Distributed",
-                f"{selected_vaccine}_Utilization_Rate": "Utilization Rate"
-            }, inplace=True)
+            display_df = woreda_table(filtered_df, selected_vaccine)
             st.dataframe(display_df.sort_values(by="Utilization Rate", ascending=False).reset_index(drop=True))
             
-            st.download_button(
-                label="📥 Download Woreda Data as Excel",
-                data=to_excel(display_df),
-                file_name=f"Woreda_Utilization_Data_{selected_vaccine}_{selected_period}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            export_buttons(
+                "📥 Download Woreda Data",
+                lambda: display_df,
+                (dataset_key, *selection, selected_vaccine, "woreda_data"),
+                f"Woreda_Utilization_Data_{selected_vaccine}_{selected_period}"
             )
 
 # Run the main function
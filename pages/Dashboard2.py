@@ -1,10 +1,16 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from config.thresholds import VACCINE_THRESHOLDS
-from pptx import Presentation
-from io import BytesIO
+from config.settings import SCATTER_MAX_POINTS, SCATTER_WEBGL_POINTS
+from utils.cache import dataset_available, load_frame, load_location_index, load_summary_cube
+from utils.charts import decimate_by_group
+from utils.cube import WOREDA_COUNT
+from utils.export import export_buttons
+from utils.extremity import Extremities
+from utils.figure_cache import figure_cache, figure_key
+from utils.report import PPT_MIME, cached_report, create_ppt, report_key
+from utils.threshold_registry import get_thresholds
+from utils.store import DASHBOARD_COLUMNS
 # =======================
 # Page Config & Styling
 # =======================
@@ -308,87 +314,41 @@ st.markdown("""
 # =======================
 # Helper Functions
 # =======================
-def to_excel(df):
-    """Convert DataFrame to Excel file for download"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Sheet1')
-    processed_data = output.getvalue()
-    return processed_data
-def count_extremity(df, vaccine):
-    """Calculates high and low extremity counts based on user-defined thresholds."""
-    rate_col = f"{vaccine}_Utilization_Rate"
-    if rate_col not in df.columns:
-        return None
-  
-    # User-provided thresholds (as decimals)
-    thresholds = {
-        "BCG": {"high": 1.20, "low": 0.30},
-        "IPV": {"high": 1.30, "low": 0.75},
-        "Measles": {"high": 1.25, "low": 0.50},
-        "Penta": {"high": 1.30, "low": 0.80},
-        "Rota": {"high": 1.30, "low": 0.75},
-    }
-  
-    if vaccine not in thresholds:
-        return None
-    high_count = len(df[df[rate_col] / 100 > thresholds[vaccine]["high"]])
-    low_count = len(df[df[rate_col] / 100 < thresholds[vaccine]["low"]])
-  
-    return high_count, low_count
-def setup_filters(df_all):
+def setup_filters(df_all, location_index):
     """Set up sidebar filters and return filtered DataFrame"""
     st.sidebar.header("🧪 Filter Data")
   
     # Region filter
-    regions = sorted(df_all["Region_Admin"].unique())
-    selected_region = st.sidebar.selectbox("Select Region", ["All"] + regions)
+    selected_region = st.sidebar.selectbox("Select Region", ["All"] + location_index.regions)
     st.session_state.selected_region = selected_region
   
     # Zone filter (chained to Region)
-    filtered_zones = df_all[df_all["Region_Admin"] == selected_region]["Zone_Admin"].unique() if selected_region != "All" else df_all["Zone_Admin"].unique()
-    zones = sorted(filtered_zones)
-    selected_zone = st.sidebar.selectbox("Select Zone", ["All"] + zones)
+    selected_zone = st.sidebar.selectbox("Select Zone", ["All"] + location_index.zones(selected_region))
   
     # Woreda filter (chained to Zone)
-    if selected_zone != "All":
-        filtered_woredas = df_all[(df_all["Region_Admin"] == selected_region) & (df_all["Zone_Admin"] == selected_zone)]["Woreda_Admin"].unique()
-    elif selected_region != "All":
-        filtered_woredas = df_all[df_all["Region_Admin"] == selected_region]["Woreda_Admin"].unique()
-    else:
-        filtered_woredas = df_all["Woreda_Admin"].unique()
-    woredas = sorted(filtered_woredas)
-    selected_woreda = st.sidebar.selectbox("Select Woreda", ["All"] + woredas)
+    selected_woreda = st.sidebar.selectbox("Select Woreda", ["All"] + location_index.woredas(selected_region, selected_zone))
     # Period filter
-    periods = sorted(df_all["Period"].unique())
-    selected_period = st.sidebar.selectbox("Select Period", ["All"] + periods)
+    selected_period = st.sidebar.selectbox("Select Period", ["All"] + location_index.periods)
   
     # Vaccine filter
     vaccines = ["BCG", "IPV", "Measles", "Penta", "Rota"]
     selected_vaccine = st.sidebar.selectbox("Select Vaccine", ["All"] + vaccines)
   
     # Filtering Logic
-    filtered_df = df_all
-    if selected_region != "All":
-        filtered_df = filtered_df[filtered_df["Region_Admin"] == selected_region]
-    if selected_zone != "All":
-        filtered_df = filtered_df[filtered_df["Zone_Admin"] == selected_zone]
-    if selected_woreda != "All":
-        filtered_df = filtered_df[filtered_df["Woreda_Admin"] == selected_woreda]
-    if selected_period != "All":
-        filtered_df = filtered_df[filtered_df["Period"] == selected_period]
+    filtered_df = location_index.filter(df_all, selected_region, selected_zone, selected_woreda, selected_period)
       
-    return filtered_df, selected_vaccine, vaccines
-def display_kpis(filtered_df, selected_vaccine, vaccines):
-    """Display Key Performance Indicators"""
-    total_woredas = filtered_df["Woreda_Admin"].nunique()
+    selection = (selected_region, selected_zone, selected_woreda, selected_period)
+    return filtered_df, selected_vaccine, vaccines, selection
+def display_kpis(summary, selected_vaccine, vaccines):
+    """Display Key Performance Indicators from a summary cube cell"""
+    total_woredas = summary[WOREDA_COUNT]
   
     if selected_vaccine != "All":
         dist_col = f"{selected_vaccine}_Distributed"
         admin_col = f"{selected_vaccine}_Administered"
-        if dist_col in filtered_df.columns and admin_col in filtered_df.columns:
-            total_admin = filtered_df[admin_col].sum()
-            total_dist = filtered_df[dist_col].sum()
+        if dist_col in summary.index and admin_col in summary.index:
+            total_admin = summary[admin_col]
+            total_dist = summary[dist_col]
         else:
             st.warning(f"Data for '{selected_vaccine}' is not available in the processed files.")
             return
@@ -396,11 +356,11 @@ def display_kpis(filtered_df, selected_vaccine, vaccines):
         dist_cols = [f"{v}_Distributed" for v in vaccines]
         admin_cols = [f"{v}_Administered" for v in vaccines]
       
-        existing_dist_cols = [col for col in dist_cols if col in filtered_df.columns]
-        existing_admin_cols = [col for col in admin_cols if col in filtered_df.columns]
+        existing_dist_cols = [col for col in dist_cols if col in summary.index]
+        existing_admin_cols = [col for col in admin_cols if col in summary.index]
       
-        total_dist = filtered_df[existing_dist_cols].sum().sum()
-        total_admin = filtered_df[existing_admin_cols].sum().sum()
+        total_dist = summary[existing_dist_cols].sum()
+        total_admin = summary[existing_admin_cols].sum()
   
     utilization_rate = (total_admin / total_dist) * 100 if total_dist > 0 else 0
   
@@ -413,16 +373,17 @@ def display_kpis(filtered_df, selected_vaccine, vaccines):
         st.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Total Doses Administered</div><div class="custom-metric-value">{total_admin:,.0f}</div></div>', unsafe_allow_html=True)
     with col4:
         st.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">Utilization Rate</div><div class="custom-metric-value">{utilization_rate:.2f}%</div></div>', unsafe_allow_html=True)
-def display_extremities(filtered_df, vaccines):
+def display_extremities(extremities, vaccines):
     """Display extremity counts for each vaccine"""
     counts_col1, counts_col2, counts_col3, counts_col4, counts_col5 = st.columns(5)
+    extremity_counts = extremities.counts()
   
     for i, vaccine in enumerate(vaccines):
-        counts = count_extremity(filtered_df, vaccine)
+        counts = extremity_counts.get(vaccine)
         if counts:
             with [counts_col1, counts_col2, counts_col3, counts_col4, counts_col5][i]:
                 st.markdown(f'<div class="custom-metric-box"><div class="custom-metric-label">{vaccine}</div><div class="custom-metric-value">{counts[0]}↑ | {counts[1]}↓</div></div>', unsafe_allow_html=True)
-def display_extreme_utilization_table(filtered_df, selected_vaccine):
+def display_extreme_utilization_table(filtered_df, selected_vaccine, extremities, dataset_key, selection):
     """Display table of extreme utilization by region and zone"""
     if selected_vaccine == "All":
         st.info("Please select a specific vaccine to view this table.")
@@ -434,17 +395,6 @@ def display_extreme_utilization_table(filtered_df, selected_vaccine):
         st.warning(f"Utilization data for {selected_vaccine} is not available in the processed files.")
         return
   
-    # User-provided thresholds (as decimals)
-    thresholds = {
-        "BCG": {"high": 1.20, "low": 0.30},
-        "IPV": {"high": 1.30, "low": 0.75},
-        "Measles": {"high": 1.25, "low": 0.50},
-        "Penta": {"high": 1.30, "low": 0.80},
-        "Rota": {"high": 1.30, "low": 0.75},
-    }
-    # Create a copy of the filtered data
-    extreme_df = filtered_df.copy()
-  
     # Determine grouping columns based on filter selection
     selected_region = st.session_state.get('selected_region', 'All')
     if selected_region == "All":
@@ -452,14 +402,8 @@ def display_extreme_utilization_table(filtered_df, selected_vaccine):
     else:
         group_cols = ["Region_Admin", "Zone_Admin"]
   
-    # Calculate counts for each category
-    extreme_df["High_Extremity"] = extreme_df[rate_col] / 100 > thresholds[selected_vaccine]["high"]
-    extreme_df["Low_Extremity"] = extreme_df[rate_col] / 100 < thresholds[selected_vaccine]["low"]
-    extreme_summary = extreme_df.groupby(group_cols).agg(
-        total_woredas=("Woreda_Admin", "nunique"),
-        high_extremity_count=("High_Extremity", "sum"),
-        low_extremity_count=("Low_Extremity", "sum")
-    ).reset_index()
+    # Counts for each group, from the extremity flags shared with the overview
+    extreme_summary = extremities.by_group(filtered_df, selected_vaccine, group_cols)
   
     # Rename columns for display
     extreme_summary.rename(columns={
@@ -471,53 +415,65 @@ def display_extreme_utilization_table(filtered_df, selected_vaccine):
     }, inplace=True)
     st.dataframe(extreme_summary, use_container_width=True, hide_index=True)
   
-    st.download_button(
-        label="📥 Download Data as Excel",
-        data=to_excel(extreme_summary),
-        file_name=f"Extreme_Utilization_Data_{selected_vaccine}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    export_buttons(
+        "📥 Download Data",
+        lambda: extreme_summary,
+        (dataset_key, *selection, selected_vaccine, "extremes", *group_cols),
+        f"Extreme_Utilization_Data_{selected_vaccine}",
         use_container_width=True
     )
-def display_utilization_chart(filtered_df, selected_vaccine):
-    """Display utilization rate chart by Woreda"""
-    if selected_vaccine == "All":
-        st.info("Please select a specific vaccine to view utilization rate plots.")
-        return
-  
-    # Check if the required column exists
-    rate_col = f"{selected_vaccine}_Utilization_Rate"
-    if rate_col not in filtered_df.columns:
-        st.warning(f"Utilization data for {selected_vaccine} is not available in the processed files.")
-        return
-  
-    # Create a scatter plot of utilization rates
-    fig = px.scatter(
+def utilization_scatter(filtered_df, selected_vaccine, rate_col):
+    """Per-Woreda scatter, drawn with WebGL when there are many points"""
+    return px.scatter(
         filtered_df,
         x="Woreda_Admin",
         y=rate_col,
         title=f"{selected_vaccine} Utilization Rate by Woreda",
         labels={"Woreda_Admin": "Woreda", rate_col: "Utilization Rate (%)"},
-        color_discrete_sequence=["#3498db"]
+        color_discrete_sequence=["#3498db"],
+        render_mode="webgl" if len(filtered_df) > SCATTER_WEBGL_POINTS else "svg"
     )
+def utilization_summary_scatter(filtered_df, selected_vaccine, rate_col, outliers):
+    """Per-Zone min/median/max of the utilization rate plus every outlier Woreda"""
+    summary, outlier_df = decimate_by_group(filtered_df, "Zone_Admin", rate_col, outliers)
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=summary["Zone_Admin"], y=summary["Median"], mode="markers", name="Zone median (min-max)",
+        marker=dict(color="#3498db", size=9),
+        error_y=dict(type="data", symmetric=False, array=summary["Max"] - summary["Median"],
+                     arrayminus=summary["Median"] - summary["Min"], color="#3498db"),
+        customdata=summary[["Min", "Max", "Points"]],
+        hovertemplate="<b>%{x}</b><br>Median: %{y:.1f}%<br>Min: %{customdata[0]:.1f}%<br>Max: %{customdata[1]:.1f}%<br>Woredas: %{customdata[2]}<extra></extra>"
+    ))
+    fig.add_trace(go.Scattergl(
+        x=outlier_df["Zone_Admin"], y=outlier_df[rate_col], mode="markers", name="Outlier Woredas",
+        marker=dict(color="#e74c3c", size=6, opacity=0.7),
+        text=outlier_df["Woreda_Admin"],
+        hovertemplate="<b>%{text}</b><br>Zone: %{x}<br>Utilization Rate: %{y:.1f}%<extra></extra>"
+    ))
+    fig.update_layout(title=f"{selected_vaccine} Utilization Rate by Zone (summary of {len(filtered_df):,} Woreda records)")
+    return fig
+def build_utilization_chart(filtered_df, selected_vaccine, rate_col, extremities, summarized):
+    """Utilization rate figure with threshold lines"""
+    if summarized:
+        fig = utilization_summary_scatter(filtered_df, selected_vaccine, rate_col, extremities.flagged(selected_vaccine))
+        x_title = "Zone"
+    else:
+        fig = utilization_scatter(filtered_df, selected_vaccine, rate_col)
+        x_title = "Woreda"
   
-    # Add threshold lines
-    thresholds = {
-        "BCG": {"high": 120, "low": 30},
-        "IPV": {"high": 130, "low": 75},
-        "Measles": {"high": 125, "low": 50},
-        "Penta": {"high": 130, "low": 80},
-        "Rota": {"high": 130, "low": 75},
-    }
+    # Add threshold lines (registry thresholds are fractions, the axis is in percent)
+    thresholds = get_thresholds()
   
-    if selected_vaccine in thresholds:
-        fig.add_hline(y=thresholds[selected_vaccine]["high"], line_dash="dash", line_color="red",
+    if thresholds.has("extremity", selected_vaccine):
+        fig.add_hline(y=thresholds.get("extremity", selected_vaccine, "high") * 100, line_dash="dash", line_color="red",
                      annotation_text="High Threshold", annotation_position="bottom right", annotation_font_color="black")
-        fig.add_hline(y=thresholds[selected_vaccine]["low"], line_dash="dash", line_color="orange",
+        fig.add_hline(y=thresholds.get("extremity", selected_vaccine, "low") * 100, line_dash="dash", line_color="orange",
                      annotation_text="Low Threshold", annotation_position="top right", annotation_font_color="black")
   
     # Improve visibility of labels and legends
     fig.update_layout(
-        xaxis_title="Woreda",
+        xaxis_title=x_title,
         yaxis_title="Utilization Rate (%)",
         xaxis_tickangle=45,
         plot_bgcolor='white',
@@ -546,73 +502,30 @@ def display_utilization_chart(filtered_df, selected_vaccine):
     # Improve x-axis label visibility
     fig.update_xaxes(tickfont=dict(size=9, color='black'), showgrid=True, gridcolor='rgba(0,0,0,0.1)')
     fig.update_yaxes(tickfont=dict(color='black'), showgrid=True, gridcolor='rgba(0,0,0,0.1)')
+    return fig
+def display_utilization_chart(filtered_df, selected_vaccine, extremities, dataset_key, selection):
+    """Display utilization rate chart by Woreda, summarized by Zone for large selections"""
+    if selected_vaccine == "All":
+        st.info("Please select a specific vaccine to view utilization rate plots.")
+        return
   
-    st.plotly_chart(fig, use_container_width=True)
-def create_ppt(filtered_df, selected_vaccine):
-    """Create PowerPoint report"""
-    prs = Presentation()
-  
-    # Slide 1: Title Slide
-    title_slide_layout = prs.slide_layouts[0]
-    slide = prs.slides.add_slide(title_slide_layout)
-    title = slide.shapes.title
-    title.text = "Immunization Triangulation Report"
-  
-    body = slide.placeholders[1]
-    body.text = f"Report generated for {selected_vaccine}."
-    # Slide 2: Recommendations for High Utilization
-    rec_high_layout = prs.slide_layouts[1]
-    rec_high_slide = prs.slides.add_slide(rec_high_layout)
-    rec_high_slide.shapes.title.text = "Recommendations for High Utilization"
-  
-    rec_high_text = rec_high_slide.placeholders[1].text_frame
-  
-    p_high_bullet1 = rec_high_text.add_paragraph()
-    p_high_bullet1.text = "Conduct a targeted audit of administered dose records for potential data entry errors."
-    p_high_bullet1.level = 0
-    p_high_bullet2 = rec_high_text.add_paragraph()
-    p_high_bullet2.text = "Investigate potential lags in reporting of distributed doses."
-    p_high_bullet2.level = 0
-  
-    p_high_bullet3 = rec_high_text.add_paragraph()
-    p_high_bullet3.text = "Recommend a physical stock count at facilities to reconcile administered and distributed doses."
-    p_high_bullet3.level = 0
-    # Slide 3: Recommendations for Low Utilization
-    rec_low_layout = prs.slide_layouts[1]
-    rec_low_slide = prs.slides.add_slide(rec_low_layout)
-    rec_low_slide.shapes.title.text = "Recommendations for Low Utilization"
-  
-    rec_low_text = rec_low_slide.placeholders[1].text_frame
-    p_low_bullet1 = rec_low_text.add_paragraph()
-    p_low_bullet1.text = "Assess inventory levels to prevent vaccine expiration due to overstocking."
-    p_low_bullet1.level = 0
-    p_low_bullet2 = rec_low_text.add_paragraph()
-    p_low_bullet2.text = "Investigate if there are service delivery issues affecting vaccine demand."
-    p_low_bullet2.level = 0
-    p_low_bullet3 = rec_low_text.add_paragraph()
-    p_low_bullet3.text = "Verify that administered doses are being reported accurately and on time."
-    p_low_bullet3.level = 0
-    # Slide 4: Recommendations for High Discrepancies
-    rec_disc_layout = prs.slide_layouts[1]
-    rec_disc_slide = prs.slides.add_slide(rec_disc_layout)
-    rec_disc_slide.shapes.title.text = "Recommendations for High Discrepancies"
-  
-    rec_disc_text = rec_disc_slide.placeholders[1].text_frame
+    # Check if the required column exists
+    rate_col = f"{selected_vaccine}_Utilization_Rate"
+    if rate_col not in filtered_df.columns:
+        st.warning(f"Utilization data for {selected_vaccine} is not available in the processed files.")
+        return
   
-    p_disc_bullet1 = rec_disc_text.add_paragraph()
-    p_disc_bullet1.text = "Provide training on accurate reporting for both administered and distributed doses."
-    p_disc_bullet1.level = 0
-    p_disc_bullet2 = rec_disc_text.add_paragraph()
-    p_disc_bullet2.text = "Implement a process to regularly cross-reference data to catch discrepancies early."
-    p_disc_bullet2.level = 0
-    p_disc_bullet3 = rec_disc_text.add_paragraph()
-    p_disc_bullet3.text = "Establish a feedback loop where Woredas are alerted to discrepancies."
-    p_disc_bullet3.level = 0
+    # Plot every Woreda unless that would send too many points to the browser
+    zone_selected = selection[1] != "All"
+    summarized = len(filtered_df) > SCATTER_MAX_POINTS and not zone_selected and selected_vaccine in extremities.vaccines
+    if summarized:
+        st.caption(f"{len(filtered_df):,} Woreda records are summarized per Zone; outliers beyond the thresholds are shown individually. Select a Zone to see every Woreda.")
+    fig = figure_cache().get_or_build(
+        figure_key(dataset_key, selection, selected_vaccine, "summary_scatter" if summarized else "scatter"),
+        lambda: build_utilization_chart(filtered_df, selected_vaccine, rate_col, extremities, summarized)
+    )
   
-    ppt_file = BytesIO()
-    prs.save(ppt_file)
-    ppt_file.seek(0)
-    return ppt_file
+    st.plotly_chart(fig, use_container_width=True)
 # =======================
 # Main Dashboard Logic
 # =======================
@@ -622,11 +535,12 @@ def main():
     if not st.session_state.get("authenticated", False):
         st.warning("Please log in on the main page to view this dashboard.")
         return
-    if st.session_state.get("matched_df") is None:
+    dataset_key = st.session_state.get("dataset_key")
+    if not dataset_available(dataset_key):
         st.info("Please upload and process data on the Data Upload page to view this dashboard.")
         return
       
-    df_all = st.session_state["matched_df"]
+    df_all = load_frame(dataset_key, "matched_df", DASHBOARD_COLUMNS)
   
     # Check for required columns
     required_cols = ["Region_Admin", "Zone_Admin", "Woreda_Admin", "Period"]
@@ -634,51 +548,47 @@ def main():
         st.error("Essential columns (Region, Zone, Woreda, Period) are missing from the processed data.")
         return
   
-    # Prepare data for calculation
-    vaccines = ["BCG", "IPV", "Measles", "Penta", "Rota"]
-    for vaccine in vaccines:
-        admin_col = f"{vaccine}_Administered"
-        dist_col = f"{vaccine}_Distributed"
-        rate_col = f"{vaccine}_Utilization_Rate"
-        if admin_col in df_all.columns and dist_col in df_all.columns:
-            df_all[rate_col] = df_all[admin_col] / df_all[dist_col].replace(0, 1) * 100
-            df_all[rate_col] = df_all[rate_col].clip(0, 1000)
+    # Utilization rates are precomputed when the data is processed
     # Setup filters
-    filtered_df, selected_vaccine, vaccines = setup_filters(df_all)
+    filtered_df, selected_vaccine, vaccines, selection = setup_filters(df_all, load_location_index(dataset_key))
     if filtered_df.empty:
         st.warning("⚠️ No data found for the selected filters.")
         return
+    extremities = Extremities(filtered_df, vaccines)
     # Create tabs for different sections
     tab1, tab2, tab3, tab4 = st.tabs(["Performance", "Extremes", "Charts", "Download Report as PPT"])
   
     # --- Performance Tab ---
     with tab1:
         st.markdown("<div class='section-header'>Performance Metrics</div>", unsafe_allow_html=True)
-        display_kpis(filtered_df, selected_vaccine, vaccines)
+        display_kpis(load_summary_cube(dataset_key).cell(*selection), selected_vaccine, vaccines)
   
     # --- Extremes Tab ---
     with tab2:
         st.markdown("<div class='section-header'>Utilization Extremes</div>", unsafe_allow_html=True)
-        display_extremities(filtered_df, vaccines)
+        display_extremities(extremities, vaccines)
         st.markdown("<div class='section-header'>Extreme Utilization by Region and Zone</div>", unsafe_allow_html=True)
-        display_extreme_utilization_table(filtered_df, selected_vaccine)
+        display_extreme_utilization_table(filtered_df, selected_vaccine, extremities, dataset_key, selection)
   
     # --- Charts Tab ---
     with tab3:
         st.markdown("<div class='section-header'>Usage Charts</div>", unsafe_allow_html=True)
-        display_utilization_chart(filtered_df, selected_vaccine)
+        display_utilization_chart(filtered_df, selected_vaccine, extremities, dataset_key, selection)
   
     # --- Download Report as PPT Tab ---
     with tab4:
         st.markdown("<div class='section-header'>Download Report</div>", unsafe_allow_html=True)
       
-        # PPT Download Button
-        ppt_buffer = create_ppt(filtered_df, selected_vaccine)
+        # PPT Download Button; the deck is built on click and cached per filter state
+        cube = load_summary_cube(dataset_key)
         st.download_button(
             label="📊 Download Report as PPT",
-            data=ppt_buffer,
+            data=lambda: cached_report(
+                report_key(dataset_key, selected_vaccine, selection),
+                lambda: create_ppt(cube, filtered_df, extremities, selected_vaccine, selection)
+            ),
             file_name="immunization_report.pptx",
-            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            mime=PPT_MIME,
             use_container_width=True
         )
 # Run the main function
@@ -0,0 +1,26 @@
+"""
+Alias learning of ``utils.aliases``. Run from the repository root:
+
+    python -m pytest tests
+"""
+import pandas as pd
+
+from utils.aliases import WoredaAliases, block_scoped, shared_keys
+
+
+def test_names_in_several_zones_are_not_learned():
+    admin_df = pd.DataFrame({
+        "Zone": ["A", "B", "A", "A"],
+        "Woreda": ["Abala HC", "Abala HC", "Dubti HC", "Dubti HC"],
+    })
+    dist_df = pd.DataFrame({"Zone": ["A", "B"], "Woreda": ["Abala Health Center", "Dubti Health Center"]})
+    shared_admin = shared_keys(admin_df["Woreda"], [admin_df["Zone"]])
+    shared_dist = shared_keys(dist_df["Woreda"], [dist_df["Zone"]])
+    assert shared_admin == {"abalahc"}
+    assert shared_dist == set()
+
+    pairs = [("Abala HC", "Abala Health Center"), ("Dubti HC", "Dubti Health Center")]
+    aliases = WoredaAliases()
+    assert aliases.learn(block_scoped(pairs, shared_admin, shared_dist)) == 1
+    assert aliases.facility("admin", "dubtihc") == "dubtihealthcenter"
+    assert aliases.facility("admin", "abalahc") == "abalahc"
@@ -0,0 +1,76 @@
+"""
+Appending Periods with ``utils.processing.AppendPipeline`` must give the
+dataset a full run over the whole history gives. Run from the repository
+root:
+
+    python -m pytest tests
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import DATA_DIR
+from utils.cache import ProcessedDataCache
+from utils.cube import SummaryCube
+from utils.processing import DATASET_FRAMES, AppendPipeline, ProcessingPipeline
+from utils.store import DASHBOARD_COLUMNS
+
+
+def _sorted(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame[sorted(frame.columns)]
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def uploads():
+    """
+    The sample files, with some 2016 Woredas also reported for 2017 but
+    distributed to in 2017 only, so that appending 2017 matches keys the
+    earlier Periods left unmatched.
+    """
+    admin_df = pd.read_csv(DATA_DIR / "Administred.csv")
+    dist_df = pd.read_csv(DATA_DIR / "Distributed.csv")
+    late = admin_df.loc[admin_df["Period"] == 2016, "Woreda"].drop_duplicates().iloc[:20]
+    admin_df = pd.concat([admin_df, admin_df[admin_df["Woreda"].isin(late)].assign(Period=2017)])
+    moved = dist_df["Woreda"].isin(late) & (dist_df["Period"] == 2016)
+    dist_df = pd.concat([dist_df[~moved], dist_df[moved].assign(Period=2017)])
+    return admin_df, dist_df
+
+
+def _write_periods(tmp_path, uploads, tag, periods=None):
+    paths = []
+    for name, df in zip(("Administred", "Distributed"), uploads):
+        path = tmp_path / f"{name}_{tag}.csv"
+        df[df["Period"].isin(periods) if periods else slice(None)].to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture(scope="module")
+def full_run(tmp_path_factory, uploads):
+    tmp_path = tmp_path_factory.mktemp("full")
+    cache = ProcessedDataCache(tmp_path / "cache", max_entries=100)
+    cache.put("full", ProcessingPipeline().run(*_write_periods(tmp_path, uploads, "full")).frames())
+    return cache
+
+
+@pytest.mark.parametrize("base_periods, new_periods", [
+    ([2015, 2016], [2017]),
+    ([2015, 2017], [2016]),
+    ([2015, 2016, 2017], [2016, 2017]),
+])
+def test_append_equals_full_run(tmp_path, uploads, full_run, base_periods, new_periods):
+    cache = full_run
+    base_key, appended_key = f"base_{tmp_path.name}", f"appended_{tmp_path.name}"
+    cache.put(base_key, ProcessingPipeline().run(*_write_periods(tmp_path, uploads, "base", base_periods)).frames())
+    appended = AppendPipeline(base_key, cache).run(*_write_periods(tmp_path, uploads, "new", new_periods))
+    cache.put(appended_key, appended.frames())
+
+    for name in DATASET_FRAMES:
+        pd.testing.assert_frame_equal(_sorted(cache.read(appended_key, name)), _sorted(cache.read("full", name)))
+
+    columns = list(DASHBOARD_COLUMNS)
+    appended_cube = SummaryCube(cache.read(appended_key, "matched_df", columns))
+    full_cube = SummaryCube(cache.read("full", "matched_df", columns))
+    assert appended_cube.cuboids.keys() == full_cube.cuboids.keys()
+    for grouped, cuboid in full_cube.cuboids.items():
+        pd.testing.assert_frame_equal(appended_cube.cuboids[grouped].sort_index(), cuboid.sort_index())
@@ -0,0 +1,42 @@
+"""
+One-to-one assignment of ``utils.assignment`` and the ``"optimal"`` mode of
+``utils.matching.match_woredas``. Run from the repository root:
+
+    python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+
+from utils.assignment import assign
+from utils.matching import match_woredas
+
+# "Dubti Health Centr" scores 97 against "Dubti Health Center" and 94 against
+# "Dubti Hlth Centr"; the exact "Dubti Health Center" scores 100 and 91.
+ADMIN_NAMES = ["Dubti Health Centr", "Dubti Health Center"]
+DIST_NAMES = ["Dubti Health Center", "Dubti Hlth Centr"]
+OPTIMAL = {"Dubti Health Centr": "Dubti Hlth Centr", "Dubti Health Center": "Dubti Health Center"}
+
+
+def test_assign_takes_highest_total_in_any_order():
+    # Taking the best pair first (100) would leave row 1 without a partner.
+    rows, cols, scores = np.array([0, 0, 1]), np.array([0, 1, 0]), np.array([100, 99, 98])
+    for order in ([0, 1, 2], [2, 0, 1], [1, 2, 0]):
+        assert assign(rows[order], cols[order], scores[order], 2, 2) == [(0, 1), (1, 0)]
+    # Components too large for the Hungarian algorithm fall back to greedy.
+    assert assign(rows, cols, scores, 2, 2, max_cells=1) == [(0, 0)]
+
+
+def test_optimal_keeps_strong_match_an_early_weak_one_would_take():
+    admin_df, dist_df = pd.DataFrame({"Woreda": ADMIN_NAMES}), pd.DataFrame({"Woreda": DIST_NAMES})
+
+    greedy, unmatched_admin, _ = match_woredas(admin_df, dist_df, threshold=92, exact_first=False)
+    assert greedy == {"Dubti Health Centr": "Dubti Health Center"}
+    assert unmatched_admin == ["Dubti Health Center"]
+
+    for admin_order in (admin_df, admin_df.iloc[::-1]):
+        for dist_order in (dist_df, dist_df.iloc[::-1]):
+            match_map, unmatched_admin, unmatched_dist = match_woredas(
+                admin_order, dist_order, threshold=92, exact_first=False, assignment="optimal",
+            )
+            assert match_map == OPTIMAL
+            assert unmatched_admin == unmatched_dist == []
@@ -0,0 +1,62 @@
+"""
+Blocked Woreda matching of ``utils.matching``. Run from the repository root:
+
+    python -m pytest tests
+"""
+import pandas as pd
+import pytest
+
+from utils.matching import ASSIGNMENT_MODES, MATCH_STATS_COLUMNS, UNMATCHED_ID, match_hierarchy, match_woredas
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["Region", "Zone", "Woreda"]).assign(Period=2015)
+
+
+# An Abala Health Center in both admin Zones but only in the first dist Zone,
+# and a second Zone spelled differently in the two uploads.
+HIERARCHY_ADMIN = _frame([
+    ("Afar", "Zone 1", "Abala Health Center"),
+    ("Afar", "Zone 1", "Dubti HC"),
+    ("Afar", "Zone 2", "Abala Health Center"),
+    ("Afar", "Zone 2", "Asayita"),
+])
+HIERARCHY_DIST = _frame([
+    ("Afar", "Zone 1", "Abala Health Centre"),
+    ("Afar", "Zone 1", "Dubti HC"),
+    ("Afar", "Zone 02", "Asayta"),
+])
+
+
+@pytest.mark.parametrize("assignment", ASSIGNMENT_MODES)
+def test_repeated_admin_name_leaves_later_block_match_unmatched(assignment):
+    admin_df = _frame([("R", "A", "Abala Health Centr"), ("R", "B", "Abala Health Centr")])
+    dist_df = _frame([("R", "A", "Abala Health Center"), ("R", "B", "Abala Health Centre")])
+
+    match_map, unmatched_admin, unmatched_dist = match_woredas(admin_df, dist_df, assignment=assignment)
+
+    assert match_map == {"Abala Health Centr": "Abala Health Center"}
+    assert unmatched_admin == []
+    assert unmatched_dist == ["Abala Health Centre"]
+
+
+@pytest.mark.parametrize("assignment", ASSIGNMENT_MODES)
+def test_hierarchy_never_pairs_woredas_across_zones(assignment):
+    match = match_hierarchy(HIERARCHY_ADMIN, HIERARCHY_DIST, assignment=assignment)
+
+    zone_pairs = set(zip(match.pairs["Admin Zone"], match.pairs["Dist Zone"]))
+    assert zone_pairs == {("Zone 1", "Zone 1"), ("Zone 2", "Zone 02")}
+    assert set(zip(match.pairs["Admin Woreda"], match.pairs["Dist Woreda"])) == {
+        ("Abala Health Center", "Abala Health Centre"), ("Dubti HC", "Dubti HC"), ("Asayita", "Asayta"),
+    }
+    # The second Zone's Abala Health Center has no counterpart in its Zone.
+    assert match.admin_ids.tolist()[2] == UNMATCHED_ID
+    assert (match.dist_ids != UNMATCHED_ID).all()
+
+    columns = [col for col in MATCH_STATS_COLUMNS if col != "Candidate Pairs"]
+    expected = pd.DataFrame([
+        ["Region", 1, 1, 1, 1, 0, 0, 0, 0],
+        ["Zone", 2, 2, 1, 1, 1, 0, 0, 1],
+        ["Woreda", 4, 3, 2, 1, 2, 1, 0, 6],
+    ], columns=columns)
+    pd.testing.assert_frame_equal(match.stats[columns], expected, check_dtype=False)
@@ -0,0 +1,42 @@
+"""
+The scorer backends of ``utils.scorers`` must give the reference
+(``fuzzywuzzy``) scores and matches. Run from the repository root:
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_datasets
+from utils.matching import ASSIGNMENT_MODES, match_woredas
+from utils.scorers import SCORERS, get_scorer
+
+REFERENCE = "fuzzywuzzy"
+# Pairs whose ratio is exactly half-way between two integers, plus empty and
+# non-ASCII names, where the backends could round or count differently.
+EDGE_NAMES = ["abcdefgh", "aijklmno", "", "Ab", "ab", "Ādīs Kētema", "Adis Ketema", "Abc Health Center", "Abc HC"]
+
+
+@pytest.fixture(scope="module")
+def datasets():
+    return make_datasets(1500, periods=(2015, 2016), noise=0.5)
+
+
+@pytest.mark.parametrize("name", [name for name in SCORERS if name != REFERENCE])
+def test_scores_match_reference(datasets, name):
+    admin_df, dist_df = datasets
+    admin_names = list(admin_df["Woreda"].unique()[:300]) + EDGE_NAMES
+    dist_names = list(dist_df["Woreda"].unique()[:300]) + EDGE_NAMES
+    expected = get_scorer(REFERENCE).scores(admin_names, dist_names)
+    assert np.array_equal(get_scorer(name).scores(admin_names, dist_names), expected)
+
+
+@pytest.mark.parametrize("name", [name for name in SCORERS if name != REFERENCE])
+@pytest.mark.parametrize("assignment", ASSIGNMENT_MODES)
+@pytest.mark.parametrize("exact_first", [True, False])
+def test_matches_match_reference(datasets, name, assignment, exact_first):
+    admin_df, dist_df = datasets
+    expected = match_woredas(admin_df, dist_df, exact_first=exact_first, assignment=assignment, scorer=REFERENCE)
+    result = match_woredas(admin_df, dist_df, exact_first=exact_first, assignment=assignment, scorer=name)
+    assert expected[0], "the synthetic data should produce matches"
+    assert result == expected
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from config.settings import WOREDA_ALIAS_OVERRIDES, WOREDA_ALIASES_FILE
+from utils.normalization import normalize_woreda_name, normalize_woreda_names
+
+SOURCES = ("admin", "dist")
+ALIAS_COLUMNS = ["source", "name_key", "facility_id"]
+OVERRIDE_COLUMNS = ["admin_woreda", "dist_woreda"]
+
+
+class AliasConfigError(ValueError):
+    """Raised when the Woreda alias table or override file is malformed."""
+
+
+def _read_table(path: Path) -> pd.DataFrame:
+    table = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [col for col in ALIAS_COLUMNS if col not in table.columns]
+    if missing:
+        raise AliasConfigError(f"{path} is missing columns: {', '.join(missing)}")
+    unknown = set(table["source"]) - set(SOURCES)
+    if unknown:
+        raise AliasConfigError(f"{path}: unknown source(s) {', '.join(sorted(unknown))}")
+    return table
+
+
+def _read_overrides(path: Path) -> pd.DataFrame:
+    overrides = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [col for col in OVERRIDE_COLUMNS if col not in overrides.columns]
+    if missing:
+        raise AliasConfigError(f"{path} is missing columns: {', '.join(missing)}")
+    return overrides
+
+
+def shared_keys(names: pd.Series, blocks: Sequence[pd.Series]) -> Set[str]:
+    """
+    Match keys of ``names`` that occur in more than one block (e.g. Region
+    and Zone). A match confirmed in one block says nothing about the
+    same-named facilities of the others, so it must not become an alias.
+    """
+    frame = pd.DataFrame({f"block_{i}": block.to_numpy() for i, block in enumerate(blocks)})
+    frame["key"] = normalize_woreda_names(names).to_numpy()
+    blocks_per_key = frame.drop_duplicates().groupby("key").size()
+    return set(blocks_per_key.index[blocks_per_key > 1])
+
+
+def block_scoped(
+    pairs: Iterable[Tuple[Hashable, Hashable]], shared_admin: Set[str], shared_dist: Set[str]
+) -> List[Tuple[Hashable, Hashable]]:
+    """The ``(admin name, dist name)`` pairs whose names are in one block only, see ``shared_keys``."""
+    return [
+        (admin_name, dist_name) for admin_name, dist_name in pairs
+        if normalize_woreda_name(admin_name) not in shared_admin
+        and normalize_woreda_name(dist_name) not in shared_dist
+    ]
+
+
+class WoredaAliases:
+    """
+    Persistent Woreda alias table: admin name -> canonical facility id <- dist
+    name, both sides keyed on the normalized match key.
+
+    The facility id of a pair is the distributed match key of its first
+    confirmed match. Only aliases that differ from the name's own match key
+    are stored, so names that already match exactly cost nothing. Pairs in
+    the manual override file (columns ``admin_woreda``, ``dist_woreda``)
+    take precedence over learned ones and are never relearned.
+    """
+
+    def __init__(
+        self,
+        table: Optional[pd.DataFrame] = None,
+        overrides: Optional[pd.DataFrame] = None,
+        path: Optional[Path] = None,
+    ):
+        self.path = path
+        # (admin key, dist key, admin key already on that facility) of the
+        # matches ``learn`` refused because they would alias two names of
+        # one source to one facility.
+        self.conflicts: List[Tuple[str, str, str]] = []
+        self._learned: Dict[str, Dict[str, str]] = {source: {} for source in SOURCES}
+        self._pinned: Dict[str, Dict[str, str]] = {source: {} for source in SOURCES}
+        if table is not None:
+            for source, key, facility in table[ALIAS_COLUMNS].itertuples(index=False):
+                self._learned[source][key] = facility
+        if overrides is not None:
+            for admin_name, dist_name in overrides[OVERRIDE_COLUMNS].itertuples(index=False):
+                self._link(self._pinned, normalize_woreda_name(admin_name), normalize_woreda_name(dist_name))
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    @staticmethod
+    def _link(ids: Dict[str, Dict[str, str]], admin_key: str, dist_key: str) -> None:
+        """
+        Put both keys on one facility: the admin key joins the dist key's
+        facility, or, if it already has one, the dist key joins the admin's.
+        """
+        if admin_key in ids["admin"]:
+            ids["dist"].setdefault(dist_key, ids["admin"][admin_key])
+        else:
+            ids["admin"][admin_key] = ids["dist"].get(dist_key, dist_key)
+
+    def _rebuild(self) -> None:
+        self._ids = {}
+        for source in SOURCES:
+            merged = {**self._learned[source], **self._pinned[source]}
+            self._ids[source] = {key: facility for key, facility in merged.items() if key != facility}
+        self._admin_of = {facility: key for key, facility in self._ids["admin"].items()}
+
+    @classmethod
+    def load(
+        cls,
+        path: Optional[Path] = WOREDA_ALIASES_FILE,
+        overrides_path: Optional[Path] = WOREDA_ALIAS_OVERRIDES,
+    ) -> "WoredaAliases":
+        """The learned table at ``path`` (if it exists) plus the override file, if given."""
+        path = Path(path) if path else None
+        table = _read_table(path) if path and path.is_file() else None
+        overrides = _read_overrides(Path(overrides_path)) if overrides_path else None
+        return cls(table, overrides, path)
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ids.values())
+
+    def facility(self, source: str, key: str) -> str:
+        """Facility id of one match key (the key itself when it has no alias)."""
+        return self._ids[source].get(key, key)
+
+    def resolve(self, source: str, keys: pd.Series) -> pd.Series:
+        """
+        Facility ids of a column of match keys, looked up once per distinct
+        key; keys without an alias are returned unchanged.
+        """
+        ids = self._ids[source]
+        if not ids:
+            return keys
+        codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+        resolved = pd.Series([ids.get(key, key) for key in uniques], dtype=object).to_numpy()
+        return pd.Series(resolved.take(codes), index=keys.index, name=keys.name, dtype=object)
+
+    def learn(self, pairs: Iterable[Tuple[Hashable, Hashable]]) -> int:
+        """
+        Record confirmed ``(admin name, dist name)`` matches that do not
+        already resolve to the same facility, as an alias of the admin name
+        to the dist name's facility. Overridden and already aliased names
+        are left alone. A match that would alias an admin name to a facility
+        another admin name is already aliased to, or re-alias an admin name,
+        would make the table many-to-one; it is refused and recorded in
+        ``conflicts``. Returns the number of new aliases.
+        """
+        added = 0
+        with self._lock:
+            for admin_name, dist_name in pairs:
+                admin_key = normalize_woreda_name(admin_name)
+                dist_key = normalize_woreda_name(dist_name)
+                facility = self.facility("dist", dist_key)
+                if self.facility("admin", admin_key) == facility:
+                    continue
+                if admin_key in self._pinned["admin"] or dist_key in self._pinned["dist"]:
+                    continue
+                if admin_key in self._ids["admin"] or facility in self._admin_of:
+                    existing = admin_key if admin_key in self._ids["admin"] else self._admin_of[facility]
+                    self.conflicts.append((admin_key, dist_key, existing))
+                    continue
+                self._learned["admin"][admin_key] = facility
+                self._rebuild()
+                added += 1
+        return added
+
+    def to_frame(self) -> pd.DataFrame:
+        """The learned aliases in the persisted layout."""
+        return pd.DataFrame(
+            [(source, key, facility) for source in SOURCES for key, facility in sorted(self._learned[source].items())],
+            columns=ALIAS_COLUMNS,
+        )
+
+    def save(self, path: Optional[Path] = None) -> None:
+        """
+        Write the learned table atomically (overrides stay in their own
+        file), through a staging file of this call only.
+        """
+        path = Path(path or self.path or WOREDA_ALIASES_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, staging = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        with self._lock:
+            try:
+                with os.fdopen(handle, "w", newline="") as file:
+                    self.to_frame().to_csv(file, index=False)
+                os.replace(staging, path)
+            except BaseException:
+                os.remove(staging)
+                raise
+
+    def fingerprint(self) -> str:
+        """Hash of the effective aliases, for keying processed-data caches."""
+        data = json.dumps(self._ids, sort_keys=True).encode()
+        return hashlib.sha256(data).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def get_aliases() -> WoredaAliases:
+    """The process-wide alias table, loaded on first use."""
+    return WoredaAliases.load()
@@ -0,0 +1,75 @@
+from typing import List, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from config.settings import MATCH_HUNGARIAN_MAX_CELLS
+
+
+def _greedy_by_score(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray) -> List[Tuple[int, int]]:
+    """Take pairs from the highest score down, ties by (row, col), skipping taken ends."""
+    taken_rows, taken_cols = set(), set()
+    pairs = []
+    for k in np.lexsort((cols, rows, -scores)):
+        row, col = int(rows[k]), int(cols[k])
+        if row not in taken_rows and col not in taken_cols:
+            taken_rows.add(row)
+            taken_cols.add(col)
+            pairs.append((row, col))
+    return pairs
+
+
+def _hungarian(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray) -> List[Tuple[int, int]]:
+    """Maximum-score assignment of one component, restricted to its scored pairs."""
+    row_ids, row_pos = np.unique(rows, return_inverse=True)
+    col_ids, col_pos = np.unique(cols, return_inverse=True)
+    weights = np.zeros((len(row_ids), len(col_ids)))
+    scored = np.zeros(weights.shape, dtype=bool)
+    weights[row_pos, col_pos] = scores
+    scored[row_pos, col_pos] = True
+    assigned_rows, assigned_cols = linear_sum_assignment(weights, maximize=True)
+    keep = scored[assigned_rows, assigned_cols]
+    return list(zip(row_ids[assigned_rows[keep]].tolist(), col_ids[assigned_cols[keep]].tolist()))
+
+
+def assign(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    scores: np.ndarray,
+    n_rows: int,
+    n_cols: int,
+    max_cells: int = MATCH_HUNGARIAN_MAX_CELLS,
+) -> List[Tuple[int, int]]:
+    """
+    One-to-one assignment on a sparse score matrix given as ``(rows, cols,
+    scores)`` triplets; pairs that are not listed cannot be assigned.
+
+    The bipartite graph of scored pairs is split into connected components.
+    Components whose dense matrix has at most ``max_cells`` cells are solved
+    exactly for the maximum total score (Hungarian algorithm); larger ones
+    fall back to greedy-by-score. Both are deterministic for a given input.
+    Returns ``(row, col)`` pairs sorted by row.
+    """
+    rows, cols, scores = np.asarray(rows), np.asarray(cols), np.asarray(scores, dtype=float)
+    if not len(rows):
+        return []
+    # Rows and columns become the nodes 0..n_rows-1 and n_rows..n_rows+n_cols-1.
+    size = n_rows + n_cols
+    graph = coo_matrix((np.ones(len(rows)), (rows, cols + n_rows)), shape=(size, size))
+    _, labels = connected_components(graph, directed=False)
+    component = labels[rows]
+
+    pairs = []
+    order = np.argsort(component, kind="stable")
+    bounds = np.flatnonzero(np.diff(component[order])) + 1
+    for members in np.split(order, bounds):
+        r, c, s = rows[members], cols[members], scores[members]
+        if len(members) == 1:
+            pairs.append((int(r[0]), int(c[0])))
+        elif len(np.unique(r)) * len(np.unique(c)) <= max_cells:
+            pairs.extend(_hungarian(r, c, s))
+        else:
+            pairs.extend(_greedy_by_score(r, c, s))
+    return sorted(pairs)
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import CACHE_DIR, PROCESSED_CACHE_MAX_BYTES, PROCESSED_CACHE_MAX_ENTRIES
+from utils.cube import SummaryCube
+from utils.hierarchy import LOCATION_COLUMNS, LocationIndex
+from utils.store import DASHBOARD_COLUMNS, frame_rows, read_frame, write_frame
+
+_READ_BLOCK = 1024 * 1024
+
+
+def _update_digest(digest, source) -> None:
+    if hasattr(source, "getbuffer"):
+        with source.getbuffer() as data:
+            digest.update(str(len(data)).encode())
+            digest.update(data)
+    elif hasattr(source, "read"):
+        position = source.tell()
+        digest.update(str(source.seek(0, os.SEEK_END) - position).encode())
+        source.seek(position)
+        for block in iter(lambda: source.read(_READ_BLOCK), b""):
+            digest.update(block)
+        source.seek(position)
+    else:
+        digest.update(str(os.path.getsize(source)).encode())
+        with open(source, "rb") as handle:
+            for block in iter(lambda: handle.read(_READ_BLOCK), b""):
+                digest.update(block)
+
+
+def content_hash(*sources, settings: Optional[dict] = None) -> str:
+    """
+    SHA-256 over the bytes of every source (uploaded file, file object or
+    path) and the settings that affect processing.
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        _update_digest(digest, source)
+        digest.update(b"\0")
+    digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ProcessedDataCache:
+    """
+    On-disk cache of processed datasets, one directory per content hash and
+    one Parquet file per frame (see ``utils.store``).
+
+    Entries are written to a temporary directory and renamed into place, so
+    readers never see a partial entry and concurrent writers of the same key
+    are harmless. Reads (and ``touch``) refresh the entry's access time;
+    ``put`` evicts least recently used entries beyond ``max_bytes`` or
+    ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        root: Path = CACHE_DIR / "processed",
+        max_bytes: int = PROCESSED_CACHE_MAX_BYTES,
+        max_entries: int = PROCESSED_CACHE_MAX_ENTRIES,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key
+
+    def __contains__(self, key: str) -> bool:
+        return self._entry(key).is_dir()
+
+    def frame_path(self, key: str, name: str) -> Path:
+        return self._entry(key) / f"{name}.parquet"
+
+    def read(self, key: str, name: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Load one stored frame, optionally only some of its columns."""
+        frame = read_frame(self.frame_path(key, name), columns)
+        self.touch(key)
+        return frame
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as just used, so eviction drops it last."""
+        try:
+            os.utime(self._entry(key))
+        except FileNotFoundError:
+            pass
+
+    def rows(self, key: str, name: str) -> int:
+        return frame_rows(self.frame_path(key, name))
+
+    def put(self, key: str, frames: Dict[str, pd.DataFrame]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.clear_stale()
+        staging = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        staging.mkdir()
+        try:
+            for name, frame in frames.items():
+                write_frame(frame, staging / f"{name}.parquet")
+            os.rename(staging, self._entry(key))
+        except OSError:
+            # Another session stored the same key first; keep theirs.
+            shutil.rmtree(staging, ignore_errors=True)
+            if key not in self:
+                raise
+        self.evict(keep=key)
+
+    def _entries(self):
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and not entry.name.startswith("."):
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+        return sorted(entries)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until within the size and count limits."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            count -= 1
+
+    def clear_stale(self, max_age_seconds: float = 3600) -> None:
+        """Remove staging directories left behind by interrupted writes."""
+        if not self.root.is_dir():
+            return
+        for entry in self.root.glob(".*.tmp"):
+            if time.time() - entry.stat().st_mtime > max_age_seconds:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def dataset_available(key: Optional[str]) -> bool:
+    """Whether ``key`` names a processed dataset that is still in the cache."""
+    return key is not None and key in ProcessedDataCache()
+
+
+# The loaders below serve most requests from memory, without reading the
+# cache entry; each call touches the entry so the dataset on screen stays
+# most recently used and is not evicted from under the dashboards.
+
+@st.cache_resource(max_entries=4 * PROCESSED_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_frame(key: str, name: str, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    return ProcessedDataCache().read(key, name, columns)
+
+
+def load_frame(key: str, name: str, columns: Optional[Tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    Columns of a processed frame, memory-mapped from the cache once per
+    server process and shared by every session working on the same dataset.
+    Callers must treat the returned frame as read-only.
+    """
+    ProcessedDataCache().touch(key)
+    return _load_frame(key, name, columns)
+
+
+@st.cache_resource(max_entries=PROCESSED_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_location_index(key: str) -> LocationIndex:
+    return LocationIndex(ProcessedDataCache().read(key, "matched_df", LOCATION_COLUMNS))
+
+
+def load_location_index(key: str) -> LocationIndex:
+    """Region -> Zone -> Woreda filter index of a dataset's matched_df, built once."""
+    ProcessedDataCache().touch(key)
+    return _load_location_index(key)
+
+
+@st.cache_resource(max_entries=PROCESSED_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_summary_cube(key: str) -> SummaryCube:
+    return SummaryCube(load_frame(key, "matched_df", DASHBOARD_COLUMNS))
+
+
+def load_summary_cube(key: str) -> SummaryCube:
+    """Pre-aggregated totals of a dataset's matched_df, built once."""
+    ProcessedDataCache().touch(key)
+    return _load_summary_cube(key)
@@ -0,0 +1,24 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colors of the utilization categories in dashboard charts and report slides.
+CATEGORY_COLORS = {"Acceptable": "#28a745", "Unacceptable": "#007bff", "Low Utilization": "#dc3545"}
+
+
+def decimate_by_group(
+    df: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    outliers: np.ndarray,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Reduce per-row points to one summary row per ``group_col`` value, with
+    columns ``[group_col, "Min", "Median", "Max", "Points"]``, plus the rows
+    flagged in the boolean array ``outliers``, which are kept individually.
+    """
+    values = df[value_col]
+    summary = values.groupby(df[group_col], observed=True).agg(["min", "median", "max", "count"])
+    summary.columns = ["Min", "Median", "Max", "Points"]
+    return summary.reset_index(), df[outliers]
@@ -0,0 +1,119 @@
+from itertools import product
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.thresholds import VACCINES
+from utils.hierarchy import ALL, LOCATION_COLUMNS, WOREDA_COL
+from utils.metrics import UTILIZATION_CATEGORIES, category_column
+
+WOREDA_COUNT = "Woredas"
+
+
+def category_count_column(vaccine: str, category: str) -> str:
+    return f"{vaccine}_{category}"
+
+
+class SummaryCube:
+    """
+    Administered and distributed totals, Woreda counts and utilization
+    category counts of a matched dataset, pre-aggregated for every
+    combination of Region, Zone, Woreda and Period ("All" included).
+
+    Each combination of grouped levels is one cuboid, indexed by the levels
+    it groups by. The finest cuboid is aggregated from the rows once and the
+    others are rolled up from it, so answering any sidebar selection is an
+    index lookup instead of a scan of the filtered rows.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.vaccines = [
+            v for v in VACCINES
+            if f"{v}_Administered" in df.columns and f"{v}_Distributed" in df.columns
+        ]
+        measures = {}
+        for vaccine in self.vaccines:
+            measures[f"{vaccine}_Administered"] = df[f"{vaccine}_Administered"]
+            measures[f"{vaccine}_Distributed"] = df[f"{vaccine}_Distributed"]
+            if category_column(vaccine) in df.columns:
+                categories = df[category_column(vaccine)]
+                for category in UTILIZATION_CATEGORIES:
+                    measures[category_count_column(vaccine, category)] = (categories == category).astype("int64")
+        base = pd.concat([df[list(LOCATION_COLUMNS)], pd.DataFrame(measures, index=df.index)], axis=1)
+        finest = base.groupby(list(LOCATION_COLUMNS), observed=True).sum()
+        woredas = pd.Series(finest.index.get_level_values(WOREDA_COL), index=finest.index)
+
+        self.cuboids: Dict[Tuple[bool, ...], pd.DataFrame] = {}
+        for grouped in product((True, False), repeat=len(LOCATION_COLUMNS)):
+            levels = [col for col, is_grouped in zip(LOCATION_COLUMNS, grouped) if is_grouped]
+            if len(levels) == len(LOCATION_COLUMNS):
+                cuboid = finest.assign(**{WOREDA_COUNT: 1})
+            elif levels:
+                cuboid = finest.groupby(level=levels, observed=True).sum()
+                cuboid[WOREDA_COUNT] = woredas.groupby(level=levels, observed=True).nunique()
+            else:
+                cuboid = finest.sum().to_frame().T
+                cuboid[WOREDA_COUNT] = woredas.nunique()
+            self.cuboids[grouped] = cuboid
+
+    @staticmethod
+    def _selection(region, zone, woreda, period) -> Dict[str, object]:
+        return dict(zip(LOCATION_COLUMNS, (region, zone, woreda, period)))
+
+    def _empty_cell(self) -> pd.Series:
+        columns = self.cuboids[(False,) * len(LOCATION_COLUMNS)].columns
+        return pd.Series(0, index=columns)
+
+    def cell(self, region=ALL, zone=ALL, woreda=ALL, period=ALL) -> pd.Series:
+        """Totals of the rows matching the selection."""
+        selection = self._selection(region, zone, woreda, period)
+        grouped = tuple(value != ALL for value in selection.values())
+        cuboid = self.cuboids[grouped]
+        key = tuple(value for value in selection.values() if value != ALL)
+        if not key:
+            return cuboid.iloc[0]
+        try:
+            return cuboid.loc[key if len(key) > 1 else key[0]]
+        except KeyError:
+            return self._empty_cell()
+
+    def breakdown(self, by: str, region=ALL, zone=ALL, woreda=ALL, period=ALL) -> pd.DataFrame:
+        """Totals of the rows matching the selection for each value of ``by``."""
+        selection = self._selection(region, zone, woreda, period)
+        grouped = tuple(col == by or value != ALL for col, value in selection.items())
+        cuboid = self.cuboids[grouped]
+        fixed = {col: value for col, value in selection.items() if col != by and value != ALL}
+        if fixed:
+            try:
+                cuboid = cuboid.xs(tuple(fixed.values()), level=list(fixed), drop_level=True)
+            except KeyError:
+                cuboid = cuboid.iloc[0:0].droplevel(list(fixed))
+        if selection[by] != ALL:
+            cuboid = cuboid[cuboid.index == selection[by]]
+        return cuboid
+
+    @staticmethod
+    def category_counts(summary: pd.Series, vaccine: str) -> pd.Series:
+        """
+        Non-zero category counts of one vaccine in a cell, most frequent
+        first, as ``value_counts`` on the category column would give them.
+        """
+        counts = pd.Series(
+            [summary[category_count_column(vaccine, c)] for c in UTILIZATION_CATEGORIES],
+            index=pd.Index(UTILIZATION_CATEGORIES, name="Category"),
+            dtype="int64",
+        )
+        counts = counts[counts > 0]
+        return counts.iloc[np.argsort(-counts.to_numpy(), kind="stable")]
+
+    @staticmethod
+    def category_breakdown(breakdown: pd.DataFrame, vaccine: str) -> pd.DataFrame:
+        """
+        Long-format non-zero category counts per group of a ``breakdown``,
+        with columns ``[<group>, "Category", "Count"]`` in group order.
+        """
+        columns = [category_count_column(vaccine, c) for c in UTILIZATION_CATEGORIES]
+        counts = breakdown[columns].set_axis(pd.Index(UTILIZATION_CATEGORIES, name="Category"), axis=1)
+        counts = counts.stack()
+        return counts[counts > 0].rename("Count").reset_index()
@@ -1,8 +1,11 @@
 import pandas as pd
 import streamlit as st
-from fuzzywuzzy import fuzz
 from typing import Tuple, Dict, List
 
+from config.settings import MATCH_ASSIGNMENT, MATCH_SCORER, MATCH_WORKERS
+from utils.aliases import block_scoped, get_aliases, shared_keys
+from utils.matching import match_woredas
+
 @st.cache_data(show_spinner=False)
 def load_data(file_uploader, dataset_type: str) -> pd.DataFrame:
     """
@@ -35,6 +38,21 @@ def load_data(file_uploader, dataset_type: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 @st.cache_data(show_spinner=False)
+def _fuzzy_matches(
+    admin_df: pd.DataFrame,
+    dist_df: pd.DataFrame,
+    threshold: int,
+    aliases_fingerprint: str
+) -> Tuple[Dict, List, List]:
+    """
+    ``match_woredas`` with the current alias table, cached per inputs and
+    alias table fingerprint (which is otherwise unused).
+    """
+    return match_woredas(
+        admin_df, dist_df, threshold=threshold, aliases=get_aliases(),
+        assignment=MATCH_ASSIGNMENT, workers=MATCH_WORKERS or None, scorer=MATCH_SCORER,
+    )
+
 def perform_fuzzy_matching(
     admin_df: pd.DataFrame, 
     dist_df: pd.DataFrame, 
@@ -42,33 +60,24 @@ def perform_fuzzy_matching(
 ) -> Tuple[Dict, List, List]:
     """
     Perform fuzzy matching on Woreda names between two dataframes.
-    """
-    admin_woredas = admin_df["Woreda"].dropna().unique()
-    dist_woredas = dist_df["Woreda"].dropna().unique()
-    
-    match_map = {}
-    unmatched_admin = []
-    unmatched_dist = list(dist_woredas)
 
-    for admin_woreda in admin_woredas:
-        best_match = None
-        highest_score = 0
-        
-        for dist_woreda in unmatched_dist:
-            score = fuzz.ratio(admin_woreda, dist_woreda)
-            if score > highest_score:
-                highest_score = score
-                best_match = dist_woreda
-                
-        if highest_score >= threshold:
-            match_map[admin_woreda] = best_match
-            unmatched_dist.remove(best_match)
-        else:
-            unmatched_admin.append(admin_woreda)
-            
-    return match_map, unmatched_admin, unmatched_dist
+    Names with a known alias are paired by lookup in the persistent alias
+    table; the rest are blocked by Region/Zone and shortlisted through an
+    n-gram index before scoring with ``MATCH_SCORER`` on ``MATCH_WORKERS``
+    processes, and paired by ``MATCH_ASSIGNMENT``, see
+    ``utils.matching.match_woredas``. New matches of names found in a
+    single Region/Zone are added to the alias table for the next upload.
+    Only the matching is cached, so the table is updated on every call.
+    """
+    aliases = get_aliases()
+    result = _fuzzy_matches(admin_df, dist_df, threshold, aliases.fingerprint())
+    block_cols = [col for col in ("Region", "Zone") if col in admin_df.columns and col in dist_df.columns]
+    shared_admin = shared_keys(admin_df["Woreda"], [admin_df[col] for col in block_cols])
+    shared_dist = shared_keys(dist_df["Woreda"], [dist_df[col] for col in block_cols])
+    if aliases.learn(block_scoped(result[0].items(), shared_admin, shared_dist)):
+        aliases.save()
+    return result
 
-@st.cache_data(show_spinner=False)
 def merge_datasets_with_fuzzy_matching(
     admin_df: pd.DataFrame, 
     dist_df: pd.DataFrame
@@ -0,0 +1,120 @@
+import os
+import tempfile
+from io import BytesIO
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from config.settings import EXCEL_CONSTANT_MEMORY_ROWS, EXPORT_CACHE_MAX_ENTRIES
+
+EXPORT_CHUNK_ROWS = 10_000
+
+# Format -> (label, file extension, MIME type).
+EXPORT_FORMATS = {
+    "xlsx": ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "csv", "text/csv"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _row_chunks(df: pd.DataFrame, chunksize: int = EXPORT_CHUNK_ROWS) -> Iterator[List[tuple]]:
+    """Rows as tuples of plain Python values (None for missing), a chunk at a time."""
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        columns = [
+            values.astype(object).where(values.notna(), None).tolist()
+            for _, values in chunk.items()
+        ]
+        yield list(zip(*columns))
+
+
+def write_excel(df: pd.DataFrame, target, sheet_name: str = "Sheet1", constant_memory: bool = False) -> None:
+    """
+    Write ``df`` without its index to ``target`` (a path or, unless
+    ``constant_memory``, a binary buffer), row by row, with the same bold
+    bordered header ``DataFrame.to_excel`` produces.
+    """
+    from xlsxwriter import Workbook
+
+    options = {"constant_memory": True} if constant_memory else {"in_memory": True}
+    workbook = Workbook(target, options)
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header)
+        row = 1
+        for rows in _row_chunks(df):
+            for values in rows:
+                worksheet.write_row(row, 0, values)
+                row += 1
+    finally:
+        workbook.close()
+
+
+def to_excel(df: pd.DataFrame, sheet_name: str = "Sheet1") -> bytes:
+    """
+    Excel workbook bytes. Large tables are written in constant_memory mode,
+    which flushes each row to a temporary file as it is written.
+    """
+    if len(df) < EXCEL_CONSTANT_MEMORY_ROWS:
+        output = BytesIO()
+        write_excel(df, output, sheet_name)
+        return output.getvalue()
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    try:
+        write_excel(df, path, sheet_name, constant_memory=True)
+        with open(path, "rb") as file:
+            return file.read()
+    finally:
+        os.remove(path)
+
+
+def to_csv(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def to_parquet(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), output)
+    return output.getvalue()
+
+
+EXPORTERS = {"xlsx": to_excel, "csv": to_csv, "parquet": to_parquet}
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_export(key: Tuple, fmt: str, _frame: Callable[[], pd.DataFrame]) -> bytes:
+    """
+    File contents of ``_frame()`` in ``fmt``, cached by ``key`` (dataset
+    hash, filter state and table name) rather than by the frame itself.
+    """
+    return EXPORTERS[fmt](_frame())
+
+
+def export_buttons(
+    label: str,
+    frame: Callable[[], pd.DataFrame],
+    key: Tuple,
+    file_stem: str,
+    formats: Sequence[str] = ("xlsx", "csv", "parquet"),
+    **button_kwargs,
+) -> None:
+    """
+    One download button per format. A file is generated only when its
+    button is clicked, and reused for the same ``key`` afterwards.
+    """
+    for column, fmt in zip(st.columns(len(formats)), formats):
+        name, extension, mime = EXPORT_FORMATS[fmt]
+        with column:
+            st.download_button(
+                label=f"{label} as {name}",
+                data=lambda fmt=fmt: cached_export(key, fmt, frame),
+                file_name=f"{file_stem}.{extension}",
+                mime=mime,
+                key=f"download-{fmt}-{hash(key)}",
+                **button_kwargs,
+            )
@@ -0,0 +1,103 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.thresholds import VACCINES
+from utils.metrics import rate_column
+from utils.threshold_registry import get_thresholds
+
+
+class Extremities:
+    """
+    High and low utilization extremity flags of every vaccine, computed in
+    one pass over an (rows x vaccines) matrix of rates.
+
+    A rate is a high extremity above its vaccine's "high" threshold and a low
+    extremity below its "low" threshold (see the threshold registry); missing
+    rates are neither. The overall counts and the per-group table share the
+    same flag matrices.
+    """
+
+    def __init__(self, df: pd.DataFrame, vaccines: Sequence[str] = VACCINES):
+        thresholds = get_thresholds()
+        self.vaccines: List[str] = [v for v in thresholds.known(vaccines) if rate_column(v) in df.columns]
+        rates = np.empty((len(df), len(self.vaccines)))
+        for i, vaccine in enumerate(self.vaccines):
+            rates[:, i] = df[rate_column(vaccine)].to_numpy(dtype="float64", na_value=np.nan)
+        rates /= 100
+        self.high = rates > thresholds.array("extremity", "high", self.vaccines)
+        self.low = rates < thresholds.array("extremity", "low", self.vaccines)
+
+    def counts(self) -> Dict[str, Tuple[int, int]]:
+        """``{vaccine: (high count, low count)}``."""
+        high = self.high.sum(axis=0)
+        low = self.low.sum(axis=0)
+        return {v: (int(high[i]), int(low[i])) for i, v in enumerate(self.vaccines)}
+
+    def flagged(self, vaccine: str) -> np.ndarray:
+        """Whether each row is a high or a low extremity of ``vaccine``."""
+        i = self.vaccines.index(vaccine)
+        return self.high[:, i] | self.low[:, i]
+
+    def by_group(self, df: pd.DataFrame, vaccine: str, group_cols: Sequence[str]) -> pd.DataFrame:
+        """
+        Distinct Woredas and high/low extremity counts of ``vaccine`` per
+        ``group_cols`` of ``df`` (the frame the flags were computed from),
+        in ``groupby`` order and with unobserved or missing groups left out.
+
+        Counts come from ``np.bincount`` and ``np.unique`` over the columns'
+        categorical codes of the rows present, so neither rows nor per-row
+        flag columns are copied, and nothing is sized by the categories of
+        the full dataset.
+        """
+        i = self.vaccines.index(vaccine)
+        group_ids, complete, labels = _group_ids(df, group_cols)
+        n_groups = len(complete)
+        woreda_codes, woredas = _codes(df["Woreda_Admin"])
+
+        # Distinct (group, Woreda) pairs, as one int64 code per row present.
+        named = woreda_codes >= 0
+        pairs = np.unique(group_ids[named].astype(np.int64) * len(woredas) + woreda_codes[named])
+        summary = {col: values[complete] for col, values in zip(group_cols, labels)}
+        summary["total_woredas"] = np.bincount(pairs // max(len(woredas), 1), minlength=n_groups)[complete]
+        summary["high_extremity_count"] = np.bincount(group_ids[self.high[:, i]], minlength=n_groups)[complete]
+        summary["low_extremity_count"] = np.bincount(group_ids[self.low[:, i]], minlength=n_groups)[complete]
+        return pd.DataFrame(summary)
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Codes (-1 for missing) and sorted categories of a column, without copying categoricals."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.array.codes, values.cat.categories
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def _group_ids(df: pd.DataFrame, group_cols: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    Group id of every row, numbering only the groups present in ``df`` in
+    ``groupby`` order. Rows get a mixed-radix id over the columns' codes
+    shifted by one (so 0 stands for a missing value), which orders like
+    ``groupby``, compacted with ``np.unique``. Also returns, per group,
+    whether no key is missing and the label of each column.
+    """
+    radix_ids = np.zeros(len(df), dtype=np.int64)
+    columns = [_codes(df[col]) for col in group_cols]
+    radixes = [len(categories) + 1 for _, categories in columns]
+    for (codes, _), radix in zip(columns, radixes):
+        radix_ids *= radix
+        radix_ids += codes
+        radix_ids += 1
+
+    present, group_ids = np.unique(radix_ids, return_inverse=True)
+    complete = np.ones(len(present), dtype=bool)
+    labels = []
+    stride = int(np.prod(radixes, dtype=np.int64))
+    for (_, categories), radix in zip(columns, radixes):
+        stride //= radix
+        shifted = present // stride % radix
+        complete &= shifted > 0
+        values = np.asarray(categories, dtype=object)
+        labels.append(values[np.maximum(shifted - 1, 0)] if len(values) else np.full(len(present), None, dtype=object))
+    return group_ids.astype(np.intp), complete, labels
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from config.settings import FIGURE_CACHE_MAX_BYTES
+
+
+class FigureCache:
+    """
+    Serialized Plotly figures keyed by dataset, filter state and chart type,
+    bounded to ``max_bytes`` of JSON with least recently used eviction.
+
+    Shared by every session of the server process, so access is locked.
+    """
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._figures: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def get(self, key: Hashable) -> Optional[go.Figure]:
+        with self._lock:
+            spec = self._figures.get(key)
+            if spec is None:
+                return None
+            self._figures.move_to_end(key)
+        return pio.from_json(spec)
+
+    def put(self, key: Hashable, fig: go.Figure) -> None:
+        spec = fig.to_json()
+        if len(spec) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._figures.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._figures[key] = spec
+            self.size += len(spec)
+            while self.size > self.max_bytes:
+                _, evicted = self._figures.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """The cached figure for ``key``, or ``build()``'s result, cached."""
+        fig = self.get(key)
+        if fig is None:
+            fig = build()
+            self.put(key, fig)
+        return fig
+
+
+def figure_key(dataset_key: str, selection: Tuple, vaccine: str, chart: str) -> Tuple:
+    """(dataset hash, region, zone, woreda, period, vaccine, chart type)."""
+    return (dataset_key, *selection, vaccine, chart)
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache() -> FigureCache:
+    """The process-wide figure cache."""
+    return FigureCache()
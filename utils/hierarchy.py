@@ -0,0 +1,101 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALL = "All"
+
+REGION_COL = "Region_Admin"
+ZONE_COL = "Zone_Admin"
+WOREDA_COL = "Woreda_Admin"
+PERIOD_COL = "Period"
+LOCATION_COLUMNS = (REGION_COL, ZONE_COL, WOREDA_COL, PERIOD_COL)
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+def _positions(df: pd.DataFrame, cols) -> Dict[Hashable, np.ndarray]:
+    """Row positions of every observed value (or value tuple) of ``cols``."""
+    groups = df.groupby(list(cols) if len(cols) > 1 else cols[0], observed=True, sort=False).indices
+    return {key: np.asarray(rows, dtype=np.intp) for key, rows in groups.items()}
+
+
+class LocationIndex:
+    """
+    Region -> Zone -> Woreda hierarchy of a matched dataset, built once so the
+    sidebar cascade and the filtered view need no full-frame scans.
+
+    Dropdown options are precomputed, sorted lists. Every Region, Zone, Woreda
+    and Period maps to the ascending row positions it covers, and each column
+    keeps its factorized codes. A selection starts from the shortest matching
+    position list and narrows it by comparing codes at just those positions,
+    so its cost depends on the size of the result, not the dataset.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.postings: Dict[str, Dict[Hashable, np.ndarray]] = {}
+        self.codes: Dict[str, Tuple[np.ndarray, Dict[Hashable, int]]] = {}
+        for col in LOCATION_COLUMNS:
+            codes, uniques = pd.factorize(df[col])
+            self.codes[col] = (codes, {value: code for code, value in enumerate(uniques)})
+            self.postings[col] = _positions(df, [col])
+
+        self.regions = sorted(self.postings[REGION_COL])
+        self.periods = sorted(self.postings[PERIOD_COL])
+        self.all_zones = sorted(self.postings[ZONE_COL])
+        self.all_woredas = sorted(self.postings[WOREDA_COL])
+
+        self.zones_by_region: Dict[Hashable, set] = {region: set() for region in self.regions}
+        self.woredas_by_region: Dict[Hashable, set] = {region: set() for region in self.regions}
+        self.woredas_by_region_zone: Dict[Tuple, set] = {}
+        for region, zone, woreda in _positions(df, [REGION_COL, ZONE_COL, WOREDA_COL]):
+            self.zones_by_region[region].add(zone)
+            self.woredas_by_region[region].add(woreda)
+            self.woredas_by_region_zone.setdefault((region, zone), set()).add(woreda)
+        for options in (self.zones_by_region, self.woredas_by_region, self.woredas_by_region_zone):
+            for key, values in options.items():
+                options[key] = sorted(values)
+
+    def zones(self, region=ALL) -> List:
+        """Zone options for the selected Region."""
+        if region == ALL:
+            return self.all_zones
+        return self.zones_by_region.get(region, [])
+
+    def woredas(self, region=ALL, zone=ALL) -> List:
+        """
+        Woreda options for the selected Region and Zone. As in the original
+        cascade, a Zone selected without a Region offers no Woredas.
+        """
+        if zone != ALL:
+            return self.woredas_by_region_zone.get((region, zone), [])
+        if region != ALL:
+            return self.woredas_by_region.get(region, [])
+        return self.all_woredas
+
+    def positions(self, region=ALL, zone=ALL, woreda=ALL, period=ALL) -> Optional[np.ndarray]:
+        """
+        Ascending row positions matching every non-"All" selection, or None
+        when nothing is selected.
+        """
+        selections = [
+            (col, value)
+            for col, value in zip(LOCATION_COLUMNS, (region, zone, woreda, period))
+            if value != ALL
+        ]
+        if not selections:
+            return None
+        selections.sort(key=lambda item: len(self.postings[item[0]].get(item[1], _EMPTY)))
+        (first_col, first_value), rest = selections[0], selections[1:]
+        rows = self.postings[first_col].get(first_value, _EMPTY)
+        for col, value in rest:
+            codes, code_of = self.codes[col]
+            if value not in code_of:
+                return _EMPTY
+            rows = rows[codes[rows] == code_of[value]]
+        return rows
+
+    def filter(self, df: pd.DataFrame, region=ALL, zone=ALL, woreda=ALL, period=ALL) -> pd.DataFrame:
+        """Rows of ``df`` (the frame the index was built from) matching the selection."""
+        rows = self.positions(region, zone, woreda, period)
+        return df if rows is None else df.take(rows)
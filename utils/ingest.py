@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+CSV_CHUNK_ROWS = 100_000
+EXCEL_CHUNK_ROWS = 20_000
+# ``DataFrame.attrs`` key of the per-column count of cells that were not
+# numbers and were read as missing.
+COERCED_CELLS = "coerced_cells"
+
+VACCINE_PREFIXES = ("bcg", "ipv", "measles", "penta", "rota")
+
+
+def _clean_name(col) -> str:
+    """Same normalization as ``utils.processing.clean_column_names``."""
+    return str(col).strip().replace(' ', '_').replace('.', '').replace('-', '_').lower()
+
+
+def count_columns(columns) -> List:
+    """Raw column names that hold vaccine dose counts."""
+    return [col for col in columns if _clean_name(col).startswith(VACCINE_PREFIXES)]
+
+
+def _compact_counts(df: pd.DataFrame, columns, coerced: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """
+    Store count columns as ``int64`` when they are complete whole numbers and
+    as ``float64`` when they have gaps or fractions. Cells that are not
+    numbers become missing and are added up per column in ``coerced``.
+    """
+    for col in columns:
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            numbers = pd.to_numeric(values, errors="coerce")
+            bad = int((numbers.isna() & values.notna()).sum())
+            if bad and coerced is not None:
+                coerced[col] = coerced.get(col, 0) + bad
+            values = numbers
+        if not values.isna().any() and (values % 1 == 0).all():
+            values = values.astype("int64")
+        df[col] = values
+    return df
+
+
+def _with_coerced(df: pd.DataFrame, coerced: Dict[str, int]) -> pd.DataFrame:
+    df.attrs[COERCED_CELLS] = coerced
+    return df
+
+
+def _source_name(source) -> str:
+    return str(getattr(source, "name", source))
+
+
+def read_csv_chunked(source, chunksize: int = CSV_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Read a CSV in ``chunksize`` row chunks, so the parser never holds more
+    than one chunk of untyped buffers.
+
+    Counts are converted and compacted per chunk as it arrives, and the frame
+    is assembled column by column, releasing each column's chunks once it is
+    joined, so the peak stays near one frame plus one column rather than two
+    frames. Count cells that are not numbers are read as missing; their
+    number per column is in ``df.attrs[COERCED_CELLS]``.
+    """
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, "seek"):
+        source.seek(0)
+    counts = count_columns(header)
+    coerced: Dict[str, int] = {}
+    pieces = {}
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        chunk = _compact_counts(chunk, counts, coerced)
+        for col in chunk.columns:
+            pieces.setdefault(col, []).append(chunk[col])
+        del chunk
+    if not pieces:
+        return _with_coerced(_compact_counts(pd.DataFrame(columns=header), counts), coerced)
+    # A count column that is int64 in some chunks and float64 in others is
+    # joined as float64, as when the whole file is compacted at once.
+    columns = {col: pd.concat(pieces.pop(col), ignore_index=True) for col in list(pieces)}
+    return _with_coerced(pd.DataFrame(columns, copy=False), coerced)
+
+
+def _excel_row_chunks(source, chunksize: int) -> Tuple[List, Iterator[List[tuple]]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    rows = workbook.worksheets[0].iter_rows(values_only=True)
+    header = next(rows, ())
+    columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+
+    def chunks():
+        try:
+            chunk = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                chunk.append(row[:len(columns)])
+                if len(chunk) >= chunksize:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            workbook.close()
+
+    return columns, chunks()
+
+
+def read_excel_streaming(source, chunksize: int = EXCEL_CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Read the first sheet of a workbook through openpyxl's read-only mode,
+    which parses the sheet XML as a stream instead of loading the whole
+    workbook tree into memory. Count cells that are not numbers are read as
+    missing, as in ``read_csv_chunked``.
+    """
+    columns, chunks = _excel_row_chunks(source, chunksize)
+    frames = [pd.DataFrame.from_records(chunk, columns=columns) for chunk in chunks]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    df = df.infer_objects()
+    coerced: Dict[str, int] = {}
+    return _with_coerced(_compact_counts(df, count_columns(columns), coerced), coerced)
+
+
+def read_file(source) -> pd.DataFrame:
+    """Read an uploaded (or on-disk) .csv or .xlsx file."""
+    if _source_name(source).lower().endswith(".csv"):
+        return read_csv_chunked(source)
+    else:
+        return read_excel_streaming(source)
+
+
+def read_uploads(admin_file, dist_file) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Read the administered and distributed uploads concurrently."""
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ingest") as pool:
+        admin_future = pool.submit(read_file, admin_file)
+        dist_future = pool.submit(read_file, dist_file)
+        return admin_future.result(), dist_future.result()
@@ -0,0 +1,555 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import MATCH_CHUNK_MIN_NAMES, MATCH_DENSE_MAX_CELLS, MATCH_PARALLEL_MIN_NAMES
+from utils.aliases import WoredaAliases
+from utils.assignment import assign
+from utils.scorers import get_scorer
+from utils.normalization import normalize_woreda_names
+
+NGRAM_SIZE = 3
+DEFAULT_BLOCK_COLS = ("Region", "Zone")
+ASSIGNMENT_MODES = ("greedy", "optimal")
+DEFAULT_SCORER = "fuzzywuzzy"
+
+
+def _gram_bag(text: str, n: int = NGRAM_SIZE) -> frozenset:
+    """
+    Padded character n-grams of ``text`` as a set of (gram, occurrence) pairs,
+    so that set intersection sizes equal multiset intersection sizes.
+    """
+    padded = f"{' ' * (n - 1)}{text}{' ' * (n - 1)}"
+    seen: Dict[str, int] = {}
+    bag = []
+    for i in range(len(padded) - n + 1):
+        gram = padded[i:i + n]
+        seen[gram] = seen.get(gram, 0) + 1
+        bag.append((gram, seen[gram]))
+    return frozenset(bag)
+
+
+def _max_indel_distance(total_len: int, threshold: int) -> int:
+    """
+    Largest insert/delete distance for which ``fuzz.ratio`` can still round up
+    to ``threshold`` on two strings whose lengths add up to ``total_len``.
+    """
+    return int(total_len * (100.5 - threshold) / 100 + 1e-9)
+
+
+def _required_shared_grams(len_a: int, len_b: int, threshold: int, n: int = NGRAM_SIZE) -> int:
+    """
+    Count filter: strings within edit distance ``k`` share at least
+    ``max(len) + n - 1 - k * n`` padded n-grams.
+    """
+    k = _max_indel_distance(len_a + len_b, threshold)
+    return max(len_a, len_b) + n - 1 - k * n
+
+
+class CandidateIndex:
+    """
+    N-gram index over the distributed Woredas of one block.
+
+    The shortlist is lossless: every candidate that could reach ``threshold``
+    with ``fuzz.ratio`` is returned, so matching on the shortlist gives the
+    same result as scoring the whole block.
+    """
+
+    def __init__(self, names: Sequence[Hashable]):
+        self.names = list(names)
+        self.texts = [str(name) for name in self.names]
+        self.lengths = [len(text) for text in self.texts]
+        self.grams = [_gram_bag(text) for text in self.texts]
+        self.distinct_lengths = sorted(set(self.lengths))
+        self.alive = [True] * len(self.names)
+        self.postings: Dict[tuple, List[int]] = {}
+        for idx, bag in enumerate(self.grams):
+            for gram in bag:
+                self.postings.setdefault(gram, []).append(idx)
+
+    def remove(self, idx: int) -> None:
+        self.alive[idx] = False
+
+    def _length_window(self, len_a: int, threshold: int) -> List[int]:
+        return [
+            len_b for len_b in self.distinct_lengths
+            if abs(len_a - len_b) <= _max_indel_distance(len_a + len_b, threshold)
+        ]
+
+    def shortlist(self, text: str, threshold: int) -> List[int]:
+        """Return the indices of live candidates worth scoring, in index order."""
+        len_a = len(text)
+        window = self._length_window(len_a, threshold)
+        if not window:
+            return []
+        min_required = min(_required_shared_grams(len_a, len_b, threshold) for len_b in window)
+        window = set(window)
+
+        if min_required <= 0:
+            return [
+                idx for idx, alive in enumerate(self.alive)
+                if alive and self.lengths[idx] in window
+            ]
+
+        query = _gram_bag(text)
+        # Prefix filter: any string sharing ``min_required`` grams with the
+        # query shares at least one of its ``len(query) - min_required + 1``
+        # rarest grams, so only those posting lists need to be walked.
+        ranked = sorted(query, key=lambda gram: len(self.postings.get(gram, ())))
+        probe = ranked[:len(query) - min_required + 1]
+
+        candidates = set()
+        for gram in probe:
+            candidates.update(self.postings.get(gram, ()))
+
+        shortlist = []
+        for idx in sorted(candidates):
+            if not self.alive[idx]:
+                continue
+            len_b = self.lengths[idx]
+            if len_b not in window:
+                continue
+            if len(query & self.grams[idx]) >= _required_shared_grams(len_a, len_b, threshold):
+                shortlist.append(idx)
+        return shortlist
+
+
+def _blocks(
+    df: pd.DataFrame,
+    block_cols: Sequence[str],
+    name_col: str,
+    aliases: Optional[WoredaAliases] = None,
+    source: str = "admin",
+) -> Dict[tuple, List[Tuple]]:
+    """
+    Unique ``(name, match_key)`` pairs per block, in order of first appearance.
+
+    Blocks are keyed on the normalized blocking columns so that spelling
+    differences in case or punctuation do not split a Region or Zone. With
+    ``aliases``, match keys are resolved to facility ids of ``source``.
+    """
+    subset = df[list(block_cols) + [name_col]].dropna(subset=[name_col]).drop_duplicates()
+    block_keys = [normalize_woreda_names(subset[col]) for col in block_cols]
+    match_keys = normalize_woreda_names(subset[name_col])
+    if aliases is not None:
+        match_keys = aliases.resolve(source, match_keys)
+    blocks: Dict[tuple, List[Tuple]] = {}
+    for *block, name, key in zip(*block_keys, subset[name_col], match_keys):
+        blocks.setdefault(tuple(block), []).append((name, key))
+    return blocks
+
+
+# Scored candidates of each admin name: (candidate index, score) pairs that
+# reach the threshold, in candidate index order.
+Scored = List[List[Tuple[int, int]]]
+
+
+def _score_block(admin_names: Sequence, dist_names: Sequence, threshold: int, scorer: str = DEFAULT_SCORER) -> Scored:
+    """
+    Score the (admin, dist) pairs of one block that can reach ``threshold``.
+    A batched scorer takes blocks of up to ``MATCH_DENSE_MAX_CELLS`` pairs as
+    one matrix; otherwise each admin name is scored against its shortlist.
+    """
+    backend = get_scorer(scorer)
+    if backend.batched and len(admin_names) * len(dist_names) <= MATCH_DENSE_MAX_CELLS:
+        matrix = backend.scores(admin_names, dist_names)
+        keep = (matrix >= threshold) & (matrix > 0)
+        return [[(int(idx), int(matrix[row, idx])) for idx in np.flatnonzero(keep[row])]
+                for row in range(len(admin_names))]
+
+    index = CandidateIndex(dist_names)
+    scored = []
+    for admin_name in admin_names:
+        shortlist = index.shortlist(str(admin_name), threshold)
+        scores = backend.scores([admin_name], [index.names[idx] for idx in shortlist])[0]
+        scored.append([(idx, int(score)) for idx, score in zip(shortlist, scores)
+                       if score >= threshold and score > 0])
+    return scored
+
+
+def _score_chunk(chunk: List[Tuple], threshold: int, scorer: str) -> List[Tuple[int, int, Scored]]:
+    """Score the ``(job, start, admin_names, dist_names)`` pieces of one chunk."""
+    return [(job, start, _score_block(admin_names, dist_names, threshold, scorer))
+            for job, start, admin_names, dist_names in chunk]
+
+
+def default_workers() -> int:
+    """CPUs available to this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _chunks(jobs: List[Tuple], chunk_names: int) -> List[List[Tuple]]:
+    """
+    Group the ``(admin_names, dist_names)`` jobs into chunks of about
+    ``chunk_names`` admin names: small blocks are packed together and large
+    ones are sliced.
+    """
+    chunks, chunk, size = [], [], 0
+    for job, (admin_names, dist_names) in enumerate(jobs):
+        for start in range(0, len(admin_names), chunk_names):
+            piece = admin_names[start:start + chunk_names]
+            chunk.append((job, start, piece, dist_names))
+            size += len(piece)
+            if size >= chunk_names:
+                chunks.append(chunk)
+                chunk, size = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def score_candidates(
+    jobs: List[Tuple],
+    threshold: int,
+    workers: Optional[int] = 1,
+    scorer: str = DEFAULT_SCORER,
+) -> List[Scored]:
+    """
+    Scored candidates of every ``(admin_names, dist_names)`` block job, by
+    the ``scorer`` backend of ``utils.scorers``.
+
+    With ``workers`` other than 1 (``None`` uses every available CPU) and at
+    least ``MATCH_PARALLEL_MIN_NAMES`` admin names in total, the jobs are cut
+    into chunks of whole or sliced blocks and scored on a process pool. The
+    pool spawns fresh interpreters rather than forking, since the caller may
+    be a thread of the Streamlit server. The results are identical to the
+    serial ones.
+    """
+    total = sum(len(admin_names) for admin_names, _ in jobs)
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 or total < MATCH_PARALLEL_MIN_NAMES:
+        return [_score_block(admin_names, dist_names, threshold, scorer) for admin_names, dist_names in jobs]
+
+    # About four chunks per worker, so that uneven blocks still balance.
+    chunks = _chunks(jobs, max(MATCH_CHUNK_MIN_NAMES, -(-total // (workers * 4))))
+    scored: List[Scored] = [[None] * len(admin_names) for admin_names, _ in jobs]
+    with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn")) as pool:
+        for results in pool.map(_score_chunk, chunks, [threshold] * len(chunks), [scorer] * len(chunks)):
+            for job, start, piece in results:
+                scored[job][start:start + len(piece)] = piece
+    return scored
+
+
+def _assign_greedy(scored: Scored) -> List[Tuple[int, int]]:
+    """
+    Each admin name, in order, takes its best remaining candidate (the first
+    one in index order on ties), as the exhaustive matcher does.
+    """
+    taken = set()
+    pairs = []
+    for row, candidates in enumerate(scored):
+        best_idx = None
+        highest_score = 0
+        for idx, score in candidates:
+            if score > highest_score and idx not in taken:
+                highest_score = score
+                best_idx = idx
+        if best_idx is not None:
+            pairs.append((row, best_idx))
+            taken.add(best_idx)
+    return pairs
+
+
+def _assign_optimal(scored: Scored, n_candidates: int) -> List[Tuple[int, int]]:
+    """The one-to-one assignment with the highest total score over ``scored``."""
+    rows, cols, scores = [], [], []
+    for row, candidates in enumerate(scored):
+        for idx, score in candidates:
+            rows.append(row)
+            cols.append(idx)
+            scores.append(score)
+    return assign(rows, cols, scores, len(scored), n_candidates)
+
+
+def _match_blocks(
+    admin_blocks: Dict[tuple, List[Tuple]],
+    dist_blocks: Dict[tuple, List[Tuple]],
+    threshold: int,
+    exact_first: bool,
+    assignment: str,
+    workers: Optional[int],
+    scorer: str,
+) -> List[Tuple[tuple, List[Tuple], int]]:
+    """
+    Match the ``(name, match_key)`` entries of each block that both sides
+    have, see ``match_woredas``. Returns ``(block, pairs, candidate_pairs)``
+    in admin block order, where ``pairs`` are ``(admin name, dist name,
+    exact)`` and ``candidate_pairs`` is the size of the fuzzy search space.
+    """
+    # Per block with distributed names: its exact pairs, then the admin names
+    # still pending and the distributed names left for fuzzy scoring.
+    blocks: List[tuple] = []
+    exact_pairs: List[List[Tuple]] = []
+    jobs: List[Tuple[List, List]] = []
+    for block, admin_entries in admin_blocks.items():
+        dist_entries = dist_blocks.get(block)
+        if not dist_entries:
+            continue
+
+        pairs = []
+        pending = [name for name, _ in admin_entries]
+        alive = [True] * len(dist_entries)
+        if exact_first:
+            by_key: Dict[str, List[int]] = {}
+            for idx, (_, key) in enumerate(dist_entries):
+                by_key.setdefault(key, []).append(idx)
+            pending = []
+            for admin_name, key in admin_entries:
+                same_key = [idx for idx in by_key.get(key, ()) if alive[idx]]
+                if same_key:
+                    pairs.append((admin_name, dist_entries[same_key[0]][0], True))
+                    alive[same_key[0]] = False
+                else:
+                    pending.append(admin_name)
+
+        remaining = [name for (name, _), live in zip(dist_entries, alive) if live]
+        if assignment == "optimal":
+            # Sorted by name, so that neither upload's row order can change ties.
+            pending = sorted(pending, key=str)
+            remaining = sorted(remaining, key=str)
+        blocks.append(block)
+        exact_pairs.append(pairs)
+        jobs.append((pending, remaining) if pending else ([], []))
+
+    results = []
+    scored_jobs = score_candidates(jobs, threshold, workers, scorer)
+    for block, pairs, (pending, remaining), scored in zip(blocks, exact_pairs, jobs, scored_jobs):
+        if assignment == "optimal":
+            fuzzy_pairs = _assign_optimal(scored, len(remaining))
+        else:
+            fuzzy_pairs = _assign_greedy(scored)
+        pairs = pairs + [(pending[row], remaining[idx], False) for row, idx in fuzzy_pairs]
+        results.append((block, pairs, len(pending) * len(remaining)))
+    return results
+
+
+def match_woredas(
+    admin_df: pd.DataFrame,
+    dist_df: pd.DataFrame,
+    threshold: int = 85,
+    block_cols: Sequence[str] = DEFAULT_BLOCK_COLS,
+    name_col: str = "Woreda",
+    exact_first: bool = True,
+    aliases: Optional[WoredaAliases] = None,
+    assignment: str = "greedy",
+    workers: Optional[int] = 1,
+    scorer: str = DEFAULT_SCORER,
+) -> Tuple[Dict, List, List]:
+    """
+    Fuzzy-match Woreda names, scoring only candidates in the same block.
+
+    Blocking columns missing from either frame are ignored; without any the
+    whole dataset is one block. With ``exact_first``, names whose normalized
+    match key (see ``utils.normalization``) is identical are paired first, as
+    the Data Processing page does; with ``aliases`` (see ``utils.aliases``)
+    the keys are first resolved to facility ids, so names with a known alias
+    are paired by that lookup too.
+
+    With the ``"greedy"`` ``assignment``, the remaining admin Woredas are
+    matched in order of appearance to their best remaining distributed
+    Woreda, exactly as the exhaustive matcher does, but only n-gram
+    shortlisted pairs are scored. With ``"optimal"``, every shortlisted pair
+    reaching ``threshold`` is scored and the block's one-to-one assignment
+    with the highest total score is taken (see ``utils.assignment.assign``),
+    so an early weak match cannot take a later strong one and the result
+    does not depend on row order.
+
+    Candidate scoring can run on ``workers`` processes with any ``scorer``
+    backend, see ``score_candidates``; the matches depend on neither.
+
+    Returns ``(match_map, unmatched_admin, unmatched_dist)`` where
+    ``match_map`` maps an admin name to its distributed name. A name that
+    appears in several blocks keeps its first match; the distributed names
+    it matched in other blocks are left in ``unmatched_dist``.
+    """
+    if assignment not in ASSIGNMENT_MODES:
+        raise ValueError(f"Unknown assignment {assignment!r}; expected one of {', '.join(ASSIGNMENT_MODES)}")
+    block_cols = [col for col in block_cols if col in admin_df.columns and col in dist_df.columns]
+
+    admin_blocks = _blocks(admin_df, block_cols, name_col, aliases, "admin")
+    dist_blocks = _blocks(dist_df, block_cols, name_col, aliases, "dist")
+
+    match_map: Dict = {}
+    for _, pairs, _ in _match_blocks(admin_blocks, dist_blocks, threshold, exact_first, assignment, workers, scorer):
+        for admin_name, dist_name, _ in pairs:
+            match_map.setdefault(admin_name, dist_name)
+    # Only distributed names kept in the map count as matched, so those a
+    # repeated admin name matched in a later block are reported unmatched.
+    matched_dist = set(match_map.values())
+
+    admin_woredas = admin_df[name_col].dropna().unique()
+    dist_woredas = dist_df[name_col].dropna().unique()
+    unmatched_admin = [name for name in admin_woredas if name not in match_map]
+    unmatched_dist = [name for name in dist_woredas if name not in matched_dist]
+
+    return match_map, unmatched_admin, unmatched_dist
+
+
+HIERARCHY_LEVELS = ("Region", "Zone", "Woreda")
+UNMATCHED_ID = -1
+
+MATCH_STATS_COLUMNS = [
+    "Level", "Admin", "Dist", "Blocks", "Exact", "Fuzzy",
+    "Unmatched Admin", "Unmatched Dist", "Candidate Pairs", "Unblocked Pairs",
+]
+
+
+@dataclass
+class HierarchyMatch:
+    """
+    Result of ``match_hierarchy``. ``admin_ids`` and ``dist_ids`` hold the
+    matched pair id of every row (``UNMATCHED_ID`` when unmatched), aligned
+    with the input frames; ``pairs`` lists the matched locations by pair id.
+    """
+    admin_ids: pd.Series
+    dist_ids: pd.Series
+    pairs: pd.DataFrame
+    stats: pd.DataFrame
+
+
+def _level_entries(names: pd.Series, keys: pd.Series, parents: List[pd.Series], by_key: bool) -> Dict[tuple, List[Tuple]]:
+    """
+    ``(name, match_key)`` entries per parent key tuple, in order of first
+    appearance, unique by match key (``by_key``) or by name.
+    """
+    blocks: Dict[tuple, List[Tuple]] = {}
+    seen = set()
+    for *parent, name, key in zip(*parents, names, keys):
+        parent = tuple(parent)
+        if (parent, key if by_key else name) in seen:
+            continue
+        seen.add((parent, key if by_key else name))
+        blocks.setdefault(parent, []).append((name, key))
+    return blocks
+
+
+def _locations(df: pd.DataFrame, levels: Sequence[str], aliases: Optional[WoredaAliases], source: str):
+    """
+    Row validity mask, location group of each valid row, and the distinct
+    locations with the match key of every level (the last one resolved
+    through ``aliases``).
+    """
+    levels = list(levels)
+    valid = df[levels].notna().all(axis=1).to_numpy()
+    groups = df.loc[valid, levels].groupby(levels, sort=False).ngroup().to_numpy()
+    locations = df.loc[valid, levels].drop_duplicates()
+    keys = [normalize_woreda_names(locations[col]) for col in levels]
+    if aliases is not None:
+        keys[-1] = aliases.resolve(source, keys[-1])
+    return valid, groups, locations, keys
+
+
+def _row_ids(valid: np.ndarray, groups: np.ndarray, location_ids: List[int], index: pd.Index) -> pd.Series:
+    ids = np.full(len(valid), UNMATCHED_ID, dtype=np.int64)
+    ids[valid] = np.asarray(location_ids, dtype=np.int64)[groups]
+    return pd.Series(ids, index=index, name="pair_id")
+
+
+def match_hierarchy(
+    admin_df: pd.DataFrame,
+    dist_df: pd.DataFrame,
+    admin_levels: Sequence[str] = HIERARCHY_LEVELS,
+    dist_levels: Sequence[str] = HIERARCHY_LEVELS,
+    threshold: int = 85,
+    exact_first: bool = True,
+    aliases: Optional[WoredaAliases] = None,
+    assignment: str = "greedy",
+    workers: Optional[int] = 1,
+    scorer: str = DEFAULT_SCORER,
+) -> HierarchyMatch:
+    """
+    Match locations level by level: Regions first, then the Zones within
+    each matched Region pair, then the Woredas within each matched Zone pair.
+
+    Every level is matched like ``match_woredas`` matches Woredas (exact
+    match keys first, then fuzzy scoring with ``assignment``), with the
+    matched parent pairs as blocks. Names are compared only to candidates
+    under the matched parent, so identically named facilities in different
+    Zones cannot be paired, and a Region or Zone spelled differently in the
+    two uploads still lines its children up. Region and Zone units are
+    identified by match key, Woredas by name within their Zone; ``aliases``
+    apply to the Woreda keys.
+
+    ``stats`` has one row per level: the distinct units of each upload, the
+    blocks (matched parent pairs) searched, exact and fuzzy matches, the
+    units left unmatched (including those under an unmatched parent), the
+    fuzzy pairs within blocks and the pairs an unblocked search of the level
+    would have had.
+    """
+    if assignment not in ASSIGNMENT_MODES:
+        raise ValueError(f"Unknown assignment {assignment!r}; expected one of {', '.join(ASSIGNMENT_MODES)}")
+    if len(admin_levels) != len(dist_levels):
+        raise ValueError("admin_levels and dist_levels must have the same length")
+
+    admin_valid, admin_groups, admin_locations, admin_keys = _locations(admin_df, admin_levels, aliases, "admin")
+    dist_valid, dist_groups, dist_locations, dist_keys = _locations(dist_df, dist_levels, aliases, "dist")
+
+    # Matched parents: dist key tuple -> admin key tuple, plus display names.
+    dist_to_admin: Dict[tuple, tuple] = {(): ()}
+    admin_names: Dict[tuple, str] = {}
+    dist_names: Dict[tuple, str] = {}
+    pairs, stats = [], []
+    admin_pair_ids: Dict[Tuple, int] = {}
+    dist_pair_ids: Dict[Tuple, int] = {}
+
+    for depth, (admin_col, dist_col) in enumerate(zip(admin_levels, dist_levels)):
+        leaf = depth == len(admin_levels) - 1
+        admin_blocks = _level_entries(admin_locations[admin_col], admin_keys[depth], admin_keys[:depth], not leaf)
+        dist_units = _level_entries(dist_locations[dist_col], dist_keys[depth], dist_keys[:depth], not leaf)
+        dist_blocks = {dist_to_admin[parent]: entries for parent, entries in dist_units.items() if parent in dist_to_admin}
+        admin_to_dist = {admin: dist for dist, admin in dist_to_admin.items()}
+
+        matched = _match_blocks(admin_blocks, dist_blocks, threshold, exact_first, assignment, workers, scorer)
+        next_level: Dict[tuple, tuple] = {}
+        exact = fuzzy = candidates = 0
+        for block, block_pairs, block_candidates in matched:
+            dist_parent = admin_to_dist[block]
+            admin_key_of, dist_key_of = dict(admin_blocks[block]), dict(dist_blocks[block])
+            candidates += block_candidates
+            for admin_name, dist_name, is_exact in block_pairs:
+                exact += is_exact
+                fuzzy += not is_exact
+                if not leaf:
+                    admin_unit, dist_unit = block + (admin_key_of[admin_name],), dist_parent + (dist_key_of[dist_name],)
+                    next_level[dist_unit] = admin_unit
+                    admin_names[admin_unit], dist_names[dist_unit] = admin_name, dist_name
+                    continue
+                pair_id = len(pairs)
+                admin_pair_ids[block, admin_name] = dist_pair_ids[dist_parent, dist_name] = pair_id
+                pairs.append([
+                    *(admin_names[block[:i + 1]] for i in range(depth)), admin_name,
+                    *(dist_names[dist_parent[:i + 1]] for i in range(depth)), dist_name,
+                    is_exact,
+                ])
+
+        n_admin = sum(len(entries) for entries in admin_blocks.values())
+        n_dist = sum(len(entries) for entries in dist_units.values())
+        stats.append([
+            admin_col.replace("_Admin", ""), n_admin, n_dist, len(matched), exact, fuzzy,
+            n_admin - exact - fuzzy, n_dist - exact - fuzzy, candidates, (n_admin - exact) * (n_dist - exact),
+        ])
+        dist_to_admin = next_level
+
+    admin_ids = [
+        admin_pair_ids.get((tuple(parents), name), UNMATCHED_ID)
+        for *parents, name in zip(*admin_keys[:-1], admin_locations[admin_levels[-1]])
+    ]
+    dist_ids = [
+        dist_pair_ids.get((tuple(parents), name), UNMATCHED_ID)
+        for *parents, name in zip(*dist_keys[:-1], dist_locations[dist_levels[-1]])
+    ]
+    labels = [col.replace("_Admin", "") for col in admin_levels]
+    return HierarchyMatch(
+        admin_ids=_row_ids(admin_valid, admin_groups, admin_ids, admin_df.index),
+        dist_ids=_row_ids(dist_valid, dist_groups, dist_ids, dist_df.index),
+        pairs=pd.DataFrame(pairs, columns=[*(f"Admin {l}" for l in labels), *(f"Dist {l}" for l in labels), "Exact"]),
+        stats=pd.DataFrame(stats, columns=MATCH_STATS_COLUMNS),
+    )
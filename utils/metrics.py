@@ -0,0 +1,106 @@
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.thresholds import VACCINES
+from utils.threshold_registry import get_thresholds
+
+RATE_CLIP = (0, 1000)
+
+UTILIZATION_CATEGORIES = ["Acceptable", "Low Utilization", "Unacceptable"]
+_CATEGORY_CODES = {label: code for code, label in enumerate(UTILIZATION_CATEGORIES)}
+
+
+def rate_column(vaccine: str) -> str:
+    return f"{vaccine}_Utilization_Rate"
+
+
+def category_column(vaccine: str) -> str:
+    return f"{vaccine}_Utilization_Category"
+
+
+def discrepancy_column(vaccine: str) -> str:
+    return f"{vaccine}_Discrepancy"
+
+
+def high_discrepancy_column(vaccine: str) -> str:
+    return f"{vaccine}_High_Discrepancy"
+
+
+def _counts(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def utilization_rates(administered: np.ndarray, distributed: np.ndarray) -> np.ndarray:
+    """
+    Administered as a percentage of distributed, clipped to ``RATE_CLIP``.
+    Zero distributed doses count as one so the rate stays finite; missing
+    counts give NaN.
+    """
+    rates = administered / np.where(distributed == 0, 1, distributed) * 100
+    return np.clip(rates, *RATE_CLIP)
+
+
+def utilization_category_codes(rates: np.ndarray, vaccines: Sequence[str]) -> np.ndarray:
+    """
+    Codes into ``UTILIZATION_CATEGORIES`` for a 2-D array of utilization
+    rates (in percent), one column per entry of ``vaccines``, labelled in a
+    single broadcast against the threshold registry:
+
+    - rate above "unacceptable": Unacceptable
+    - rate from "acceptable" up to "unacceptable", inclusive: Acceptable
+    - anything else, including missing rates: Low Utilization
+    """
+    thresholds = get_thresholds()
+    acceptable = thresholds.array("utilization", "acceptable", vaccines)
+    unacceptable = thresholds.array("utilization", "unacceptable", vaccines)
+    fraction = np.asarray(rates, dtype="float64") / 100
+    return np.select(
+        [fraction > unacceptable, fraction >= acceptable],
+        [_CATEGORY_CODES["Unacceptable"], _CATEGORY_CODES["Acceptable"]],
+        default=_CATEGORY_CODES["Low Utilization"],
+    ).astype("int8")
+
+
+def categorize_rates(rates: np.ndarray, vaccine: str) -> pd.Categorical:
+    """Utilization categories of one vaccine's rates (in percent)."""
+    codes = utilization_category_codes(np.reshape(rates, (-1, 1)), [vaccine])[:, 0]
+    return pd.Categorical.from_codes(codes, categories=UTILIZATION_CATEGORIES)
+
+
+def derived_metrics(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Utilization rate, category, discrepancy (administered minus
+    distributed) and high-discrepancy flag for every vaccine that has both
+    count columns, keyed by output column name.
+    """
+    vaccines = [
+        v for v in VACCINES
+        if f"{v}_Administered" in df.columns and f"{v}_Distributed" in df.columns
+    ]
+    administered = np.empty((len(df), len(vaccines)))
+    distributed = np.empty((len(df), len(vaccines)))
+    for i, vaccine in enumerate(vaccines):
+        administered[:, i] = _counts(df, f"{vaccine}_Administered")
+        distributed[:, i] = _counts(df, f"{vaccine}_Distributed")
+    rates = utilization_rates(administered, distributed)
+    discrepancy = administered - distributed
+    high_discrepancy = np.abs(discrepancy) > get_thresholds().array("utilization", "discrepancy_threshold", vaccines)
+    codes = utilization_category_codes(rates, vaccines)
+
+    columns = {}
+    for i, vaccine in enumerate(vaccines):
+        columns[rate_column(vaccine)] = rates[:, i]
+        columns[category_column(vaccine)] = pd.Categorical.from_codes(
+            codes[:, i], categories=UTILIZATION_CATEGORIES
+        )
+        columns[discrepancy_column(vaccine)] = discrepancy[:, i]
+        columns[high_discrepancy_column(vaccine)] = high_discrepancy[:, i]
+    return columns
+
+
+def add_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``df`` with the ``derived_metrics`` columns appended."""
+    metrics = pd.DataFrame(derived_metrics(df), index=df.index)
+    return pd.concat([df.drop(columns=metrics.columns, errors="ignore"), metrics], axis=1)
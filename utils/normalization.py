@@ -0,0 +1,36 @@
+import re
+
+import pandas as pd
+
+MATCH_KEY = "woreda_normalized"
+
+_NON_ALNUM = r'[^a-zA-Z0-9]'
+
+
+def normalize_woreda_name(name) -> str:
+    """Match key of a single Woreda name: ASCII letters and digits, lowercased."""
+    return re.sub(_NON_ALNUM, '', str(name)).lower()
+
+
+def normalize_woreda_names(names: pd.Series) -> pd.Series:
+    """
+    Vectorized ``normalize_woreda_name`` over a Series.
+
+    Each distinct name is normalized once with pandas string methods and the
+    result is mapped back through the factorized codes, so the cost depends on
+    the number of unique names rather than the number of rows.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=False)
+    keys = (
+        pd.Series(uniques, dtype=object).map(str)
+        .str.replace(_NON_ALNUM, '', regex=True)
+        .str.lower()
+        .to_numpy(dtype=object)
+    )
+    return pd.Series(keys.take(codes), index=names.index, name=MATCH_KEY, dtype=object)
+
+
+def add_match_key(df: pd.DataFrame, name_col: str) -> pd.DataFrame:
+    """Add the ``woreda_normalized`` match key column built from ``name_col``."""
+    df[MATCH_KEY] = normalize_woreda_names(df[name_col])
+    return df
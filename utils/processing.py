@@ -0,0 +1,476 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from config.settings import (
+    MATCH_ASSIGNMENT, MATCH_HUNGARIAN_MAX_CELLS, MATCH_SCORER, MATCH_THRESHOLD, MATCH_WORKERS,
+)
+from utils.aliases import block_scoped, get_aliases, shared_keys
+from utils.ingest import COERCED_CELLS, read_uploads
+from utils.matching import HIERARCHY_LEVELS, MATCH_STATS_COLUMNS, UNMATCHED_ID, match_hierarchy
+from utils.metrics import add_derived_metrics
+from utils.normalization import MATCH_KEY, add_match_key
+from utils.threshold_registry import get_thresholds
+
+ESSENTIAL_ADMIN_COLS = ['Woreda_Admin', 'Region_Admin', 'Zone_Admin', 'Period_Admin']
+ESSENTIAL_DIST_COLS = ['Woreda_Dist', 'Period_Dist']
+HIERARCHY_ADMIN_COLS = ['Region_Admin', 'Zone_Admin', 'Woreda_Admin']
+
+# The distributed upload's Region and Zone columns, located (not renamed)
+# only for hierarchical matching, which needs them.
+DIST_LOCATION_PATTERNS = {
+    'Region_Dist': ['region', 'region_distributed', 'region_name'],
+    'Zone_Dist': ['zone', 'zone_distributed', 'zone_name'],
+}
+
+# Temporary columns of a hierarchical merge.
+PAIR_ID = "location_pair"
+DIST_KEY = "dist_woreda_normalized"
+
+DATASET_FRAMES = ["matched_df", "admin_df", "dist_df", "unmatched_admin_df", "unmatched_dist_df", "woreda_match_map"]
+
+# Period column of each dataset frame that has one.
+PERIOD_COLUMNS = {
+    "matched_df": "Period",
+    "admin_df": "Period_Admin",
+    "dist_df": "Period_Dist",
+    "unmatched_admin_df": "Period_Admin",
+    "unmatched_dist_df": "Period_Dist",
+}
+
+COLUMN_PATTERNS = {
+    'Woreda_Admin': ['woreda', 'woreda_administered', 'woreda_name', 'facility'],
+    'Region_Admin': ['region', 'region_administered', 'region_name'],
+    'Zone_Admin': ['zone', 'zone_administered', 'zone_name'],
+    'Period_Admin': ['period', 'month', 'date'],
+    'BCG_Administered': ['bcg', 'bcg_administered'],
+    'IPV_Administered': ['ipv', 'ipv_administered'],
+    'Measles_Administered': ['measles', 'measles_administered'],
+    'Penta_Administered': ['penta', 'penta_administered'],
+    'Rota_Administered': ['rota', 'rota_administered'],
+    'Woreda_Dist': ['woreda', 'woreda_distributed', 'woreda_name', 'facility'],
+    'Period_Dist': ['period', 'month', 'date'],
+    'BCG_Distributed': ['bcg', 'bcg_distributed', 'bcg_doses', 'bcg_dist'],
+    'IPV_Distributed': ['ipv', 'ipv_distributed', 'ipv_doses', 'ipv_dist'],
+    'Measles_Distributed': ['measles', 'measles_distributed', 'measles_doses', 'measles_dist'],
+    'Penta_Distributed': ['penta', 'penta_distributed', 'penta_doses', 'penta_dist'],
+    'Rota_Distributed': ['rota', 'rota_distributed', 'rota_doses', 'rota_dist']
+}
+
+
+class MissingColumnsError(ValueError):
+    """Raised when an upload lacks columns needed for matching."""
+
+    def __init__(self, dataset: str, missing: List[str]):
+        self.dataset = dataset
+        self.missing = missing
+        super().__init__(f"{dataset} file is missing columns: {', '.join(missing)}")
+
+
+def clean_column_names(df):
+    df.columns = (
+        df.columns.str.strip()
+        .str.replace(' ', '_', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace('-', '_', regex=False)
+        .str.lower()
+    )
+    return df
+
+
+def find_and_rename_cols(df, col_type):
+    rename_map = {}
+    found_cols = {}
+    if col_type == 'admin':
+        relevant_patterns = {k: v for k, v in COLUMN_PATTERNS.items() if '_admin' in k.lower()}
+    else:
+        relevant_patterns = {k: v for k, v in COLUMN_PATTERNS.items() if '_dist' in k.lower()}
+
+    for final_name, prefixes in relevant_patterns.items():
+        for raw_col in df.columns:
+            for prefix in prefixes:
+                if raw_col.startswith(prefix):
+                    if final_name not in found_cols:
+                        rename_map[raw_col] = final_name
+                        found_cols[final_name] = raw_col
+                        break
+            if final_name in found_cols:
+                break
+
+    return rename_map, found_cols
+
+
+def find_dist_location_cols(df) -> Dict[str, str]:
+    """Raw Region and Zone columns of a distributed upload, by pattern name."""
+    found = {}
+    for final_name, prefixes in DIST_LOCATION_PATTERNS.items():
+        for raw_col in df.columns:
+            if raw_col.startswith(tuple(prefixes)):
+                found[final_name] = raw_col
+                break
+    return found
+
+
+@dataclass
+class StageTiming:
+    """Wall time and output row counts of one pipeline stage."""
+    stage: str
+    label: str
+    seconds: float
+    rows: Dict[str, int]
+
+
+@dataclass
+class ProcessingResult:
+    """Frames produced by ``ProcessingPipeline.run`` plus its stage timings."""
+    admin_df: Optional[pd.DataFrame] = None
+    dist_df: Optional[pd.DataFrame] = None
+    matched_df: Optional[pd.DataFrame] = None
+    unmatched_admin_df: Optional[pd.DataFrame] = None
+    unmatched_dist_df: Optional[pd.DataFrame] = None
+    woreda_match_map: Optional[pd.DataFrame] = None
+    match_stats: Optional[pd.DataFrame] = None
+    coerced_cells: Optional[pd.DataFrame] = None
+    admin_rename_map: Dict[str, str] = field(default_factory=dict)
+    dist_rename_map: Dict[str, str] = field(default_factory=dict)
+    timings: List[StageTiming] = field(default_factory=list)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """The dataset frames by session key, plus the match statistics, coerced cells and timings tables."""
+        frames = {name: getattr(self, name) for name in DATASET_FRAMES}
+        frames["match_stats"] = self.match_stats
+        frames["coerced_cells"] = self.coerced_cells
+        frames["processing_timings"] = self.timings_frame()
+        return frames
+
+    def timings_frame(self) -> pd.DataFrame:
+        """Per-stage timings as a table for display."""
+        frame = pd.DataFrame([
+            {
+                "Stage": t.label,
+                "Seconds": round(t.seconds, 3),
+                **{f"{name.replace('_', ' ').title()} Rows": count for name, count in t.rows.items()},
+            }
+            for t in self.timings
+        ])
+        row_cols = [col for col in frame.columns if col.endswith(" Rows")]
+        return frame.astype({col: "Int64" for col in row_cols})
+
+
+def match_map(matched_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The Woreda match map of a matched frame: each admin match key that was
+    matched and the distributed match key it was joined to.
+    """
+    keys = matched_df[MATCH_KEY].drop_duplicates().to_numpy()
+    return pd.DataFrame({"admin_key": keys, "dist_key": keys})
+
+
+def exact_match_stats(admin_df: pd.DataFrame, dist_df: pd.DataFrame, matched_df: pd.DataFrame) -> pd.DataFrame:
+    """``match_hierarchy``-style statistics of a merge on the Woreda match key alone."""
+    n_admin, n_dist = admin_df[MATCH_KEY].nunique(), dist_df[MATCH_KEY].nunique()
+    matched = matched_df[MATCH_KEY].nunique()
+    return pd.DataFrame(
+        [["Woreda", n_admin, n_dist, 1, matched, 0, n_admin - matched, n_dist - matched, 0, 0]],
+        columns=MATCH_STATS_COLUMNS,
+    )
+
+
+class ProcessingPipeline:
+    """
+    Read -> clean -> detect columns -> rename -> normalize -> merge -> unmatched
+    -> metrics.
+
+    Each stage records its wall time and the row counts it produced in
+    ``ProcessingResult.timings``. ``on_progress(fraction, label)`` is called
+    before every stage and once more with ``fraction=1.0`` when done.
+
+    By default records are joined on the Woreda match key and Period. With
+    ``hierarchical``, Regions, then Zones, then Woredas are matched level by
+    level (see ``utils.matching.match_hierarchy``) and records are joined on
+    the matched location and Period; the distributed upload then needs
+    Region and Zone columns too. ``ProcessingResult.match_stats`` reports the
+    matches per level, and ``ProcessingResult.coerced_cells`` the dose count
+    cells per column that were not numbers and were read as missing.
+    """
+
+    # Bump when a change to the stages alters their output, so cached
+    # datasets processed by an older version are not reused.
+    VERSION = 6
+
+    STAGES = [
+        ("read", "Reading files"),
+        ("clean", "Cleaning column names"),
+        ("detect", "Identifying key columns"),
+        ("rename", "Standardizing column names"),
+        ("normalize", "Normalizing location names"),
+        ("merge", "Matching records"),
+        ("unmatched", "Identifying unmatched records"),
+        ("metrics", "Computing utilization metrics"),
+    ]
+
+    def __init__(self, on_progress: Optional[Callable[[float, str], None]] = None, hierarchical: bool = False):
+        self.on_progress = on_progress
+        self.hierarchical = hierarchical
+
+    def settings(self) -> dict:
+        """Everything besides the input files that determines the output."""
+        settings = {
+            "version": self.VERSION,
+            "match_on": [MATCH_KEY, "Period"],
+            "thresholds": get_thresholds().to_dict(),
+            "aliases": get_aliases().fingerprint(),
+        }
+        if self.hierarchical:
+            settings["match_on"] = [*HIERARCHY_LEVELS, "Period"]
+            settings["hierarchy"] = {
+                "threshold": MATCH_THRESHOLD,
+                "assignment": MATCH_ASSIGNMENT,
+                "hungarian_max_cells": MATCH_HUNGARIAN_MAX_CELLS,
+                "scorer": MATCH_SCORER,
+            }
+        return settings
+
+    def run(self, admin_file, dist_file) -> ProcessingResult:
+        result = ProcessingResult()
+        self._files = (admin_file, dist_file)
+        for i, (stage, label) in enumerate(self.STAGES):
+            if self.on_progress:
+                self.on_progress(i / len(self.STAGES), label)
+            start = time.perf_counter()
+            rows = getattr(self, f"_{stage}")(result)
+            result.timings.append(StageTiming(stage, label, time.perf_counter() - start, rows))
+        if self.on_progress:
+            self.on_progress(1.0, "Complete")
+        return result
+
+    @staticmethod
+    def _frame_rows(result: ProcessingResult) -> Dict[str, int]:
+        return {"admin": len(result.admin_df), "dist": len(result.dist_df)}
+
+    def _read(self, result):
+        result.admin_df, result.dist_df = read_uploads(*self._files)
+        result.coerced_cells = pd.DataFrame(
+            [
+                (dataset, col, count)
+                for dataset, df in (("admin", result.admin_df), ("dist", result.dist_df))
+                for col, count in df.attrs.pop(COERCED_CELLS, {}).items()
+            ],
+            columns=["Dataset", "Column", "Cells"],
+        )
+        return self._frame_rows(result)
+
+    def _clean(self, result):
+        result.admin_df = clean_column_names(result.admin_df)
+        result.dist_df = clean_column_names(result.dist_df)
+        return self._frame_rows(result)
+
+    def _detect(self, result):
+        result.admin_rename_map, _ = find_and_rename_cols(result.admin_df, "admin")
+        result.dist_rename_map, _ = find_and_rename_cols(result.dist_df, "dist")
+
+        for dataset, rename_map, essential in (
+            ("admin", result.admin_rename_map, ESSENTIAL_ADMIN_COLS),
+            ("dist", result.dist_rename_map, ESSENTIAL_DIST_COLS),
+        ):
+            missing = [c for c in essential if c not in rename_map.values()]
+            if missing:
+                raise MissingColumnsError(dataset, missing)
+        if self.hierarchical:
+            self._dist_locations = find_dist_location_cols(result.dist_df)
+            missing = [c for c in DIST_LOCATION_PATTERNS if c not in self._dist_locations]
+            if missing:
+                raise MissingColumnsError("dist", missing)
+        return self._frame_rows(result)
+
+    def _rename(self, result):
+        result.admin_df = result.admin_df.rename(columns=result.admin_rename_map)
+        result.dist_df = result.dist_df.rename(columns=result.dist_rename_map)
+        return self._frame_rows(result)
+
+    def _normalize(self, result):
+        aliases = get_aliases()
+        result.admin_df = add_match_key(result.admin_df, "Woreda_Admin")
+        result.dist_df = add_match_key(result.dist_df, "Woreda_Dist")
+        result.admin_df[MATCH_KEY] = aliases.resolve("admin", result.admin_df[MATCH_KEY])
+        result.dist_df[MATCH_KEY] = aliases.resolve("dist", result.dist_df[MATCH_KEY])
+        return self._frame_rows(result)
+
+    def _merge(self, result):
+        if self.hierarchical:
+            return self._merge_hierarchical(result)
+        matched_df = pd.merge(
+            result.admin_df,
+            result.dist_df,
+            left_on=[MATCH_KEY, "Period_Admin"],
+            right_on=[MATCH_KEY, "Period_Dist"],
+            how="inner",
+        )
+        if "Period_Dist" in matched_df:
+            matched_df = matched_df.drop(columns="Period_Dist")
+        matched_df.rename(columns={"Period_Admin": "Period"}, inplace=True)
+        result.matched_df = matched_df
+        result.woreda_match_map = match_map(matched_df)
+        result.match_stats = exact_match_stats(result.admin_df, result.dist_df, matched_df)
+        return {"matched": len(matched_df)}
+
+    def _merge_hierarchical(self, result):
+        dist_levels = [*self._dist_locations.values(), "Woreda_Dist"]
+        match = match_hierarchy(
+            result.admin_df, result.dist_df, HIERARCHY_ADMIN_COLS, dist_levels,
+            threshold=MATCH_THRESHOLD, aliases=get_aliases(), assignment=MATCH_ASSIGNMENT,
+            workers=MATCH_WORKERS or None, scorer=MATCH_SCORER,
+        )
+        result.admin_df[PAIR_ID] = match.admin_ids
+        result.dist_df[PAIR_ID] = match.dist_ids
+        matched_df = pd.merge(
+            result.admin_df[result.admin_df[PAIR_ID] != UNMATCHED_ID],
+            result.dist_df.rename(columns={MATCH_KEY: DIST_KEY}),
+            left_on=[PAIR_ID, "Period_Admin"],
+            right_on=[PAIR_ID, "Period_Dist"],
+            how="inner",
+        )
+        matched_df = matched_df.drop(columns="Period_Dist").rename(columns={"Period_Admin": "Period"})
+        # The pair ids stay until the unmatched stage has used them.
+        result.matched_df = matched_df.drop(columns=DIST_KEY)
+        result.woreda_match_map = (
+            matched_df[[MATCH_KEY, DIST_KEY]].drop_duplicates()
+            .rename(columns={MATCH_KEY: "admin_key", DIST_KEY: "dist_key"})
+            .reset_index(drop=True)
+        )
+        result.match_stats = match.stats
+        fuzzy = match.pairs[~match.pairs["Exact"] & match.pairs.index.isin(matched_df[PAIR_ID])]
+        self._learn_aliases(result, zip(fuzzy["Admin Woreda"], fuzzy["Dist Woreda"]))
+        return {"matched": len(matched_df)}
+
+    def _learn_aliases(self, result, pairs) -> None:
+        """
+        Add confirmed fuzzy ``(admin name, dist name)`` Woreda matches that
+        joined records to the alias table, so the next upload pairs them by
+        lookup. Aliases apply in every Zone, so names found in more than one
+        Region/Zone of this upload are not learned. This run's cache key
+        holds the fingerprint of the table it matched with (see
+        ``settings``); the learned aliases change it for later runs.
+        """
+        admin_df, dist_df = result.admin_df, result.dist_df
+        shared_admin = shared_keys(admin_df["Woreda_Admin"], [admin_df[col] for col in HIERARCHY_ADMIN_COLS[:-1]])
+        shared_dist = shared_keys(dist_df["Woreda_Dist"], [dist_df[col] for col in self._dist_locations.values()])
+        aliases = get_aliases()
+        if aliases.learn(block_scoped(pairs, shared_admin, shared_dist)):
+            aliases.save()
+
+    def _unmatched(self, result):
+        match_col = PAIR_ID if self.hierarchical else MATCH_KEY
+        matched_keys = result.matched_df[match_col]
+        result.unmatched_admin_df = result.admin_df[~result.admin_df[match_col].isin(matched_keys)]
+        result.unmatched_dist_df = result.dist_df[~result.dist_df[match_col].isin(matched_keys)]
+        if self.hierarchical:
+            for name in ("matched_df", "admin_df", "dist_df", "unmatched_admin_df", "unmatched_dist_df"):
+                setattr(result, name, getattr(result, name).drop(columns=PAIR_ID))
+        return {
+            "unmatched_admin": len(result.unmatched_admin_df),
+            "unmatched_dist": len(result.unmatched_dist_df),
+        }
+
+    def _metrics(self, result):
+        result.matched_df = add_derived_metrics(result.matched_df)
+        return {"matched": len(result.matched_df)}
+
+
+def hierarchical_dataset(cache, key: str) -> bool:
+    """Whether the processed dataset ``key`` was matched level by level."""
+    if not cache.frame_path(key, "match_stats").exists():
+        return False
+    return HIERARCHY_LEVELS[0] in set(cache.read(key, "match_stats")["Level"])
+
+
+class AppendPipeline(ProcessingPipeline):
+    """
+    Add the uploads of one or more new Periods to a processed dataset.
+
+    Only the new files are read, normalized, matched and given metrics. Their
+    admin match keys are first translated through the stored Woreda match
+    map, then joined as in a full run. The results are appended to the
+    stored frames, replacing any rows of the same Periods. Unmatched rows
+    follow the full run's rule (a key matched in any Period counts as
+    matched), so the outcome equals reprocessing the whole history.
+
+    The stored frames are still read in full by ``_load_base`` and the
+    whole history is written back as a new cache entry after ``_append``,
+    so appending saves the reading, matching and metrics of the old
+    Periods, not cache I/O.
+
+    Datasets matched hierarchically cannot be appended to: the new Periods'
+    names could pair differently than in a full run, so the outcome would
+    not equal reprocessing.
+    """
+
+    STAGES = ProcessingPipeline.STAGES[:5] + [
+        ("load_base", "Loading stored dataset"),
+        ("merge", "Matching records"),
+        ("unmatched", "Identifying unmatched records"),
+        ("metrics", "Computing utilization metrics"),
+        ("append", "Appending to stored dataset"),
+    ]
+
+    def __init__(self, base_key: str, cache, on_progress: Optional[Callable[[float, str], None]] = None):
+        if hierarchical_dataset(cache, base_key):
+            raise ValueError("The current dataset was matched by Region → Zone → Woreda and cannot be "
+                             "appended to; process the full history again instead.")
+        super().__init__(on_progress)
+        self.base_key = base_key
+        self.cache = cache
+
+    def settings(self) -> dict:
+        return {**super().settings(), "append_to": self.base_key}
+
+    def _load_base(self, result):
+        periods = set(result.admin_df["Period_Admin"]) | set(result.dist_df["Period_Dist"])
+        self._base = {name: self.cache.read(self.base_key, name) for name in DATASET_FRAMES}
+        self._replaces = bool(periods & set(self._base["admin_df"]["Period_Admin"]))
+        if self._replaces:
+            for name, period_col in PERIOD_COLUMNS.items():
+                frame = self._base[name]
+                self._base[name] = frame[~frame[period_col].isin(periods)]
+        return {name.replace("_df", ""): len(self._base[name]) for name in PERIOD_COLUMNS}
+
+    def _merge(self, result):
+        stored = self._base["woreda_match_map"]
+        mapping = pd.Series(stored["dist_key"].to_numpy(), index=stored["admin_key"].to_numpy())
+        admin_keys = result.admin_df[MATCH_KEY]
+        result.admin_df[MATCH_KEY] = admin_keys.map(mapping).fillna(admin_keys)
+        return super()._merge(result)
+
+    def _unmatched(self, result):
+        new_keys = result.matched_df[MATCH_KEY]
+        matched_keys = pd.concat([self._base["matched_df"][MATCH_KEY], new_keys])
+        result.unmatched_admin_df = result.admin_df[~result.admin_df[MATCH_KEY].isin(matched_keys)]
+        result.unmatched_dist_df = result.dist_df[~result.dist_df[MATCH_KEY].isin(matched_keys)]
+        for name, source in (("unmatched_admin_df", "admin_df"), ("unmatched_dist_df", "dist_df")):
+            if self._replaces:
+                # Replaced Periods may have held the only match of a key, so
+                # recheck every stored row.
+                stored = self._base[source]
+                self._base[name] = stored[~stored[MATCH_KEY].isin(matched_keys)]
+            else:
+                # Stored unmatched rows whose key the new Periods matched are
+                # no longer unmatched.
+                stored = self._base[name]
+                self._base[name] = stored[~stored[MATCH_KEY].isin(new_keys)]
+        return {
+            "unmatched_admin": len(result.unmatched_admin_df),
+            "unmatched_dist": len(result.unmatched_dist_df),
+        }
+
+    def _append(self, result):
+        for name in PERIOD_COLUMNS:
+            setattr(result, name, pd.concat([self._base[name], getattr(result, name)], ignore_index=True))
+        result.woreda_match_map = (
+            pd.concat([self._base["woreda_match_map"], result.woreda_match_map], ignore_index=True)
+            .drop_duplicates("admin_key")
+            .reset_index(drop=True)
+        )
+        self._base = {}
+        return {name.replace("_df", ""): len(getattr(result, name)) for name in PERIOD_COLUMNS}
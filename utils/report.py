@@ -0,0 +1,278 @@
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Inches, Pt
+
+from config.settings import REPORT_CACHE_MAX_ENTRIES
+from utils.charts import CATEGORY_COLORS
+from utils.cube import WOREDA_COUNT, SummaryCube, category_count_column
+from utils.extremity import Extremities
+from utils.hierarchy import ALL, LOCATION_COLUMNS, PERIOD_COL, REGION_COL, WOREDA_COL, ZONE_COL
+from utils.metrics import UTILIZATION_CATEGORIES, rate_column
+
+PPT_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# Extremity tables list at most this many groups, most extremities first.
+TABLE_MAX_ROWS = 15
+
+RECOMMENDATIONS = [
+    ("Recommendations for High Utilization", [
+        "Conduct a targeted audit of administered dose records for potential data entry errors.",
+        "Investigate potential lags in reporting of distributed doses.",
+        "Recommend a physical stock count at facilities to reconcile administered and distributed doses.",
+    ]),
+    ("Recommendations for Low Utilization", [
+        "Assess inventory levels to prevent vaccine expiration due to overstocking.",
+        "Investigate if there are service delivery issues affecting vaccine demand.",
+        "Verify that administered doses are being reported accurately and on time.",
+    ]),
+    ("Recommendations for High Discrepancies", [
+        "Provide training on accurate reporting for both administered and distributed doses.",
+        "Implement a process to regularly cross-reference data to catch discrepancies early.",
+        "Establish a feedback loop where Woredas are alerted to discrepancies.",
+    ]),
+]
+
+_GROUP_LABELS = {REGION_COL: "Region", ZONE_COL: "Zone"}
+
+
+@dataclass
+class ReportSection:
+    """The numbers behind one data slide."""
+    title: str
+    kpis: List[Tuple[str, str]]
+    chart: pd.DataFrame
+    extremes: pd.DataFrame
+
+
+def _vaccines(cube: SummaryCube, vaccine: str) -> List[str]:
+    return list(cube.vaccines) if vaccine == ALL else [v for v in cube.vaccines if v == vaccine]
+
+
+def _kpis(summary: pd.Series, vaccines: Sequence[str]) -> List[Tuple[str, str]]:
+    """The Dashboard2 KPI boxes of one cube cell."""
+    total_dist = sum(summary[f"{v}_Distributed"] for v in vaccines)
+    total_admin = sum(summary[f"{v}_Administered"] for v in vaccines)
+    utilization_rate = (total_admin / total_dist) * 100 if total_dist > 0 else 0
+    return [
+        ("Total Woredas", f"{summary[WOREDA_COUNT]}"),
+        ("Total Doses Distributed", f"{total_dist:,.0f}"),
+        ("Total Doses Administered", f"{total_admin:,.0f}"),
+        ("Utilization Rate", f"{utilization_rate:.2f}%"),
+    ]
+
+
+def _chart_data(breakdown: pd.DataFrame, vaccines: Sequence[str], vaccine: str) -> pd.DataFrame:
+    """
+    Chart series per group: utilization category counts of one vaccine, or
+    the utilization rate (%) of each vaccine when all are selected.
+    """
+    if vaccine != ALL:
+        counts = {c: breakdown[category_count_column(vaccine, c)] for c in UTILIZATION_CATEGORIES
+                  if category_count_column(vaccine, c) in breakdown.columns}
+        return pd.DataFrame(counts, index=breakdown.index)
+    rates = {}
+    for v in vaccines:
+        dist = breakdown[f"{v}_Distributed"]
+        rates[v] = (breakdown[f"{v}_Administered"] / dist.where(dist > 0) * 100).fillna(0).round(1)
+    return pd.DataFrame(rates, index=breakdown.index)
+
+
+def _extremes(df: pd.DataFrame, extremities: Extremities, vaccines: Sequence[str], group_cols: Sequence[str]) -> pd.DataFrame:
+    """Woreda and extremity counts per group, summed over ``vaccines``."""
+    vaccines = [v for v in vaccines if v in extremities.vaccines]
+    if not vaccines:
+        return pd.DataFrame(columns=[*group_cols, "total_woredas", "high_extremity_count", "low_extremity_count"])
+    table = extremities.by_group(df, vaccines[0], group_cols)
+    for v in vaccines[1:]:
+        other = extremities.by_group(df, v, group_cols)
+        table["high_extremity_count"] += other["high_extremity_count"].to_numpy()
+        table["low_extremity_count"] += other["low_extremity_count"].to_numpy()
+    return table
+
+
+def _extremes_table(table: pd.DataFrame, group_col: str) -> pd.DataFrame:
+    table = table.rename(columns={
+        group_col: _GROUP_LABELS[group_col],
+        "total_woredas": "Total Woredas",
+        "high_extremity_count": "High Extremity",
+        "low_extremity_count": "Low Extremity",
+    })[[_GROUP_LABELS[group_col], "Total Woredas", "High Extremity", "Low Extremity"]]
+    total = table["High Extremity"] + table["Low Extremity"]
+    order = total.sort_values(ascending=False, kind="stable").index
+    return table.loc[order].head(TABLE_MAX_ROWS)
+
+
+def report_sections(
+    cube: SummaryCube,
+    df: pd.DataFrame,
+    extremities: Extremities,
+    vaccine: str,
+    selection: Tuple,
+) -> List[ReportSection]:
+    """
+    An overview section for the selection, then one section per Region when
+    no Region is selected. Every figure comes from the summary cube or from
+    one extremity grouping of ``df``, so no section scans the rows again.
+    """
+    region = selection[0]
+    vaccines = _vaccines(cube, vaccine)
+    by_zone = _extremes(df, extremities, vaccines, [REGION_COL, ZONE_COL])
+
+    if region == ALL:
+        overview_extremes = _extremes(df, extremities, vaccines, [REGION_COL])
+        sections = [ReportSection(
+            title="Overview by Region",
+            kpis=_kpis(cube.cell(*selection), vaccines),
+            chart=_chart_data(cube.breakdown(REGION_COL, *selection), vaccines, vaccine),
+            extremes=_extremes_table(overview_extremes, REGION_COL),
+        )]
+        regions = list(cube.breakdown(REGION_COL, *selection).index)
+    else:
+        sections = []
+        regions = [region]
+
+    for name in regions:
+        scope = (name, *selection[1:])
+        zones = by_zone[by_zone[REGION_COL] == name]
+        sections.append(ReportSection(
+            title=f"{name} by Zone",
+            kpis=_kpis(cube.cell(*scope), vaccines),
+            chart=_chart_data(cube.breakdown(ZONE_COL, *scope), vaccines, vaccine),
+            extremes=_extremes_table(zones, ZONE_COL),
+        ))
+    return sections
+
+
+def woreda_table(df: pd.DataFrame, vaccine: str) -> pd.DataFrame:
+    """The Woreda-level data of one vaccine, with display column names."""
+    columns = [REGION_COL, ZONE_COL, WOREDA_COL, PERIOD_COL,
+               f"{vaccine}_Administered", f"{vaccine}_Distributed", rate_column(vaccine)]
+    return df[columns].rename(columns={
+        REGION_COL: "Region",
+        ZONE_COL: "Zone",
+        WOREDA_COL: "Woreda",
+        f"{vaccine}_Administered": "Administered",
+        f"{vaccine}_Distributed": "Distributed",
+        rate_column(vaccine): "Utilization Rate",
+    })
+
+
+def _set_font(paragraphs, size: Pt, bold: Optional[bool] = None) -> None:
+    """Font of every run of ``paragraphs``; empty text has no runs to style."""
+    for paragraph in paragraphs:
+        for run in paragraph.runs:
+            run.font.size = size
+            if bold is not None:
+                run.font.bold = bold
+
+
+def _add_kpis(slide, kpis: List[Tuple[str, str]]) -> None:
+    width = Inches(9.0 / len(kpis))
+    for i, (label, value) in enumerate(kpis):
+        box = slide.shapes.add_textbox(Inches(0.5) + width * i, Inches(1.3), width, Inches(0.9))
+        text = box.text_frame
+        text.text = value
+        _set_font(text.paragraphs, Pt(20), bold=True)
+        caption = text.add_paragraph()
+        caption.text = label
+        _set_font([caption], Pt(11))
+
+
+def _add_chart(slide, chart: pd.DataFrame, vaccine: str) -> None:
+    chart_data = CategoryChartData()
+    chart_data.categories = [str(group) for group in chart.index]
+    for series in chart.columns:
+        chart_data.add_series(str(series), chart[series].tolist())
+    chart_type = XL_CHART_TYPE.COLUMN_CLUSTERED if vaccine == ALL else XL_CHART_TYPE.COLUMN_STACKED
+    graphic = slide.shapes.add_chart(chart_type, Inches(0.3), Inches(2.4), Inches(5.9), Inches(4.8), chart_data)
+    plot = graphic.chart
+    plot.has_legend = True
+    plot.legend.position = XL_LEGEND_POSITION.BOTTOM
+    plot.legend.include_in_layout = False
+    plot.category_axis.tick_labels.font.size = Pt(8)
+    plot.value_axis.tick_labels.font.size = Pt(8)
+    if vaccine != ALL:
+        for series in plot.series:
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = RGBColor.from_string(CATEGORY_COLORS[series.name].lstrip("#"))
+
+
+def _add_table(slide, table: pd.DataFrame) -> None:
+    rows, cols = len(table) + 1, len(table.columns)
+    shape = slide.shapes.add_table(rows, cols, Inches(6.4), Inches(2.4), Inches(3.3), Inches(0.25) * rows)
+    cells = shape.table
+    cells.columns[0].width = Inches(1.2)
+    for j in range(1, cols):
+        cells.columns[j].width = Inches(0.7)
+    for j, column in enumerate(table.columns):
+        cells.cell(0, j).text = column
+    for i, values in enumerate(table.itertuples(index=False), start=1):
+        for j, value in enumerate(values):
+            cells.cell(i, j).text = str(value)
+    for row in cells.rows:
+        for cell in row.cells:
+            _set_font(cell.text_frame.paragraphs, Pt(8))
+
+
+def _add_section(prs, section: ReportSection, vaccine: str) -> None:
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = section.title
+    _add_kpis(slide, section.kpis)
+    if len(section.chart) and len(section.chart.columns):
+        _add_chart(slide, section.chart, vaccine)
+    _add_table(slide, section.extremes)
+
+
+def create_ppt(
+    cube: SummaryCube,
+    df: pd.DataFrame,
+    extremities: Extremities,
+    vaccine: str,
+    selection: Tuple,
+) -> bytes:
+    """
+    PowerPoint report of the selection: a title slide, one slide per report
+    section with its KPIs, a native chart and the extremity table, and the
+    recommendation slides.
+    """
+    prs = Presentation()
+
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Immunization Triangulation Report"
+    filters = " | ".join(f"{col.replace('_Admin', '')}: {value}" for col, value in zip(LOCATION_COLUMNS, selection))
+    slide.placeholders[1].text = f"Report generated for {vaccine}.\n{filters}"
+
+    for section in report_sections(cube, df, extremities, vaccine, selection):
+        _add_section(prs, section, vaccine)
+
+    for title, bullets in RECOMMENDATIONS:
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = title
+        text = slide.placeholders[1].text_frame
+        for bullet in bullets:
+            paragraph = text.add_paragraph()
+            paragraph.text = bullet
+            paragraph.level = 0
+
+    output = BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+def report_key(dataset_key: str, vaccine: str, selection: Tuple) -> Tuple:
+    """(dataset hash, vaccine, region, zone, woreda, period)."""
+    return (dataset_key, vaccine, *selection)
+
+
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_report(key: Tuple, _build: Callable[[], bytes]) -> bytes:
+    """The deck for ``key``, built by ``_build()`` on first request."""
+    return _build()
@@ -0,0 +1,62 @@
+from typing import Dict, Hashable, Sequence, Type
+
+import numpy as np
+from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz as rapid_fuzz, process
+
+
+class Scorer:
+    """
+    Woreda name similarity backend: ``fuzz.ratio`` scores (integers 0-100)
+    of every query against every choice. ``batched`` backends score a
+    matrix in one call, so whole blocks are worth scoring at once.
+    """
+    name = ""
+    batched = False
+
+    def scores(self, queries: Sequence[Hashable], choices: Sequence[Hashable]) -> np.ndarray:
+        """Score matrix of shape ``(len(queries), len(choices))``."""
+        raise NotImplementedError
+
+
+class FuzzywuzzyScorer(Scorer):
+    """The reference backend: one ``fuzzywuzzy`` call per pair."""
+    name = "fuzzywuzzy"
+
+    def scores(self, queries: Sequence[Hashable], choices: Sequence[Hashable]) -> np.ndarray:
+        matrix = np.zeros((len(queries), len(choices)), dtype=np.int32)
+        for i, query in enumerate(queries):
+            for j, choice in enumerate(choices):
+                matrix[i, j] = fuzz.ratio(query, choice)
+        return matrix
+
+
+class RapidfuzzScorer(Scorer):
+    """
+    ``rapidfuzz.process.cdist``: the whole matrix in one C++ call. Scores
+    are rounded half to even, as ``fuzzywuzzy`` rounds, so both backends
+    give the same integers.
+    """
+    name = "rapidfuzz"
+    batched = True
+
+    def scores(self, queries: Sequence[Hashable], choices: Sequence[Hashable]) -> np.ndarray:
+        if not len(queries) or not len(choices):
+            return np.zeros((len(queries), len(choices)), dtype=np.int32)
+        matrix = process.cdist(
+            [str(query) for query in queries],
+            [str(choice) for choice in choices],
+            scorer=rapid_fuzz.ratio,
+            dtype=np.float64,
+        )
+        return np.rint(matrix).astype(np.int32)
+
+
+SCORERS: Dict[str, Type[Scorer]] = {scorer.name: scorer for scorer in (FuzzywuzzyScorer, RapidfuzzScorer)}
+
+
+def get_scorer(name: str) -> Scorer:
+    try:
+        return SCORERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown scorer {name!r}; expected one of {', '.join(SCORERS)}") from None
@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.thresholds import VACCINES
+from utils.ingest import count_columns
+from utils.metrics import category_column, rate_column
+
+CATEGORICAL_PREFIXES = ("region", "zone", "woreda")
+
+# The only matched_df columns the dashboards read.
+DASHBOARD_COLUMNS = tuple(
+    ["Region_Admin", "Zone_Admin", "Woreda_Admin", "Period"]
+    + [f"{v}_{kind}" for v in VACCINES for kind in ("Administered", "Distributed")]
+    + [col for v in VACCINES for col in (rate_column(v), category_column(v))]
+)
+
+
+def _is_location_column(col) -> bool:
+    name = str(col).lower()
+    return name.startswith(CATEGORICAL_PREFIXES) and name != "woreda_normalized"
+
+
+def to_storage_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnar-friendly copy of a processed frame: Region/Zone/Woreda columns
+    become categoricals (stored as Arrow dictionaries) and complete vaccine
+    count columns are downcast to the smallest integer type that fits.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if _is_location_column(col) and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+    for col in count_columns(df.columns):
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values):
+            continue
+        if pd.api.types.is_numeric_dtype(values) and not values.isna().any() and (values % 1 == 0).all():
+            df[col] = pd.to_numeric(values.astype("int64"), downcast="integer")
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> None:
+    table = pa.Table.from_pandas(to_storage_frame(df), preserve_index=not isinstance(df.index, pd.RangeIndex))
+    pq.write_table(table, path)
+
+
+def frame_columns(path: Path) -> List[str]:
+    return pq.read_schema(path).names
+
+
+def frame_rows(path: Path) -> int:
+    """Row count from the Parquet footer, without reading any data."""
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def read_frame(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read a stored frame through a memory map, materializing only ``columns``.
+    Requested columns the file does not have are skipped.
+    """
+    if columns is not None:
+        available = set(frame_columns(path))
+        columns = [col for col in columns if col in available]
+    table = pq.read_table(path, columns=columns, memory_map=True, use_pandas_metadata=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
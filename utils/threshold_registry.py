@@ -0,0 +1,115 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import THRESHOLDS_FILE
+from config.thresholds import EXTREMITY_THRESHOLDS, VACCINE_THRESHOLDS
+
+# Threshold family -> the keys every vaccine must define in it.
+FAMILIES = {
+    "utilization": ("acceptable", "unacceptable", "discrepancy_threshold"),
+    "extremity": ("high", "low"),
+}
+
+DEFAULTS = {
+    "utilization": VACCINE_THRESHOLDS,
+    "extremity": EXTREMITY_THRESHOLDS,
+}
+
+
+class ThresholdConfigError(ValueError):
+    """Raised when a threshold override file is malformed."""
+
+
+def _read_override(path: Path) -> dict:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ThresholdConfigError(f"PyYAML is required to read {path}; use JSON or install pyyaml") from exc
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ThresholdConfigError(f"{path} must contain a mapping of threshold families")
+    return data
+
+
+def _merge(defaults: Dict[str, dict], override: dict, source: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Overlay ``override`` onto ``defaults`` one threshold value at a time."""
+    merged = {family: {v: dict(values) for v, values in vaccines.items()} for family, vaccines in defaults.items()}
+    for family, vaccines in override.items():
+        if family not in FAMILIES:
+            raise ThresholdConfigError(f"{source}: unknown threshold family '{family}'")
+        for vaccine, values in (vaccines or {}).items():
+            if vaccine not in merged[family]:
+                raise ThresholdConfigError(f"{source}: unknown vaccine '{vaccine}' in '{family}'")
+            for key, value in (values or {}).items():
+                if key not in FAMILIES[family]:
+                    raise ThresholdConfigError(f"{source}: unknown threshold '{key}' in '{family}'")
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ThresholdConfigError(f"{source}: {family}.{vaccine}.{key} must be a number")
+                merged[family][vaccine][key] = value
+    return merged
+
+
+class ThresholdRegistry:
+    """
+    Every threshold family, compiled into float arrays aligned with
+    ``vaccines`` so categorization and extremity checks can broadcast a
+    (rows x vaccines) matrix of rates against them.
+    """
+
+    def __init__(self, families: Dict[str, Dict[str, Dict[str, float]]]):
+        self.families = families
+        self.vaccines: List[str] = list(families["utilization"])
+        self._position = {vaccine: i for i, vaccine in enumerate(self.vaccines)}
+        self._arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        for family, keys in FAMILIES.items():
+            missing = [v for v in self.vaccines if v not in families[family]]
+            if missing:
+                raise ThresholdConfigError(f"'{family}' thresholds missing for {', '.join(missing)}")
+            self._arrays[family] = {
+                key: np.array([families[family][v][key] for v in self.vaccines], dtype="float64")
+                for key in keys
+            }
+            for array in self._arrays[family].values():
+                array.setflags(write=False)
+
+    @classmethod
+    def load(cls, override_path: Optional[Path] = None) -> "ThresholdRegistry":
+        """Defaults from ``config.thresholds``, overlaid with a JSON/YAML file if given."""
+        override = _read_override(Path(override_path)) if override_path else {}
+        return cls(_merge(DEFAULTS, override, str(override_path)))
+
+    def has(self, family: str, vaccine: str) -> bool:
+        return vaccine in self.families[family]
+
+    def get(self, family: str, vaccine: str, key: str) -> float:
+        return float(self._arrays[family][key][self._position[vaccine]])
+
+    def array(self, family: str, key: str, vaccines: Optional[Sequence[str]] = None) -> np.ndarray:
+        """One threshold for ``vaccines`` (all by default), in their order."""
+        if vaccines is None:
+            return self._arrays[family][key]
+        return self._arrays[family][key][[self._position[v] for v in vaccines]]
+
+    def known(self, vaccines: Iterable[str]) -> List[str]:
+        """The given vaccines that have thresholds, in the given order."""
+        return [v for v in vaccines if v in self._position]
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        return {
+            family: {v: {key: self.get(family, v, key) for key in keys} for v in self.vaccines}
+            for family, keys in FAMILIES.items()
+        }
+
+
+@lru_cache(maxsize=None)
+def get_thresholds(override_path: Optional[Path] = THRESHOLDS_FILE) -> ThresholdRegistry:
+    """The process-wide registry, loaded on first use."""
+    return ThresholdRegistry.load(override_path)